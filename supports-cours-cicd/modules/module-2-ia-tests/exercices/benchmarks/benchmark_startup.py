@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark du temps de démarrage des outils du module 2
+Mesure le coût d'import de chaque point d'entrée avec `python -X importtime`
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+EXERCICES_DIR = Path(__file__).resolve().parent.parent
+
+# Point d'entrée -> (dossier des ressources, module importé)
+ENTRY_POINTS = {
+    'anomaly_detector': ('exercice-2.3-detection-anomalies-logs/ressources', 'anomaly_detector'),
+    'scoring_service': ('exercice-2.3-detection-anomalies-logs/ressources', 'scoring_service'),
+    'test_generator': ('exercice-2.4-generation-tests-nlp/ressources', 'test_generator'),
+    'risk_predictor': ('exercice-2.5-analyse-predictive-zones-risque/ressources', 'risk_predictor'),
+}
+
+# Dépendances lourdes qui ne devraient pas être chargées au simple import
+HEAVY_PACKAGES = ('sklearn', 'scipy', 'joblib', 'matplotlib', 'seaborn')
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse la sortie de -X importtime
+
+    Returns:
+        Liste de {'module', 'self_us', 'cumulative_us', 'depth'}
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        imports.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2
+        })
+    return imports
+
+def measure_entry_point(directory: str, module: str, repeat: int) -> Dict:
+    """Importe un module dans des processus neufs et conserve la meilleure mesure"""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=EXERCICES_DIR / directory, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Import de {module} impossible:\n{completed.stderr[-2000:]}")
+        runs.append(parse_importtime(completed.stderr))
+
+    def entry_time(run: List[Dict]) -> int:
+        return next(item['cumulative_us'] for item in run
+                    if item['module'] == module and item['depth'] == 0)
+
+    imports = min(runs, key=entry_time)
+
+    # -X importtime liste les dépendances avant le module qui les importe :
+    # les imports directs sont les lignes de profondeur 1 qui précèdent l'entrée
+    position = next(i for i, item in enumerate(imports)
+                    if item['module'] == module and item['depth'] == 0)
+    direct = []
+    for item in reversed(imports[:position]):
+        if item['depth'] == 0:
+            break
+        if item['depth'] == 1:
+            direct.append(item)
+    heaviest = sorted(direct, key=lambda item: item['cumulative_us'], reverse=True)[:5]
+
+    return {
+        'total_ms': entry_time(imports) / 1000,
+        'modules': len(imports),
+        'heavy_loaded': sorted(package for package in HEAVY_PACKAGES
+                               if any(item['module'].split('.')[0] == package for item in imports)),
+        'heaviest': [(item['module'], item['cumulative_us'] / 1000) for item in heaviest]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps d'import des points d'entrée du module 2")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Nombre de processus par point d'entrée (meilleure mesure conservée)")
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (directory, module) in ENTRY_POINTS.items():
+        results[name] = measure_entry_point(directory, module, args.repeat)
+
+    print(f"{'point d entrée':<18} {'import (ms)':>12} {'modules':>8}  dépendances lourdes")
+    for name, result in results.items():
+        heavy = ', '.join(result['heavy_loaded']) or '-'
+        print(f"{name:<18} {result['total_ms']:>12.1f} {result['modules']:>8}  {heavy}")
+        for module, cumulative_ms in result['heaviest']:
+            print(f"{'':<20}{module:<28} {cumulative_ms:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
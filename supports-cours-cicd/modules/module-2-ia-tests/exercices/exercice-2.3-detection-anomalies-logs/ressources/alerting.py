@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Alertes sur les anomalies détectées par LogAnomalyDetector
+Regroupe les anomalies par signature, déduplique dans une fenêtre de temps,
+limite le débit par canal et délivre les notifications en arrière-plan
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from anomaly_detector import LogColumns, PatternScanner, PredictionResults
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Alert:
+    """Notification pour une signature d'anomalie (url, classe de statut, pattern)"""
+    url: str
+    status_class: str
+    pattern: str
+    count: int
+    min_score: float
+    sample: Dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    # Occurrences supprimées par la déduplication depuis la dernière alerte
+    suppressed: int = 0
+
+    @property
+    def signature(self) -> Tuple[str, str, str]:
+        return (self.url, self.status_class, self.pattern)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['sample'] = {key: str(value) for key, value in self.sample.items()}
+        return data
+
+    def summary(self) -> str:
+        """Texte court destiné aux canaux de discussion"""
+        pattern = f", pattern '{self.pattern}'" if self.pattern else ''
+        return (f"{self.count} anomalie(s) sur {self.url or '(sans url)'} "
+                f"[{self.status_class}{pattern}], score min {self.min_score:.3f}")
+
+class AlertSink:
+    """Canal de notification : send() est appelé depuis un thread dédié"""
+
+    name = 'sink'
+
+    def send(self, alert: Alert):
+        raise NotImplementedError
+
+class FileSink(AlertSink):
+    """Ajoute chaque alerte en JSON-lines dans un fichier local"""
+
+    name = 'file'
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def send(self, alert: Alert):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert.to_dict()) + '\n')
+
+class WebhookSink(AlertSink):
+    """POST JSON vers un webhook (format des webhooks entrants Slack)"""
+
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert: Alert):
+        body = json.dumps({'text': alert.summary(), 'alert': alert.to_dict()}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class SlackSink(AlertSink):
+    """Message Slack via slack-sdk (importé à la création du canal)"""
+
+    name = 'slack'
+
+    def __init__(self, token: str, channel: str):
+        from slack_sdk import WebClient
+
+        self.client = WebClient(token=token)
+        self.channel = channel
+
+    def send(self, alert: Alert):
+        self.client.chat_postMessage(channel=self.channel, text=alert.summary())
+
+class _SinkWorker:
+    """File d'envoi d'un canal, avec limitation de débit par seau à jetons"""
+
+    def __init__(self, sink: AlertSink, queue_size: int, rate_limit: int,
+                 rate_period: float, clock: Callable[[], float]):
+        self.sink = sink
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self._clock = clock
+        self._tokens = float(rate_limit)
+        self._refilled_at = clock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.stats = {'queued': 0, 'delivered': 0, 'failed': 0, 'rate_limited': 0, 'dropped': 0}
+        self._thread = threading.Thread(target=self._run, name=f'alerts-{sink.name}', daemon=True)
+        self._thread.start()
+
+    def offer(self, alert: Alert) -> bool:
+        """Met une alerte en file sans jamais bloquer l'appelant"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.rate_limit),
+                               self._tokens + (now - self._refilled_at) * self.rate_limit / self.rate_period)
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.stats['rate_limited'] += 1
+                return False
+            try:
+                self._queue.put_nowait(alert)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                return False
+            self._tokens -= 1
+            self.stats['queued'] += 1
+            return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Attend l'envoi des alertes en file (True si la file est vide)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            alert = self._queue.get()
+            try:
+                if alert is None:
+                    return
+                self.sink.send(alert)
+                self.stats['delivered'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.warning(f"Échec d'envoi d'alerte via {self.sink.name}: {e}")
+            finally:
+                self._queue.task_done()
+
+class AlertManager:
+    """
+    Transforme des résultats de predict en un petit nombre de notifications
+
+    Les anomalies d'un lot sont regroupées par signature (chemin d'URL,
+    classe de statut, premier pattern d'attaque reconnu). Une signature
+    alerte au plus une fois par dedup_window secondes : les occurrences
+    suivantes sont cumulées et envoyées dans une alerte de synthèse à
+    l'expiration de la fenêtre. Chaque canal dispose de son propre débit
+    maximal et de son thread d'envoi : process() ne bloque jamais.
+    """
+
+    def __init__(self, sinks: List[AlertSink], scanner: Optional[PatternScanner] = None,
+                 dedup_window: float = 300.0, rate_limit: int = 10, rate_period: float = 60.0,
+                 queue_size: int = 1000, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise le gestionnaire d'alertes
+
+        Args:
+            sinks: Canaux de notification
+            scanner: Scanner de patterns (celui du détecteur de préférence)
+            dedup_window: Fenêtre de déduplication par signature en secondes
+            rate_limit: Nombre maximal d'alertes par canal sur rate_period
+            rate_period: Période de la limitation de débit en secondes
+            queue_size: Taille maximale de la file d'envoi de chaque canal
+            clock: Horloge en secondes (remplaçable dans les tests)
+        """
+        self.scanner = scanner or PatternScanner()
+        self.dedup_window = dedup_window
+        self._clock = clock
+        self._workers = [_SinkWorker(sink, queue_size, rate_limit, rate_period, clock) for sink in sinks]
+        self._lock = threading.Lock()
+        # Signature -> instant de la dernière alerte
+        self._last_alert: Dict[Tuple[str, str, str], float] = {}
+        # Signature -> occurrences supprimées en attente de synthèse
+        self._pending: Dict[Tuple[str, str, str], Alert] = {}
+        self._anomalies = 0
+        self._alerts = 0
+
+    def process(self, results: Union[PredictionResults, List[Dict]]) -> int:
+        """
+        Traite les résultats d'un appel à predict (ou d'un bloc de predict_stream)
+
+        Args:
+            results: PredictionResults ou liste de prédictions au format dictionnaire
+
+        Returns:
+            Nombre d'alertes émises
+        """
+        groups = self._group_anomalies(results)
+        now = self._clock()
+        emitted = []
+        with self._lock:
+            for alert in groups:
+                self._anomalies += alert.count
+                signature = alert.signature
+                last = self._last_alert.get(signature)
+                if last is not None and now - last < self.dedup_window:
+                    self._accumulate(alert)
+                    continue
+                pending = self._pending.pop(signature, None)
+                if pending is not None:
+                    alert.suppressed = pending.count
+                    alert.count += pending.count
+                    alert.min_score = min(alert.min_score, pending.min_score)
+                self._last_alert[signature] = now
+                emitted.append(alert)
+            emitted.extend(self._expired_summaries(now))
+            self._alerts += len(emitted)
+
+        for alert in emitted:
+            for worker in self._workers:
+                worker.offer(alert)
+        return len(emitted)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Émet les synthèses en attente et attend la fin des envois"""
+        with self._lock:
+            summaries = list(self._pending.values())
+            self._pending.clear()
+            self._alerts += len(summaries)
+        for alert in summaries:
+            for worker in self._workers:
+                worker.offer(alert)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def close(self):
+        """Émet les synthèses en attente puis arrête les threads d'envoi"""
+        self.flush()
+        for worker in self._workers:
+            worker.close()
+
+    def stats(self) -> Dict:
+        """Compteurs globaux et par canal"""
+        with self._lock:
+            stats = {
+                'anomalies': self._anomalies,
+                'alerts': self._alerts,
+                'signatures': len(self._last_alert),
+                'pending': sum(alert.count for alert in self._pending.values())
+            }
+        stats['sinks'] = {worker.sink.name: dict(worker.stats) for worker in self._workers}
+        return stats
+
+    def _accumulate(self, alert: Alert):
+        """Cumule une occurrence supprimée dans la synthèse de sa signature"""
+        pending = self._pending.get(alert.signature)
+        if pending is None:
+            alert.suppressed = alert.count
+            self._pending[alert.signature] = alert
+            return
+        pending.count += alert.count
+        pending.suppressed += alert.count
+        if alert.min_score < pending.min_score:
+            pending.min_score = alert.min_score
+            pending.sample = alert.sample
+
+    def _expired_summaries(self, now: float) -> List[Alert]:
+        """Synthèses dont la fenêtre de déduplication est écoulée"""
+        expired = [signature for signature in self._pending
+                   if now - self._last_alert[signature] >= self.dedup_window]
+        summaries = []
+        for signature in expired:
+            summaries.append(self._pending.pop(signature))
+            self._last_alert[signature] = now
+        return summaries
+
+    def _group_anomalies(self, results: Union[PredictionResults, List[Dict]]) -> List[Alert]:
+        """Regroupe les anomalies d'un lot par signature, en colonnes"""
+        if isinstance(results, PredictionResults):
+            anomalies = np.flatnonzero(results.is_anomaly)
+            scores = results.anomaly_score[anomalies]
+            rows = results.rows[anomalies]
+            entries = results.log_entries
+        else:
+            rows = np.array([i for i, result in enumerate(results) if result['is_anomaly']], dtype=np.int64)
+            scores = np.array([results[i]['anomaly_score'] for i in rows], dtype=float)
+            entries = [result['log_entry'] for result in results]
+        if len(rows) == 0:
+            return []
+
+        urls, statuses, messages = self._anomaly_columns(entries, rows)
+        paths = pd.Series(urls, dtype=object).str.split('?', n=1).str[0].to_numpy(dtype=object)
+        status_codes = pd.to_numeric(pd.Series(statuses, dtype=object), errors='coerce').to_numpy(dtype=float)
+        status_classes = np.full(len(rows), 'unknown', dtype=object)
+        known = ~np.isnan(status_codes)
+        status_classes[known] = [f'{int(code) // 100}xx' for code in status_codes[known]]
+
+        _, hits = self.scanner.scan_columns(pd.Series(messages, dtype=object).str.lower(),
+                                            pd.Series(urls, dtype=object).str.lower())
+        pattern_names = np.array(self.scanner.attack_patterns + [''], dtype=object)
+        first_hit = np.where(hits.any(axis=1), hits.argmax(axis=1), len(self.scanner.attack_patterns))
+        patterns = pattern_names[first_hit]
+
+        frame = pd.DataFrame({'url': paths, 'status_class': status_classes, 'pattern': patterns,
+                              'score': scores, 'row': rows})
+        grouped = frame.groupby(['url', 'status_class', 'pattern'], sort=False)
+        summary = grouped['score'].agg(['size', 'min', 'idxmin'])
+
+        return [
+            Alert(url=url, status_class=status_class, pattern=pattern, count=int(count),
+                  min_score=float(min_score), sample=dict(entries[int(frame.at[sample, 'row'])]))
+            for (url, status_class, pattern), count, min_score, sample in zip(
+                summary.index, summary['size'], summary['min'], summary['idxmin']
+            )
+        ]
+
+    @staticmethod
+    def _anomaly_columns(entries: Union[List[Dict], LogColumns], rows: np.ndarray) -> Tuple[List, List, List]:
+        """URL, statut et message des seules lignes anormales"""
+        if isinstance(entries, LogColumns):
+            columns = entries.columns
+            def take(name, default):
+                values = columns.get(name)
+                if values is None:
+                    return [default] * len(rows)
+                if isinstance(values, np.ndarray):
+                    return values[rows].tolist()
+                return [values[i] for i in rows]
+            urls, statuses, messages = take('url', ''), take('status_code', 200), take('message', '')
+        else:
+            selected = [entries[i] for i in rows]
+            urls = [entry.get('url', '') for entry in selected]
+            statuses = [entry.get('status_code', 200) for entry in selected]
+            messages = [entry.get('message', '') for entry in selected]
+
+        urls = [url if isinstance(url, str) else '' for url in urls]
+        messages = [message if isinstance(message, str) else '' for message in messages]
+        return urls, statuses, messages
@@ -4,110 +4,1424 @@ Détecteur d'anomalies dans les logs avec Machine Learning
 Utilise l'algorithme Isolation Forest pour détecter les patterns anormaux
 """
 
+import bisect
+import gzip
 import json
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import joblib
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Iterable, Iterator, Union
+from itertools import chain, islice
+from pathlib import Path
 import re
+import threading
+import warnings
+
+# Instrumentation par étape (module instrumentation.py des ressources)
+from instrumentation import Instrumentation, default_instrumentation
+
+# Parseur JSON rapide si disponible (mêmes types Python que le module json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# scikit-learn et joblib ne sont importés que sur les chemins qui en ont besoin
+# (entraînement, format joblib, parallélisme) : le scoring d'un artefact compact
+# n'en dépend pas
+if TYPE_CHECKING:
+    from sklearn.ensemble import IsolationForest
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns d'attaque courants
+DEFAULT_ATTACK_PATTERNS = [
+    r'sql.*injection', r'xss', r'script.*alert',
+    r'union.*select', r'drop.*table', r'../.*/',
+    r'cmd.*exec', r'eval\(', r'base64_decode'
+]
+
+# Mots-clés d'erreur comptés dans les messages
+DEFAULT_ERROR_PATTERNS = [r'error', r'exception', r'fail']
+
+class PatternScanner:
+    """
+    Moteur de recherche de patterns compilé une seule fois
+    
+    Les signatures d'attaque sont réunies dans une alternative unique qui sert
+    de pré-filtre : une ligne sans aucune correspondance n'est parcourue
+    qu'une fois. Les signatures ne sont testées individuellement que sur les
+    lignes candidates. En mode colonnes, chaque ligne distincte n'est
+    analysée qu'une seule fois, les logs étant très répétitifs.
+    """
+    
+    def __init__(self, attack_patterns: Optional[List[str]] = None,
+                 error_patterns: Optional[List[str]] = None):
+        """
+        Initialise le scanner
+        
+        Args:
+            attack_patterns: Signatures d'attaque (re.search sur message + url)
+            error_patterns: Mots-clés d'erreur (re.findall sur le message)
+        """
+        self.attack_patterns = list(DEFAULT_ATTACK_PATTERNS if attack_patterns is None
+                                    else attack_patterns)
+        self.error_patterns = list(DEFAULT_ERROR_PATTERNS if error_patterns is None
+                                   else error_patterns)
+        
+        self._attack_regexes = [re.compile(pattern) for pattern in self.attack_patterns]
+        self._any_attack_regex = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.attack_patterns) or r'(?!)'
+        )
+        self._error_regex = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.error_patterns) or r'(?!)'
+        )
+        self._no_hits = [False] * len(self.attack_patterns)
+    
+    def scan(self, message: str, url: str) -> Tuple[int, List[bool]]:
+        """
+        Analyse une ligne de log
+        
+        Args:
+            message: Message du log (déjà en minuscules)
+            url: URL de la requête (déjà en minuscules)
+            
+        Returns:
+            Nombre de mots-clés d'erreur dans le message et, pour chaque
+            signature, si elle est présente dans message + url
+        """
+        error_count = len(self._error_regex.findall(message))
+        text = message + ' ' + url
+        if self._any_attack_regex.search(text) is None:
+            return error_count, list(self._no_hits)
+        return error_count, [regex.search(text) is not None for regex in self._attack_regexes]
+    
+    def scan_columns(self, messages: pd.Series, urls: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Analyse des colonnes complètes, une seule fois par ligne distincte
+        
+        Args:
+            messages: Messages en minuscules
+            urls: URLs en minuscules
+            
+        Returns:
+            Nombre de mots-clés d'erreur par ligne et matrice booléenne
+            (lignes x signatures) des signatures détectées
+        """
+        messages = messages.to_numpy(dtype=object)
+        urls = urls.to_numpy(dtype=object)
+        if len(messages) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, len(self.attack_patterns)), dtype=bool)
+        
+        message_codes, message_uniques = pd.factorize(messages)
+        url_codes, url_uniques = pd.factorize(urls)
+        codes, pair_uniques = pd.factorize(message_codes.astype(np.int64) * len(url_uniques) + url_codes)
+        first_rows = np.unique(codes, return_index=True)[1]
+        unique_messages = messages[first_rows].tolist()
+        unique_texts = [f'{message} {url}' for message, url in zip(unique_messages, urls[first_rows])]
+        
+        error_findall = self._error_regex.findall
+        unique_errors = np.fromiter((len(error_findall(message)) for message in unique_messages),
+                                    dtype=np.int64, count=len(unique_messages))
+        
+        # Pré-filtre : seules les lignes candidates sont testées signature par signature
+        any_attack = self._any_attack_regex.search
+        candidates = [k for k, text in enumerate(unique_texts) if any_attack(text) is not None]
+        unique_hits = np.zeros((len(unique_texts), len(self.attack_patterns)), dtype=bool)
+        candidate_texts = [unique_texts[k] for k in candidates]
+        for j, regex in enumerate(self._attack_regexes):
+            search = regex.search
+            unique_hits[candidates, j] = [search(text) is not None for text in candidate_texts]
+        
+        return unique_errors[codes], unique_hits[codes]
+    
+    def hit_counts(self, hits: np.ndarray) -> Dict[str, int]:
+        """Nombre de lignes touchées par chaque signature"""
+        totals = hits.sum(axis=0)
+        return {pattern: int(total) for pattern, total in zip(self.attack_patterns, totals)}
+
+class TimestampParser:
+    """
+    Conversion vectorisée d'une colonne d'horodatages
+    
+    Les nombres sont des epochs (secondes, ou ms/µs/ns selon l'ordre de
+    grandeur de chaque valeur) et les objets datetime sont acceptés tels
+    quels. Le format des chaînes est détecté sur la première d'entre elles :
+    ISO-8601, Common Log Format (10/Oct/2000:13:55:36 -0700), date compacte
+    ou epoch. Une chaîne de chiffres n'est lue comme epoch qu'à partir de 10
+    chiffres avant la virgule (secondes après septembre 2001) : les dates
+    compactes (20240115, 20240115103000 compris) restent des dates. Les
+    chaînes que ce format ne couvre pas sont regroupées par leur propre
+    format ; seules celles qui n'en ont aucun sont reprises une à une par
+    pd.Timestamp. Le résultat ne dépend donc pas de l'ordre du lot. Chaque
+    chaîne distincte n'est convertie qu'une fois (factorisation du lot, puis
+    cache borné partagé entre les lots).
+    
+    Un horodatage absent (clé manquante, None, NaN ou chaîne vide) suit la
+    politique missing :
+      - 'now' : instant de l'extraction (comportement historique, non reproductible)
+      - 'previous' : horodatage présent précédent du lot (ou suivant en tête de lot)
+      - 'drop' : ligne écartée
+      - 'error' : ValueError
+    """
+    
+    FORMATS = ('iso8601', 'compact', 'epoch', 'clf', 'datetime', 'generic')
+    MISSING_POLICIES = ('now', 'previous', 'drop', 'error')
+    CLF_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+    COMPACT_FORMATS = ('%Y%m%d', '%Y%m%d%H%M%S')
+    
+    ISO_REGEX = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}|$)')
+    CLF_REGEX = re.compile(r'^\d{2}/[A-Za-z]{3}/\d{4}:\d{2}:\d{2}:\d{2}')
+    # Au moins 10 chiffres : '20240115' (AAAAMMJJ) n'est pas un epoch
+    EPOCH_REGEX = re.compile(r'^-?\d{10,}(\.\d*)?$')
+    # Dates compactes AAAAMMJJ[HHMMSS] (le format ISO de base, qu'ISO_REGEX ne couvre pas)
+    COMPACT_DATE_REGEX = re.compile(r'^\d{8}(\d{6})?$')
+    # Décalage UTC en fin de chaîne, après une heure (évite le '-15' d'une date seule)
+    OFFSET_PATTERN = r'\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(Z|[+-]\d{2}(?::?\d{2})?)$'
+    
+    def __init__(self, missing: str = 'now', cache_size: int = 100000):
+        """
+        Args:
+            missing: Politique des horodatages absents (MISSING_POLICIES)
+            cache_size: Nombre maximal de chaînes mémorisées entre deux lots
+        """
+        if missing not in self.MISSING_POLICIES:
+            raise ValueError(f"Politique d'horodatage absent inconnue: {missing} "
+                             f"(attendue parmi {', '.join(self.MISSING_POLICIES)})")
+        self.missing = missing
+        self.cache_size = cache_size
+        self._cache: Dict[str, Tuple[int, int]] = {}
+    
+    def parse(self, values: Union[List, np.ndarray],
+              previous=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convertit une colonne d'horodatages
+        
+        Args:
+            values: Horodatages du lot
+            previous: Horodatage valide précédant le lot, pour une tranche
+                d'un lot plus grand (politique 'previous' seulement)
+        
+        Returns:
+            Instants UTC et heures locales (heure murale du fuseau de la
+            valeur) en nanosecondes epoch, et masque des lignes converties
+        """
+        if previous is not None and self.missing == 'previous':
+            # Placé en tête : les absents du début de tranche le reprennent
+            utc, local, ok = self.parse(np.concatenate((np.array([previous], dtype=object),
+                                                        np.asarray(values, dtype=object))))
+            return utc[1:], local[1:], ok[1:]
+        n_values = len(values)
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        uniques = np.asarray(uniques, dtype=object)
+        blank = np.fromiter((isinstance(u, str) and not u.strip() for u in uniques),
+                            dtype=bool, count=len(uniques))
+        
+        unique_utc, unique_local, unique_ok = self._parse_uniques(uniques, ~blank)
+        present = codes >= 0
+        present[present] = ~blank[codes[present]]
+        utc = np.zeros(n_values, dtype=np.int64)
+        local = np.zeros(n_values, dtype=np.int64)
+        ok = np.zeros(n_values, dtype=bool)
+        utc[present] = unique_utc[codes[present]]
+        local[present] = unique_local[codes[present]]
+        ok[present] = unique_ok[codes[present]]
+        
+        missing = ~present
+        if missing.any():
+            self._fill_missing(utc, local, ok, missing)
+        return utc, local, ok
+    
+    def _fill_missing(self, utc: np.ndarray, local: np.ndarray, ok: np.ndarray, missing: np.ndarray):
+        """Applique la politique des horodatages absents (en place)"""
+        if self.missing == 'error':
+            raise ValueError(f"{int(missing.sum())} entrée(s) sans horodatage")
+        if self.missing == 'now':
+            now = pd.Timestamp(datetime.now()).value
+            utc[missing] = now
+            local[missing] = now
+            ok[missing] = True
+        elif self.missing == 'previous':
+            known = np.flatnonzero(ok & ~missing)
+            if not len(known):
+                return
+            rows = np.flatnonzero(missing)
+            source = known[np.maximum(np.searchsorted(known, rows) - 1, 0)]
+            utc[rows] = utc[source]
+            local[rows] = local[source]
+            ok[rows] = True
+    
+    def _parse_uniques(self, uniques: np.ndarray, present: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Convertit les valeurs distinctes d'un lot, cache compris"""
+        n_uniques = len(uniques)
+        utc = np.zeros(n_uniques, dtype=np.int64)
+        local = np.zeros(n_uniques, dtype=np.int64)
+        ok = np.zeros(n_uniques, dtype=bool)
+        
+        # Chaînes déjà converties lors des lots précédents
+        cache = self._cache
+        pending = np.zeros(n_uniques, dtype=bool)
+        for i, (value, is_present) in enumerate(zip(uniques.tolist(), present.tolist())):
+            if not is_present:
+                continue
+            hit = cache.get(value) if isinstance(value, str) else None
+            if hit is None:
+                pending[i] = True
+            else:
+                utc[i], local[i] = hit
+                ok[i] = True
+        
+        todo = np.flatnonzero(pending)
+        if not len(todo):
+            return utc, local, ok
+        
+        values = uniques[todo]
+        parsed_utc, parsed_local, parsed_ok = self._parse_values(values)
+        utc[todo], local[todo], ok[todo] = parsed_utc, parsed_local, parsed_ok
+        
+        if len(cache) + len(todo) > self.cache_size:
+            cache.clear()
+        for value, value_utc, value_local, value_ok in zip(
+                values.tolist(), parsed_utc.tolist(), parsed_local.tolist(), parsed_ok.tolist()):
+            if value_ok and isinstance(value, str):
+                cache[value] = (value_utc, value_local)
+        return utc, local, ok
+    
+    def _parse_values(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convertit des valeurs distinctes, indépendamment de leur ordre
+        
+        Les valeurs qui ne sont pas des chaînes sont regroupées par leur
+        format propre ; les chaînes sont converties dans le format de la
+        première, puis celles qu'il refuse regroupées par leur format propre.
+        """
+        n_values = len(values)
+        utc = np.zeros(n_values, dtype=np.int64)
+        local = np.zeros(n_values, dtype=np.int64)
+        ok = np.zeros(n_values, dtype=bool)
+        
+        value_list = values.tolist()
+        is_string = np.fromiter((isinstance(value, str) for value in value_list),
+                                dtype=bool, count=n_values)
+        groups: Dict[str, List[int]] = {}
+        for i in np.flatnonzero(~is_string).tolist():
+            groups.setdefault(self._value_format(value_list[i]), []).append(i)
+        strings = np.flatnonzero(is_string)
+        if len(strings):
+            # Chemin rapide : lot homogène dans le format de la première chaîne
+            fmt = self._value_format(value_list[strings[0]])
+            rows = strings
+            utc[rows], local[rows], ok[rows] = self._parse_group(values[rows], fmt)
+            for i in rows[~ok[rows]].tolist():
+                own = self._value_format(value_list[i])
+                groups.setdefault('generic' if own == fmt else own, []).append(i)
+        
+        for fmt, rows in groups.items():
+            rows = np.array(rows)
+            utc[rows], local[rows], ok[rows] = self._parse_group(values[rows], fmt)
+        return utc, local, ok
+    
+    def _parse_group(self, values: np.ndarray, fmt: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Conversion vectorisée dans un format, au cas par cas en dernier recours"""
+        if fmt == 'generic':
+            return self._parse_generic(values)
+        try:
+            return self._parse_format(values, fmt)
+        except (TypeError, ValueError, OverflowError):
+            return self._parse_generic(values)
+    
+    @classmethod
+    def detect_format(cls, values: np.ndarray) -> str:
+        """Format d'un lot, déduit de sa première valeur"""
+        if not len(values):
+            return 'generic'
+        return cls._value_format(values[0])
+    
+    @classmethod
+    def _value_format(cls, value) -> str:
+        """Format d'une valeur"""
+        if isinstance(value, datetime):
+            return 'datetime'
+        if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+            return 'epoch'
+        if isinstance(value, str):
+            text = value.strip()
+            if cls.ISO_REGEX.match(text):
+                return 'iso8601'
+            if cls.CLF_REGEX.match(text):
+                return 'clf'
+            if cls.COMPACT_DATE_REGEX.match(text):
+                return 'compact'
+            if cls.EPOCH_REGEX.match(text):
+                return 'epoch'
+        return 'generic'
+    
+    def _parse_format(self, values: np.ndarray, fmt: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Conversion vectorisée des valeurs dans le format détecté"""
+        if fmt == 'epoch':
+            numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+            # Chaînes qui ne sont pas des epochs (dates compactes) : reprises dans leur format
+            epoch_match = self.EPOCH_REGEX.match
+            compact_match = self.COMPACT_DATE_REGEX.match
+            ok = np.isfinite(numbers) & np.fromiter(
+                (not isinstance(value, str) or (epoch_match(value.strip()) is not None
+                                                and compact_match(value.strip()) is None)
+                 for value in values.tolist()),
+                dtype=bool, count=len(values))
+            nanoseconds, in_range = self._epoch_nanoseconds(np.where(ok, numbers, 0.0))
+            ok &= in_range
+            nanoseconds[~ok] = 0
+            return nanoseconds, nanoseconds.copy(), ok
+        
+        if fmt == 'datetime':
+            offsets = np.array([
+                value.utcoffset().total_seconds() if isinstance(value, datetime) and value.utcoffset() else 0.0
+                for value in values.tolist()
+            ])
+            parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors='coerce')
+        else:
+            strings = pd.Series(values, dtype=object).str.strip()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                parsed = pd.to_datetime(strings, utc=True, errors='coerce',
+                                        format='ISO8601' if fmt == 'iso8601' else
+                                        self.CLF_FORMAT if fmt == 'clf' else
+                                        self.COMPACT_FORMATS[0] if fmt == 'compact' else None)
+                if fmt == 'compact':
+                    # AAAAMMJJHHMMSS : second format, sur les seules valeurs non converties
+                    retry = parsed.isna() & strings.str.len().eq(14)
+                    if retry.any():
+                        parsed[retry] = pd.to_datetime(strings[retry], utc=True, errors='coerce',
+                                                       format=self.COMPACT_FORMATS[1])
+            offsets = self._string_offsets(strings)
+        
+        ok = parsed.notna().to_numpy()
+        utc = np.where(ok, parsed.array.asi8, 0)
+        local = utc + np.round(offsets * 1e9).astype(np.int64)
+        return utc, local, ok
+    
+    @classmethod
+    def _string_offsets(cls, strings: pd.Series) -> np.ndarray:
+        """Décalage UTC en secondes écrit en fin de chaîne (0 si absent ou 'Z')"""
+        found = strings.str.extract(cls.OFFSET_PATTERN, expand=False).fillna('Z')
+        if (found == 'Z').all():
+            return np.zeros(len(strings))
+        digits = found.str.replace(':', '', regex=False).str[1:]
+        hours = pd.to_numeric(digits.str[:2], errors='coerce').fillna(0).to_numpy()
+        minutes = pd.to_numeric(digits.str[2:4], errors='coerce').fillna(0).to_numpy()
+        sign = np.where(found.str[0].to_numpy(dtype=object) == '-', -1.0, 1.0)
+        return np.where((found == 'Z').to_numpy(), 0.0, sign * (hours * 3600 + minutes * 60))
+    
+    @staticmethod
+    def _epoch_nanoseconds(numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Epochs en nanosecondes et masque des valeurs représentables
+        
+        Unité déduite de l'ordre de grandeur de chaque valeur : s, ms, µs ou
+        ns ; les valeurs entières sont converties sans arrondi flottant.
+        """
+        magnitude = np.abs(numbers)
+        scale = np.select([magnitude < 1e11, magnitude < 1e14, magnitude < 1e17], [10**9, 10**6, 10**3], 1)
+        in_range = magnitude * scale < 2.0 ** 63
+        numbers = np.where(in_range, numbers, 0.0)
+        integral = numbers == np.trunc(numbers)
+        nanoseconds = np.where(integral, numbers.astype(np.int64) * scale,
+                               np.round(numbers * scale).astype(np.int64))
+        return nanoseconds, in_range
+    
+    @classmethod
+    def _parse_generic(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Conversion valeur par valeur (formats non reconnus ou lots hétérogènes)"""
+        utc = np.zeros(len(values), dtype=np.int64)
+        local = np.zeros(len(values), dtype=np.int64)
+        ok = np.zeros(len(values), dtype=bool)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for i, value in enumerate(values.tolist()):
+                if isinstance(value, bool):
+                    continue
+                if isinstance(value, (int, float, np.integer, np.floating)):
+                    # Nombre : règle epoch, jamais des nanosecondes implicites
+                    if np.isfinite(value):
+                        nanoseconds, in_range = cls._epoch_nanoseconds(np.array([float(value)]))
+                        utc[i] = local[i] = nanoseconds[0]
+                        ok[i] = in_range[0]
+                    continue
+                try:
+                    timestamp = pd.Timestamp(value)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+                if timestamp is pd.NaT:
+                    continue
+                utc[i] = timestamp.value
+                local[i] = timestamp.tz_localize(None).value if timestamp.tzinfo else timestamp.value
+                ok[i] = True
+        return utc, local, ok
+
+class LogColumns:
+    """
+    Lot d'entrées de logs stocké par colonnes
+    
+    Produit par les lecteurs de fichiers (LogAnomalyDetector.read_logs) et
+    accepté partout où une liste d'entrées l'est. Les champs absents prennent
+    leur valeur par défaut à l'extraction ; l'accès à une ligne renvoie
+    l'enregistrement d'origine s'il a été conservé (tous ses champs, y compris
+    ceux que le détecteur n'utilise pas), sinon un dictionnaire reconstruit
+    à la demande (repli ligne à ligne, résultats de predict).
+    """
+    
+    def __init__(self, columns: Dict[str, Union[List, np.ndarray]],
+                 records: Optional[List[Dict]] = None):
+        """
+        Args:
+            columns: Nom de champ -> valeurs (listes ou tableaux NumPy de même longueur)
+            records: Enregistrements d'origine, un par ligne (optionnel)
+        """
+        lengths = {len(values) for values in columns.values()}
+        if records is not None:
+            lengths.add(len(records))
+        if len(lengths) > 1:
+            raise ValueError("Toutes les colonnes doivent avoir la même longueur")
+        self.columns = columns
+        self.records = records
+        self._length = lengths.pop() if lengths else 0
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LogColumns({name: values[index] for name, values in self.columns.items()},
+                              None if self.records is None else self.records[index])
+        if self.records is not None:
+            return self.records[index]
+        return {
+            name: values[index].item() if isinstance(values, np.ndarray) else values[index]
+            for name, values in self.columns.items()
+        }
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._length):
+            yield self[i]
+
+class WindowAggregator:
+    """
+    Agrégats glissants par clé (méthode + chemin d'URL) sur une fenêtre temporelle
+    
+    Pour chaque ligne : débit de la clé (requêtes/s), taux d'erreur et p95 du
+    temps de réponse sur les window_seconds précédant son horodatage (bornes
+    (t - window, t], lignes simultanées comprises). Les lignes sont triées
+    une fois par (clé, temps) ; débit et taux d'erreur viennent de sommes
+    cumulées, le p95 d'une fenêtre triée mise à jour de façon incrémentale.
+    
+    En mode flux (stateful=True), les lignes encore dans la fenêtre sont
+    conservées d'un appel à l'autre : des lots successifs dans l'ordre du
+    temps donnent le même résultat qu'un lot unique (hors lignes simultanées
+    réparties sur deux lots, qui ne voient que celles déjà reçues).
+    """
+    
+    FEATURES = ('window_request_rate', 'window_error_rate', 'window_p95_response_time')
+    
+    def __init__(self, window_seconds: float, stateful: bool = False):
+        """
+        Args:
+            window_seconds: Durée de la fenêtre glissante en secondes
+            stateful: Conserver la fin de fenêtre entre deux appels (mode flux)
+        """
+        if window_seconds <= 0:
+            raise ValueError("window_seconds doit être strictement positif")
+        self.window_seconds = float(window_seconds)
+        self.stateful = stateful
+        self.reset()
+    
+    def reset(self):
+        """Oublie les lignes conservées des appels précédents"""
+        self._tail_keys = np.zeros(0, dtype=object)
+        self._tail_times = np.zeros(0)
+        self._tail_errors = np.zeros(0, dtype=bool)
+        self._tail_response_times = np.zeros(0)
+    
+    def transform(self, keys: np.ndarray, times: np.ndarray, is_error: np.ndarray,
+                  response_times: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calcule les agrégats glissants d'un lot
+        
+        Args:
+            keys: Clé de regroupement de chaque ligne
+            times: Horodatages en secondes
+            is_error: Lignes en erreur (status >= 400)
+            response_times: Temps de réponse
+        
+        Returns:
+            Dictionnaire feature -> valeurs, dans l'ordre des lignes du lot
+        """
+        n_new = len(keys)
+        n_tail = len(self._tail_keys)
+        keys = np.concatenate([self._tail_keys, np.asarray(keys, dtype=object)])
+        times = np.concatenate([self._tail_times, np.asarray(times, dtype=float)])
+        is_error = np.concatenate([self._tail_errors, np.asarray(is_error, dtype=bool)])
+        response_times = np.concatenate([self._tail_response_times,
+                                         np.asarray(response_times, dtype=float)])
+        
+        results = {name: np.zeros(n_new) for name in self.FEATURES}
+        if n_new == 0:
+            return results
+        
+        # Tri unique par (clé, temps)
+        key_codes = pd.factorize(keys)[0]
+        order = np.lexsort((times, key_codes))
+        sorted_codes = key_codes[order]
+        sorted_times = times[order]
+        
+        # Bornes de fenêtre par recherche dichotomique dans chaque clé
+        lo = np.empty(len(keys), dtype=np.int64)
+        hi = np.empty(len(keys), dtype=np.int64)
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        for start, end in zip(np.concatenate([[0], boundaries]),
+                              np.concatenate([boundaries, [len(keys)]])):
+            group = sorted_times[start:end]
+            lo[start:end] = start + np.searchsorted(group, group - self.window_seconds, side='right')
+            hi[start:end] = start + np.searchsorted(group, group, side='right')
+        
+        counts = hi - lo
+        error_cumsum = np.concatenate([[0], np.cumsum(is_error[order])])
+        rate = counts / self.window_seconds
+        error_rate = (error_cumsum[hi] - error_cumsum[lo]) / counts
+        p95 = self._sliding_p95(response_times[order], lo, hi)
+        
+        # Retour à l'ordre d'origine, lignes conservées du lot précédent exclues
+        new_rows = order >= n_tail
+        destination = order[new_rows] - n_tail
+        results['window_request_rate'][destination] = rate[new_rows]
+        results['window_error_rate'][destination] = error_rate[new_rows]
+        results['window_p95_response_time'][destination] = p95[new_rows]
+        
+        if self.stateful:
+            keep = times > times.max() - self.window_seconds
+            self._tail_keys = keys[keep]
+            self._tail_times = times[keep]
+            self._tail_errors = is_error[keep]
+            self._tail_response_times = response_times[keep]
+        
+        return results
+    
+    @staticmethod
+    def _sliding_p95(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """
+        p95 (interpolation linéaire, comme np.percentile) de values[lo[i]:hi[i]]
+        
+        Les bornes sont croissantes au sein d'une clé : chaque valeur entre
+        puis sort une seule fois de la liste triée de la fenêtre.
+        """
+        p95 = [0.0] * len(values)
+        values = values.tolist()
+        insort, bisect_left = bisect.insort, bisect.bisect_left
+        window = []
+        window_lo = window_hi = 0
+        previous = None
+        for i, bounds in enumerate(zip(lo.tolist(), hi.tolist())):
+            if bounds == previous:
+                # Lignes simultanées : même fenêtre
+                p95[i] = p95[i - 1]
+                continue
+            previous = bounds
+            start, end = bounds
+            if start >= window_hi:
+                # Nouvelle clé (ou fenêtre disjointe) : repartir d'une fenêtre vide
+                window = []
+                window_lo = window_hi = start
+            for value in values[window_hi:end]:
+                insort(window, value)
+            for value in values[window_lo:start]:
+                del window[bisect_left(window, value)]
+            window_lo, window_hi = start, max(window_hi, end)
+            
+            rank = 0.95 * (len(window) - 1)
+            below = int(rank)
+            above = min(below + 1, len(window) - 1)
+            p95[i] = window[below] + (window[above] - window[below]) * (rank - below)
+        return np.array(p95)
+
+class ReservoirSampler:
+    """
+    Échantillon uniforme de taille bornée d'un flux (algorithme R)
+    
+    Chaque élément vu a la même probabilité capacity / seen d'être dans
+    l'échantillon, quelle que soit la longueur du flux. Les tirages sont
+    faits par lot (un appel NumPy par add) ; seuls les éléments retenus
+    sont conservés, l'échantillon est restitué dans l'ordre d'arrivée.
+    """
+    
+    def __init__(self, capacity: int, seed: Optional[int] = None):
+        """
+        Args:
+            capacity: Taille maximale de l'échantillon
+            seed: Graine des tirages
+        """
+        if capacity < 1:
+            raise ValueError("capacity doit être strictement positif")
+        self.capacity = capacity
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._items: List = []
+        self._positions: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def add(self, items: List):
+        """Présente un lot d'éléments au réservoir"""
+        start = self.seen
+        self.seen += len(items)
+        
+        # Remplissage initial
+        fill = min(self.capacity - len(self._items), len(items))
+        if fill > 0:
+            self._items.extend(items[:fill])
+            self._positions.extend(range(start, start + fill))
+        else:
+            fill = 0
+        if fill == len(items):
+            return
+        
+        # L'élément d'indice global i remplace l'emplacement j ~ U[0, i] si j < capacity
+        positions = np.arange(start + fill, start + len(items))
+        slots = self._rng.integers(0, positions + 1)
+        accepted = np.flatnonzero(slots < self.capacity)
+        if not len(accepted):
+            return
+        
+        # Emplacement tiré plusieurs fois dans le lot : le dernier tirage l'emporte
+        slots, first = np.unique(slots[accepted][::-1], return_index=True)
+        winners = accepted[len(accepted) - 1 - first]
+        for slot, index in zip(slots.tolist(), winners.tolist()):
+            self._items[slot] = items[fill + index]
+            self._positions[slot] = start + fill + index
+    
+    def sample(self) -> List:
+        """Éléments retenus, dans l'ordre d'arrivée"""
+        order = np.argsort(self._positions, kind='stable')
+        return [self._items[i] for i in order.tolist()]
+
+class DriftMonitor:
+    """
+    Détection de dérive des distributions de features
+    
+    Chaque feature est résumée par un histogramme de taille fixe dont les
+    bornes sont les quantiles des données d'entraînement (histogramme de
+    référence). Les lots scorés alimentent un histogramme courant sur les
+    mêmes bornes : le coût par ligne est constant (une recherche
+    dichotomique par feature) et la mémoire ne dépend pas du volume scoré.
+    
+    Les scores comparent les deux histogrammes : PSI (Population Stability
+    Index, dérive notable au-delà de 0.2) et statistique de Kolmogorov-
+    Smirnov calculée sur les fonctions de répartition discrétisées.
+    """
+    
+    # Probabilité minimale d'un intervalle (évite log(0) dans le PSI)
+    EPSILON = 1e-4
+    
+    def __init__(self, feature_names: List[str], edges: np.ndarray, reference: np.ndarray):
+        """
+        Args:
+            feature_names: Nom des features, dans l'ordre des colonnes
+            edges: Bornes intérieures par feature (n_features, n_bins - 1), complétées par +inf
+            reference: Effectifs d'entraînement par intervalle (n_features, n_bins)
+        """
+        self.feature_names = list(feature_names)
+        self.edges = edges
+        self.reference = reference
+        self.live = np.zeros(reference.shape, dtype=np.int64)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def fit(cls, X: np.ndarray, feature_names: List[str], n_bins: int = 20) -> 'DriftMonitor':
+        """Construit les histogrammes de référence sur les features d'entraînement"""
+        n_features = X.shape[1]
+        edges = np.full((n_features, n_bins - 1), np.inf)
+        if len(X):
+            quantiles = np.quantile(X, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T
+            for j in range(n_features):
+                # Features discrètes : moins de bornes distinctes que d'intervalles
+                unique = np.unique(quantiles[j])
+                edges[j, :len(unique)] = unique
+        monitor = cls(feature_names, edges, np.zeros((n_features, n_bins), dtype=np.int64))
+        monitor.reference = monitor._counts(X)
+        return monitor
+    
+    def _counts(self, X: np.ndarray) -> np.ndarray:
+        """Effectifs par intervalle de chaque feature"""
+        n_features, n_bins = self.reference.shape
+        counts = np.empty((n_features, n_bins), dtype=np.int64)
+        for j in range(n_features):
+            bins = np.searchsorted(self.edges[j], X[:, j], side='right')
+            counts[j] = np.bincount(bins, minlength=n_bins)[:n_bins]
+        return counts
+    
+    def add_reference(self, X: np.ndarray):
+        """Ajoute des données d'entraînement à la référence (bornes inchangées)"""
+        self.reference = self.reference + self._counts(X)
+    
+    def update(self, X: np.ndarray):
+        """Ajoute un lot de features scorées à l'histogramme courant"""
+        counts = self._counts(X)
+        with self._lock:
+            self.live += counts
+    
+    def reset(self):
+        """Vide l'histogramme courant (nouvelle période d'observation)"""
+        with self._lock:
+            self.live = np.zeros(self.reference.shape, dtype=np.int64)
+    
+    def report(self, psi_threshold: float = 0.2) -> Dict:
+        """
+        Scores de dérive de l'histogramme courant par rapport à la référence
+        
+        Args:
+            psi_threshold: PSI au-delà duquel une feature est signalée
+            
+        Returns:
+            Lignes observées, PSI et KS par feature, PSI maximal et features en dérive
+        """
+        with self._lock:
+            live = self.live.copy()
+        rows = int(live[0].sum()) if len(live) else 0
+        if rows == 0:
+            return {'rows': 0, 'features': {}, 'max_psi': 0.0, 'drifted': []}
+        
+        reference = self.reference / np.maximum(self.reference.sum(axis=1, keepdims=True), 1)
+        current = live / rows
+        p = np.maximum(reference, self.EPSILON)
+        q = np.maximum(current, self.EPSILON)
+        psi = np.sum((q - p) * np.log(q / p), axis=1)
+        ks = np.max(np.abs(np.cumsum(reference, axis=1) - np.cumsum(current, axis=1)), axis=1)
+        
+        return {
+            'rows': rows,
+            'features': {name: {'psi': float(psi[j]), 'ks': float(ks[j])}
+                         for j, name in enumerate(self.feature_names)},
+            'max_psi': float(psi.max()),
+            'drifted': [name for j, name in enumerate(self.feature_names) if psi[j] > psi_threshold]
+        }
+
+class PredictionResults:
+    """
+    Résultats de predict au format colonnes
+    
+    Une ligne par entrée scorée : is_anomaly, anomaly_score et confidence
+    sont des tableaux NumPy indexés par ligne. L'accès à une ligne (ou
+    l'itération) reconstruit à la demande le dictionnaire historique de
+    predict, sans copie préalable de chaque entrée.
+    
+    rows donne, pour chaque ligne, la position de son entrée dans
+    log_entries : les entrées écartées à l'extraction (horodatage absent
+    avec missing_timestamp='drop', entrée invalide) n'ont pas de ligne, et
+    les suivantes restent associées à leur propre score.
+    """
+    
+    def __init__(self, log_entries: Union[List[Dict], LogColumns], anomaly_score: np.ndarray,
+                 rows: Optional[np.ndarray] = None):
+        """
+        Args:
+            log_entries: Entrées soumises (référencées, non copiées)
+            anomaly_score: Scores de decision_function (négatif = anomalie)
+            rows: Position dans log_entries de chaque score (None = toutes les entrées, dans l'ordre)
+        """
+        self.log_entries = log_entries
+        self.anomaly_score = np.asarray(anomaly_score, dtype=float)
+        self.rows = (np.arange(len(self.anomaly_score)) if rows is None
+                     else np.asarray(rows, dtype=np.int64))
+        self.is_anomaly = self.anomaly_score < 0
+        self.confidence = np.abs(self.anomaly_score)
+    
+    def __len__(self) -> int:
+        return len(self.anomaly_score)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Seules les tranches contiguës sont supportées")
+            return PredictionResults(self.log_entries, self.anomaly_score[start:stop],
+                                     self.rows[start:stop])
+        
+        entry = self.log_entries[int(self.rows[index])]
+        return {
+            'log_entry': entry,
+            'is_anomaly': bool(self.is_anomaly[index]),
+            'anomaly_score': float(self.anomaly_score[index]),
+            'confidence': float(self.confidence[index]),
+            'timestamp': entry.get('timestamp', datetime.now().isoformat())
+        }
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_list(self) -> List[Dict]:
+        """Liste de dictionnaires, format historique de predict"""
+        return list(self)
+    
+    @property
+    def n_anomalies(self) -> int:
+        """Nombre d'entrées classées anormales"""
+        return int(self.is_anomaly.sum())
+    
+    def dropped_rows(self) -> np.ndarray:
+        """Positions dans log_entries des entrées écartées à l'extraction (sans score)"""
+        scored = np.zeros(len(self.log_entries), dtype=bool)
+        scored[self.rows] = True
+        return np.flatnonzero(~scored)
+    
+    def top_k(self, k: int) -> np.ndarray:
+        """
+        Indices des k entrées les plus anormales
+        
+        Sélection partielle en O(n) puis tri des seuls k retenus.
+        
+        Args:
+            k: Nombre d'entrées à retourner
+            
+        Returns:
+            Indices de lignes, du score le plus bas (le plus anormal) au plus haut
+        """
+        k = min(max(k, 0), len(self))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64)
+        candidates = np.argpartition(self.anomaly_score, k - 1)[:k]
+        return candidates[np.argsort(self.anomaly_score[candidates], kind='stable')]
+
+# Access logs au format Common/Combined Log Format, suivis éventuellement de
+# la durée de la requête en secondes ($request_time de nginx)
+ACCESS_LOG_REGEX = re.compile(
+    r'^\S+ \S+ \S+ \[(?P<time>[^\]]+)\] '
+    r'"(?:(?P<method>[A-Za-z]+) (?P<url>\S+)[^"]*|[^"]*)" '
+    r'(?P<status>\d{3}) (?P<size>\d+|-)'
+    r'(?: "[^"]*" "(?P<agent>[^"]*)")?'
+    r'(?: (?P<request_time>\d+(?:\.\d+)?))?\s*$',
+    re.MULTILINE
+)
+ACCESS_LOG_MONTHS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+# Format d'artefact compact (manifeste JSON + tableaux NumPy mappables en mémoire)
+ARTIFACT_FORMAT = 'log-anomaly-detector'
+ARTIFACT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+def _apply_trees(X: np.ndarray, roots: np.ndarray, children_left: np.ndarray,
+                 children_right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray) -> np.ndarray:
+    """
+    Descend chaque ligne de X dans tous les arbres à la fois
+    
+    Les arbres sont concaténés : les indices d'enfants sont globaux et les
+    feuilles ont une feature négative. Retourne la matrice (lignes x arbres)
+    des indices de feuilles atteintes.
+    """
+    rows = np.arange(len(X))[:, np.newaxis]
+    nodes = np.broadcast_to(roots, (len(X), len(roots))).copy()
+    while True:
+        node_features = feature[nodes]
+        internal = node_features >= 0
+        if not internal.any():
+            return nodes
+        go_left = X[rows, np.where(internal, node_features, 0)] <= threshold[nodes]
+        nodes = np.where(internal,
+                         np.where(go_left, children_left[nodes], children_right[nodes]),
+                         nodes)
+
+class CompactScaler:
+    """Normalisation en lecture seule à partir des paramètres d'un StandardScaler"""
+    
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+    
+    def transform(self, X) -> np.ndarray:
+        """Applique (X - moyenne) / écart-type comme StandardScaler.transform"""
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+class CompactIsolationForest:
+    """
+    Isolation Forest en lecture seule évaluée directement sur les tableaux des arbres
+    
+    Reproduit IsolationForest.score_samples de scikit-learn sans reconstruire
+    les estimateurs : les tableaux peuvent être des mmap partagés entre
+    processus, et le chargement ne dépend pas de scikit-learn.
+    """
+    
+    ARRAYS = ('roots', 'children_left', 'children_right', 'feature', 'threshold', 'path_length')
+    
+    # Nombre de lignes évaluées à la fois (borne la matrice lignes x arbres)
+    CHUNK_SIZE = 10000
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], offset: float, denominator: float,
+                 max_samples: int):
+        self.arrays = arrays
+        self.offset_ = offset
+        self.denominator = denominator
+        self.max_samples_ = max_samples
+        self.n_estimators = len(arrays['roots'])
+    
+    @staticmethod
+    def export_arrays(model: 'IsolationForest') -> Tuple[Dict[str, np.ndarray], float]:
+        """Aplatit les arbres d'une IsolationForest entraînée en tableaux concaténés"""
+        from sklearn.ensemble._iforest import _average_path_length
+        
+        subsample_features = model._max_features != model.n_features_in_
+        parts = {name: [] for name in CompactIsolationForest.ARRAYS if name != 'roots'}
+        roots = []
+        offset = 0
+        for tree_idx, (estimator, features) in enumerate(
+            zip(model.estimators_, model.estimators_features_)
+        ):
+            tree = estimator.tree_
+            internal = tree.children_left >= 0
+            node_features = tree.feature.astype(np.int64)
+            if subsample_features:
+                node_features = np.where(internal, np.asarray(features)[np.maximum(node_features, 0)], -1)
+            else:
+                node_features = np.where(internal, node_features, -1)
+            
+            roots.append(offset)
+            parts['children_left'].append(np.where(internal, tree.children_left + offset, -1))
+            parts['children_right'].append(np.where(internal, tree.children_right + offset, -1))
+            parts['feature'].append(node_features)
+            parts['threshold'].append(tree.threshold)
+            parts['path_length'].append(
+                model._decision_path_lengths[tree_idx]
+                + model._average_path_length_per_tree[tree_idx]
+                - 1.0
+            )
+            offset += tree.node_count
+        
+        arrays = {name: np.concatenate(values) for name, values in parts.items()}
+        arrays['roots'] = np.array(roots, dtype=np.int64)
+        for name in ('children_left', 'children_right', 'feature'):
+            arrays[name] = arrays[name].astype(np.int64)
+        denominator = float(len(model.estimators_) * _average_path_length([model._max_samples])[0])
+        return arrays, denominator
+    
+    def score_samples(self, X) -> np.ndarray:
+        """Score d'anomalie brut (plus il est bas, plus la ligne est anormale)"""
+        X = np.asarray(X, dtype=np.float32)
+        a = self.arrays
+        depths = np.zeros(len(X))
+        for start in range(0, len(X), self.CHUNK_SIZE):
+            leaves = _apply_trees(X[start:start + self.CHUNK_SIZE], a['roots'], a['children_left'],
+                                  a['children_right'], a['feature'], a['threshold'])
+            chunk_depths = depths[start:start + self.CHUNK_SIZE]
+            path_lengths = a['path_length'][leaves]
+            for tree_idx in range(self.n_estimators):
+                chunk_depths += path_lengths[:, tree_idx]
+        
+        if self.denominator == 0:
+            return -np.ones_like(depths)
+        return -(2 ** (-depths / self.denominator))
+    
+    def decision_function(self, X) -> np.ndarray:
+        """Score décalé du seuil de contamination (négatif = anomalie)"""
+        return self.score_samples(X) - self.offset_
+    
+    def predict(self, X) -> np.ndarray:
+        """-1 pour les anomalies, 1 sinon"""
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
 class LogAnomalyDetector:
     """
     Détecteur d'anomalies pour logs applicatifs utilisant Isolation Forest
     """
     
-    def __init__(self, contamination: float = 0.1, random_state: int = 42):
+    # Encodage des méthodes HTTP
+    METHOD_MAPPING = {
+        'GET': 1, 'POST': 2, 'PUT': 3, 'DELETE': 4,
+        'PATCH': 5, 'HEAD': 6, 'OPTIONS': 7
+    }
+    
+    # Champs numériques des logs et leur valeur par défaut
+    NUMERIC_FIELDS = {
+        'status_code': 200, 'response_time': 0, 'request_size': 0,
+        'response_size': 0, 'cpu_usage': 0, 'memory_usage': 0
+    }
+    INTEGER_FIELDS = ('status_code', 'request_size', 'response_size')
+    
+    # Taille minimale d'une tranche confiée à un worker (scoring en threads)
+    PARALLEL_MIN_ENTRIES = 50000
+    # Extraction en processus : le processus principal sérialise les entrées
+    # (environ 30 % du coût de l'extraction, qui garde le GIL) ; rentable
+    # seulement avec de grosses tranches et au moins 4 workers
+    PARALLEL_EXTRACT_MIN_ENTRIES = 100000
+    PARALLEL_EXTRACT_MIN_WORKERS = 4
+    
+    # Nom du composant dans les métriques d'instrumentation
+    COMPONENT = 'log_anomaly_detector'
+    
+    def __init__(self, contamination: float = 0.1, random_state: int = 42,
+                 attack_patterns: Optional[List[str]] = None,
+                 error_patterns: Optional[List[str]] = None,
+                 n_jobs: int = 1, window_seconds: Optional[float] = None,
+                 missing_timestamp: str = 'now',
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Initialise le détecteur d'anomalies
         
         Args:
             contamination: Proportion d'anomalies attendues (0.1 = 10%)
             random_state: Graine pour la reproductibilité
+            attack_patterns: Signatures d'attaque (DEFAULT_ATTACK_PATTERNS par défaut)
+            error_patterns: Mots-clés d'erreur (DEFAULT_ERROR_PATTERNS par défaut)
+            n_jobs: Nombre de workers pour l'extraction et le scoring (-1 = tous les cœurs)
+            window_seconds: Fenêtre des agrégats glissants par méthode/URL (None = désactivés)
+            missing_timestamp: Politique des entrées sans horodatage
+                ('now', 'previous', 'drop' ou 'error', voir TimestampParser)
+            instrumentation: Registre des métriques par étape (default_instrumentation par défaut)
         """
         self.contamination = contamination
         self.random_state = random_state
-        self.model = IsolationForest(
-            contamination=contamination,
-            random_state=random_state,
-            n_estimators=100
-        )
-        self.scaler = StandardScaler()
+        self.n_jobs = n_jobs
+        self.window_seconds = window_seconds
+        self.instrumentation = instrumentation or default_instrumentation
+        self.pattern_scanner = PatternScanner(attack_patterns, error_patterns)
+        self.timestamp_parser = TimestampParser(missing_timestamp)
+        # Créés à l'entraînement ou au chargement
+        self.model = None
+        self.scaler = None
         self.feature_columns = []
         self.is_trained = False
+        # Histogrammes de référence et courants pour le suivi de dérive
+        self.drift_monitor: Optional[DriftMonitor] = None
+        
+        # Fenêtre glissante : génération d'entraînement de chaque arbre
+        self.generation = 0
+        self.tree_generations = np.zeros(0, dtype=np.int64)
         
-    def extract_features(self, log_entries: List[Dict]) -> pd.DataFrame:
+    def extract_features(self, log_entries: List[Dict],
+                         window_aggregator: Optional[WindowAggregator] = None,
+                         window_rate_scale: float = 1.0) -> pd.DataFrame:
         """
         Extrait les features des entrées de logs
         
+        Les très gros lots sont répartis entre n_jobs processus, chacun
+        traitant une tranche contiguë ; les résultats sont concaténés dans
+        l'ordre. Chaque tranche reçoit le dernier horodatage valide qui la
+        précède (politique 'previous') : le découpage ne change pas le résultat.
+        
+        L'état des fenêtres glissantes est passé explicitement (jamais porté
+        par le détecteur) : des appels concurrents sur un même détecteur
+        restent indépendants.
+        
         Args:
             log_entries: Liste des entrées de logs
+            window_aggregator: Agrégateur des fenêtres glissantes (à état en
+                mode flux ; un agrégateur sans état par appel par défaut)
+            window_rate_scale: Facteur des débits par fenêtre (inverse de la
+                fraction retenue pour un échantillon)
             
         Returns:
-            DataFrame avec les features extraites
+            DataFrame avec les features extraites, indexé par la position de
+            chaque entrée conservée dans log_entries
+        """
+        if not isinstance(log_entries, (list, LogColumns)):
+            log_entries = list(log_entries)
+        
+        window_keys = bool(self.window_seconds)
+        workers = self._worker_count(len(log_entries), self.PARALLEL_EXTRACT_MIN_ENTRIES)
+        if workers < self.PARALLEL_EXTRACT_MIN_WORKERS:
+            workers = 1
+        with self._stage('extract_features', rows=len(log_entries)):
+            if workers <= 1:
+                df = self._extract_features_batch(log_entries, window_keys)
+            else:
+                from joblib import Parallel, delayed
+                
+                bounds = np.linspace(0, len(log_entries), workers + 1).astype(int)
+                frames = Parallel(n_jobs=workers)(
+                    delayed(_extract_features_worker)(
+                        self.pattern_scanner.attack_patterns,
+                        self.pattern_scanner.error_patterns,
+                        log_entries[start:end],
+                        window_keys,
+                        self.timestamp_parser.missing,
+                        self._carried_timestamp(log_entries, start)
+                    )
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                )
+                # Index des tranches ramené aux positions dans le lot entier
+                for frame, start in zip(frames, bounds[:-1]):
+                    frame.index = frame.index + start
+                frames = [frame for frame in frames if not frame.empty]
+                df = pd.concat(frames) if frames else pd.DataFrame()
+        
+        # Les agrégats glissants portent sur le lot entier, après réunion des tranches
+        if window_keys and not df.empty:
+            with self._stage('window_features', rows=len(df)):
+                df = self._add_window_features(df, window_aggregator, window_rate_scale)
+        return df
+    
+    def _carried_timestamp(self, log_entries: Union[List[Dict], LogColumns], start: int):
+        """
+        Horodatage transmis à la tranche commençant à start (politique 'previous')
+        
+        Le dernier horodatage valide qui précède la tranche, ou à défaut le
+        premier du lot (comme pour les absents en tête du lot entier) ; None
+        si la politique n'en a pas besoin ou si aucun n'est valide.
+        """
+        if self.timestamp_parser.missing != 'previous':
+            return None
+        if isinstance(log_entries, LogColumns):
+            timestamps = log_entries.columns.get('timestamp')
+            if timestamps is None:
+                return None
+        else:
+            timestamps = None
+        for i in chain(range(start - 1, -1, -1), range(start, len(log_entries))):
+            value = log_entries[i].get('timestamp') if timestamps is None else timestamps[i]
+            if self.timestamp_parser.parse([value])[2][0]:
+                return value
+        return None
+    
+    def _stage(self, name: str, rows: Optional[int] = None):
+        """Mesure d'une étape du pipeline (sans effet si l'instrumentation est désactivée)"""
+        return self.instrumentation.stage(self.COMPONENT, name, rows)
+    
+    def _add_window_features(self, df: pd.DataFrame, aggregator: Optional[WindowAggregator] = None,
+                             rate_scale: float = 1.0) -> pd.DataFrame:
+        """Remplace les colonnes de clé et d'horodatage par les agrégats glissants"""
+        keys = df.pop('_window_key').to_numpy(dtype=object)
+        times = df.pop('_window_time').to_numpy(dtype=float)
+        aggregator = aggregator or WindowAggregator(self.window_seconds)
+        features = aggregator.transform(keys, times,
+                                        df['status_is_error'].to_numpy(dtype=bool),
+                                        df['response_time'].to_numpy(dtype=float))
+        if rate_scale != 1.0:
+            # Échantillon uniforme : le débit observé est divisé par la fraction retenue
+            features['window_request_rate'] = features['window_request_rate'] * rate_scale
+        for name, values in features.items():
+            df[name] = values
+        return df
+    
+    def _extract_features_batch(self, log_entries: List[Dict], window_keys: bool = False,
+                                previous_timestamp=None) -> pd.DataFrame:
+        """
+        Extraction vectorisée des features d'un lot d'entrées
+        
+        Les features sont construites colonne par colonne (horodatages par
+        TimestampParser, comparaisons NumPy) ; les entrées que ce chemin ne
+        sait pas convertir à l'identique repassent par l'extraction ligne à
+        ligne, ce qui garantit le même résultat que _extract_features_rowwise.
+        
+        Avec window_keys, les colonnes _window_key (méthode + chemin d'URL) et
+        _window_time (secondes UTC) sont ajoutées pour les agrégats glissants.
+        
+        Le DataFrame est indexé par la position des entrées conservées (un
+        RangeIndex si aucune n'est écartée). previous_timestamp est
+        l'horodatage qui précède le lot quand celui-ci est une tranche d'un
+        lot plus grand (voir TimestampParser.parse).
+        """
+        n_entries = len(log_entries)
+        if n_entries == 0:
+            return pd.DataFrame()
+        
+        # Extraction des colonnes brutes
+        raw = self._raw_columns(log_entries)
+        
+        # Lignes convertibles sans ambiguïté par le chemin vectorisé
+        valid = np.ones(n_entries, dtype=bool)
+        
+        # Features temporelles
+        hour_of_day, day_of_week, timestamp_ok, seconds = self._vectorized_time_features(
+            raw['timestamp'], previous_timestamp)
+        valid &= timestamp_ok
+        
+        # Features de requête HTTP et de performance
+        numeric = {}
+        for col in self.NUMERIC_FIELDS:
+            if isinstance(raw[col], np.ndarray) and raw[col].dtype.kind in 'iuf':
+                # Colonne déjà typée par un lecteur de fichiers
+                values = raw[col].astype(float)
+            else:
+                values = pd.to_numeric(pd.Series(raw[col], dtype=object), errors='coerce').to_numpy(dtype=float)
+            ok = ~np.isnan(values)
+            if col in self.INTEGER_FIELDS:
+                # int() tronque les flottants : seules les valeurs entières sont sûres,
+                # et exactes en flottant jusqu'à 2**53 (au-delà, int() ligne à ligne)
+                finite = np.where(ok, values, 0)
+                ok &= (np.trunc(finite) == finite) & (np.abs(finite) < 2.0 ** 53)
+            valid &= ok
+            numeric[col] = np.where(ok, values, 0)
+        
+        # Features de contenu
+        methods, methods_ok = self._string_column(raw['method'])
+        valid &= methods_ok
+        method_encoded = methods.str.upper().map(self.METHOD_MAPPING).fillna(0).to_numpy(dtype=np.int64)
+        
+        # Features d'erreur et de sécurité
+        messages, messages_ok = self._string_column(raw['message'])
+        urls, urls_ok = self._string_column(raw['url'])
+        valid &= messages_ok & urls_ok
+        error_count, pattern_hits = self.pattern_scanner.scan_columns(
+            messages.str.lower(), urls.str.lower()
+        )
+        suspicious_patterns = pattern_hits.sum(axis=1, dtype=np.int64)
+        
+        status_code = numeric['status_code'].astype(np.int64)
+        response_time = numeric['response_time']
+        request_size = numeric['request_size'].astype(np.int64)
+        response_size = numeric['response_size'].astype(np.int64)
+        
+        columns = {
+            'hour_of_day': hour_of_day,
+            'day_of_week': day_of_week,
+            'status_code': status_code,
+            'response_time': response_time,
+            'request_size': request_size,
+            'response_size': response_size,
+            'method_encoded': method_encoded,
+            'error_count': error_count,
+            'cpu_usage': numeric['cpu_usage'],
+            'memory_usage': numeric['memory_usage'],
+            'suspicious_patterns': suspicious_patterns,
+            'status_is_error': (status_code >= 400).astype(np.int64),
+            'response_time_high': (response_time > 5000).astype(np.int64),
+            'size_ratio': response_size / np.maximum(request_size, 1)
+        }
+        
+        # Repli ligne à ligne pour les entrées atypiques
+        keep = valid.copy()
+        for i in np.flatnonzero(~valid):
+            feature_dict = self._extract_entry_features(log_entries[i])
+            if feature_dict is None:
+                continue
+            keep[i] = True
+            if timestamp_ok[i]:
+                # Horodatage déjà converti dans le contexte du lot (politique 'previous')
+                del feature_dict['hour_of_day'], feature_dict['day_of_week']
+            for col, value in feature_dict.items():
+                column = columns[col]
+                if column.dtype.kind == 'i' and not -2 ** 63 <= value < 2 ** 63:
+                    # Entier hors de int64 : valeur exacte conservée (colonne objet),
+                    # comme le DataFrame de l'extraction ligne à ligne
+                    column = columns[col] = column.astype(object)
+                column[i] = value
+        
+        if not keep.any():
+            return pd.DataFrame()
+        
+        index = None if keep.all() else np.flatnonzero(keep)
+        df = pd.DataFrame({col: values[keep] for col, values in columns.items()}, index=index)
+        
+        if window_keys:
+            df['_window_key'] = self._window_keys(methods, urls)[keep]
+            df['_window_time'] = self._epoch_seconds(seconds, keep)
+        
+        # Gestion des valeurs manquantes
+        df = df.fillna(0)
+        
+        return df
+    
+    @classmethod
+    def _raw_columns(cls, log_entries: Union[List[Dict], LogColumns]) -> Dict[str, Union[List, np.ndarray]]:
+        """Colonnes brutes d'un lot, valeurs par défaut comprises"""
+        n_entries = len(log_entries)
+        # Horodatage absent : politique du TimestampParser à l'extraction
+        defaults = {'timestamp': None, 'method': 'GET', 'message': '', 'url': '',
+                    **cls.NUMERIC_FIELDS}
+        
+        if isinstance(log_entries, LogColumns):
+            raw = {}
+            for col, default in defaults.items():
+                values = log_entries.columns.get(col)
+                if values is None:
+                    values = (np.full(n_entries, default) if col in cls.NUMERIC_FIELDS
+                              else [default] * n_entries)
+                raw[col] = values
+            return raw
+        
+        return {col: [entry.get(col, default) for entry in log_entries]
+                for col, default in defaults.items()}
+    
+    @staticmethod
+    def _window_keys(methods: pd.Series, urls: pd.Series) -> np.ndarray:
+        """Clé 'MÉTHODE chemin' de chaque ligne, construite une fois par couple distinct"""
+        method_codes, method_uniques = pd.factorize(methods.to_numpy(dtype=object))
+        url_codes, url_uniques = pd.factorize(urls.to_numpy(dtype=object))
+        codes, pairs = pd.factorize(method_codes.astype(np.int64) * len(url_uniques) + url_codes)
+        keys = np.array([
+            f"{method_uniques[pair // len(url_uniques)].upper()} "
+            f"{url_uniques[pair % len(url_uniques)].split('?', 1)[0]}"
+            for pair in pairs
+        ], dtype=object)
+        return keys[codes]
+    
+    @staticmethod
+    def _epoch_seconds(seconds: np.ndarray, keep: np.ndarray) -> np.ndarray:
+        """
+        Horodatages des lignes conservées en secondes UTC
+        
+        Les secondes calculées par _vectorized_time_features sont reprises ;
+        une ligne conservée sans horodatage convertible prend le plus récent du lot.
+        """
+        seconds = seconds[keep]
+        
+        # Dernier recours : horodatage le plus récent du lot
+        missing = np.isnan(seconds)
+        if missing.any():
+            seconds[missing] = np.nanmax(seconds) if not missing.all() else 0.0
+        return seconds
+    
+    @staticmethod
+    def _string_column(values: List) -> Tuple[pd.Series, np.ndarray]:
+        """Construit une colonne de chaînes ('' pour les valeurs non textuelles)"""
+        is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        column = pd.Series([v if ok else '' for v, ok in zip(values, is_str)], dtype=object)
+        return column, is_str
+    
+    def _vectorized_time_features(self, timestamps: List,
+                                  previous=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcule heure et jour de la semaine d'une colonne d'horodatages
+        
+        L'heure et le jour sont ceux de l'heure murale de chaque valeur (son
+        propre fuseau, fuseaux mélangés compris). Renvoie aussi les
+        horodatages en secondes UTC (NaN si non convertis).
+        """
+        utc, local, ok = self.timestamp_parser.parse(timestamps, previous)
+        local = np.where(ok, local, 0)
+        hour_of_day = local // (3600 * 10**9) % 24
+        # 1970-01-01 était un jeudi (weekday 3)
+        day_of_week = (local // (86400 * 10**9) + 3) % 7
+        seconds = np.where(ok, utc / 1e9, np.nan)
+        return hour_of_day, day_of_week, ok, seconds
+    
+    def _entry_time_features(self, timestamp) -> Optional[Tuple[int, int]]:
+        """Heure et jour de la semaine d'un horodatage isolé (None si absent ou invalide)"""
+        hour_of_day, day_of_week, ok, _ = self._vectorized_time_features([timestamp])
+        if not ok[0]:
+            return None
+        return int(hour_of_day[0]), int(day_of_week[0])
+    
+    def _extract_features_rowwise(self, log_entries: List[Dict]) -> pd.DataFrame:
+        """
+        Extraction de référence, entrée par entrée
+        
+        Conservée pour le repli du chemin vectorisé et pour les benchmarks.
         """
         features = []
         
         for entry in log_entries:
-            try:
-                # Features temporelles
-                timestamp = pd.to_datetime(entry.get('timestamp', datetime.now()))
-                hour_of_day = timestamp.hour
-                day_of_week = timestamp.weekday()
-                
-                # Features de requête HTTP
-                status_code = int(entry.get('status_code', 200))
-                response_time = float(entry.get('response_time', 0))
-                request_size = int(entry.get('request_size', 0))
-                response_size = int(entry.get('response_size', 0))
-                
-                # Features de contenu
-                method = entry.get('method', 'GET')
-                method_encoded = self._encode_method(method)
-                
-                # Features d'erreur
-                error_count = len(re.findall(r'error|exception|fail', 
-                                           entry.get('message', '').lower()))
-                
-                # Features de performance
-                cpu_usage = float(entry.get('cpu_usage', 0))
-                memory_usage = float(entry.get('memory_usage', 0))
-                
-                # Features de sécurité
-                suspicious_patterns = self._detect_suspicious_patterns(entry)
-                
-                feature_dict = {
-                    'hour_of_day': hour_of_day,
-                    'day_of_week': day_of_week,
-                    'status_code': status_code,
-                    'response_time': response_time,
-                    'request_size': request_size,
-                    'response_size': response_size,
-                    'method_encoded': method_encoded,
-                    'error_count': error_count,
-                    'cpu_usage': cpu_usage,
-                    'memory_usage': memory_usage,
-                    'suspicious_patterns': suspicious_patterns,
-                    'status_is_error': 1 if status_code >= 400 else 0,
-                    'response_time_high': 1 if response_time > 5000 else 0,
-                    'size_ratio': response_size / max(request_size, 1)
-                }
-                
+            feature_dict = self._extract_entry_features(entry)
+            if feature_dict is not None:
                 features.append(feature_dict)
                 
-            except Exception as e:
-                logger.warning(f"Erreur lors de l'extraction des features: {e}")
-                continue
-                
         df = pd.DataFrame(features)
         
         # Gestion des valeurs manquantes
@@ -115,40 +1429,100 @@ class LogAnomalyDetector:
         
         return df
     
+    def _extract_entry_features(self, entry: Dict) -> Optional[Dict]:
+        """Extrait les features d'une seule entrée (None si l'entrée est invalide)"""
+        try:
+            # Features temporelles
+            timestamp = entry.get('timestamp')
+            time_features = self._entry_time_features(timestamp)
+            if time_features is None:
+                if self.timestamp_parser.missing == 'drop' and (
+                        timestamp is None or (isinstance(timestamp, str) and not timestamp.strip())):
+                    return None
+                raise ValueError(f"horodatage invalide ou absent: {entry.get('timestamp')!r}")
+            hour_of_day, day_of_week = time_features
+            
+            # Features de requête HTTP
+            status_code = int(entry.get('status_code', 200))
+            response_time = float(entry.get('response_time', 0))
+            request_size = int(entry.get('request_size', 0))
+            response_size = int(entry.get('response_size', 0))
+            
+            # Features de contenu
+            method = entry.get('method', 'GET')
+            method_encoded = self._encode_method(method)
+            
+            # Features d'erreur et de sécurité (un seul passage sur la ligne)
+            error_count, pattern_hits = self.pattern_scanner.scan(
+                entry.get('message', '').lower(), entry.get('url', '').lower()
+            )
+            suspicious_patterns = sum(pattern_hits)
+            
+            # Features de performance
+            cpu_usage = float(entry.get('cpu_usage', 0))
+            memory_usage = float(entry.get('memory_usage', 0))
+            
+            return {
+                'hour_of_day': hour_of_day,
+                'day_of_week': day_of_week,
+                'status_code': status_code,
+                'response_time': response_time,
+                'request_size': request_size,
+                'response_size': response_size,
+                'method_encoded': method_encoded,
+                'error_count': error_count,
+                'cpu_usage': cpu_usage,
+                'memory_usage': memory_usage,
+                'suspicious_patterns': suspicious_patterns,
+                'status_is_error': 1 if status_code >= 400 else 0,
+                'response_time_high': 1 if response_time > 5000 else 0,
+                'size_ratio': response_size / max(request_size, 1)
+            }
+            
+        except Exception as e:
+            logger.warning(f"Erreur lors de l'extraction des features: {e}")
+            return None
+    
     def _encode_method(self, method: str) -> int:
         """Encode les méthodes HTTP en valeurs numériques"""
-        method_mapping = {
-            'GET': 1, 'POST': 2, 'PUT': 3, 'DELETE': 4,
-            'PATCH': 5, 'HEAD': 6, 'OPTIONS': 7
-        }
-        return method_mapping.get(method.upper(), 0)
+        return self.METHOD_MAPPING.get(method.upper(), 0)
     
     def _detect_suspicious_patterns(self, entry: Dict) -> int:
         """Détecte des patterns suspects dans les logs"""
-        suspicious_count = 0
-        message = entry.get('message', '').lower()
-        url = entry.get('url', '').lower()
-        
-        # Patterns d'attaque courants
-        attack_patterns = [
-            r'sql.*injection', r'xss', r'script.*alert',
-            r'union.*select', r'drop.*table', r'../.*/',
-            r'cmd.*exec', r'eval\(', r'base64_decode'
-        ]
-        
-        for pattern in attack_patterns:
-            if re.search(pattern, message + ' ' + url):
-                suspicious_count += 1
-                
-        return suspicious_count
+        _, pattern_hits = self.pattern_scanner.scan(
+            entry.get('message', '').lower(), entry.get('url', '').lower()
+        )
+        return sum(pattern_hits)
+    
+    def count_pattern_hits(self, log_entries: List[Dict]) -> Dict[str, int]:
+        """
+        Compte les entrées touchées par chaque signature d'attaque
+        
+        Args:
+            log_entries: Entrées de logs à analyser
+            
+        Returns:
+            Dictionnaire signature -> nombre d'entrées correspondantes
+        """
+        raw = self._raw_columns(log_entries)
+        messages, _ = self._string_column(raw['message'])
+        urls, _ = self._string_column(raw['url'])
+        _, pattern_hits = self.pattern_scanner.scan_columns(messages.str.lower(), urls.str.lower())
+        return self.pattern_scanner.hit_counts(pattern_hits)
     
-    def train(self, log_entries: List[Dict], validation_split: float = 0.2) -> Dict:
+    def train(self, log_entries: List[Dict], validation_split: float = 0.2,
+              max_metric_samples: Optional[int] = None, window_rate_scale: float = 1.0) -> Dict:
         """
         Entraîne le modèle de détection d'anomalies
         
         Args:
             log_entries: Données d'entraînement
             validation_split: Proportion des données pour la validation
+            max_metric_samples: Lignes scorées au plus par partie (train,
+                validation) pour les métriques ; les effectifs d'anomalies
+                sont alors extrapolés (None = toutes les lignes)
+            window_rate_scale: Facteur des débits par fenêtre (inverse de la
+                fraction retenue quand log_entries est un échantillon)
             
         Returns:
             Métriques d'entraînement
@@ -156,35 +1530,49 @@ class LogAnomalyDetector:
         logger.info(f"Entraînement sur {len(log_entries)} entrées de logs")
         
         # Extraction des features
-        features_df = self.extract_features(log_entries)
+        features_df = self.extract_features(log_entries, window_rate_scale=window_rate_scale)
         self.feature_columns = features_df.columns.tolist()
         
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         # Division train/validation
         X_train, X_val = train_test_split(
             features_df, test_size=validation_split, random_state=self.random_state
         )
         
         # Normalisation
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_val_scaled = self.scaler.transform(X_val)
+        with self._stage('scaling', rows=len(features_df)):
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_val_scaled = self.scaler.transform(X_val)
         
         # Entraînement
-        self.model.fit(X_train_scaled)
+        with self._stage('fit', rows=len(X_train_scaled)):
+            self.model = self._create_model()
+            self.model.fit(X_train_scaled)
         self.is_trained = True
+        self.generation = 0
+        self.tree_generations = np.zeros(len(self.model.estimators_), dtype=np.int64)
         
-        # Évaluation
-        train_predictions = self.model.predict(X_train_scaled)
-        val_predictions = self.model.predict(X_val_scaled)
+        with self._stage('drift_reference', rows=len(features_df)):
+            self.drift_monitor = DriftMonitor.fit(features_df.to_numpy(dtype=float), self.feature_columns)
         
-        # Calcul des scores d'anomalie
-        train_scores = self.model.decision_function(X_train_scaled)
-        val_scores = self.model.decision_function(X_val_scaled)
+        # Calcul des scores d'anomalie et évaluation (éventuellement sur un sous-échantillon)
+        rng = np.random.default_rng(self.random_state)
+        X_train_eval = self._bounded_rows(X_train_scaled, max_metric_samples, rng)
+        X_val_eval = self._bounded_rows(X_val_scaled, max_metric_samples, rng)
+        with self._stage('scoring', rows=len(X_train_eval) + len(X_val_eval)):
+            train_scores = self._decision_function(X_train_eval)
+            val_scores = self._decision_function(X_val_eval)
+        train_rate = np.mean(train_scores < 0)
+        val_rate = np.mean(val_scores < 0)
         
         metrics = {
-            'train_anomalies': np.sum(train_predictions == -1),
-            'val_anomalies': np.sum(val_predictions == -1),
-            'train_anomaly_rate': np.mean(train_predictions == -1),
-            'val_anomaly_rate': np.mean(val_predictions == -1),
+            'train_anomalies': int(round(train_rate * len(X_train_scaled))),
+            'val_anomalies': int(round(val_rate * len(X_val_scaled))),
+            'train_anomaly_rate': train_rate,
+            'val_anomaly_rate': val_rate,
             'train_score_mean': np.mean(train_scores),
             'val_score_mean': np.mean(val_scores),
             'feature_count': len(self.feature_columns)
@@ -195,64 +1583,507 @@ class LogAnomalyDetector:
         
         return metrics
     
-    def predict(self, log_entries: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _bounded_rows(X: np.ndarray, max_rows: Optional[int], rng: np.random.Generator) -> np.ndarray:
+        """Au plus max_rows lignes de X tirées sans remise (X entier si None)"""
+        if max_rows is None or len(X) <= max_rows:
+            return X
+        return X[np.sort(rng.choice(len(X), max_rows, replace=False))]
+    
+    def train_stream(self, source: Union[str, Path, Iterable[Dict]], sample_size: int = 100000,
+                     validation_split: float = 0.2, max_metric_samples: Optional[int] = 10000,
+                     chunk_size: int = 100000, log_format: str = 'auto') -> Dict:
         """
-        Prédit les anomalies dans de nouvelles entrées de logs
+        Entraîne le modèle sur un échantillon uniforme d'un flux de logs
+        
+        Le flux est parcouru une fois par échantillonnage réservoir : seules
+        les sample_size lignes retenues sont parsées (pour un fichier) puis
+        passées à l'extraction de features et à train. Le coût de
+        l'entraînement ne dépend plus de la longueur de l'historique, seule
+        la lecture des lignes reste linéaire. Une forêt d'isolation
+        n'échantillonne de toute façon que 256 lignes par arbre.
+        
+        Les débits par fenêtre glissante (window_seconds) sont corrigés de
+        la fraction échantillonnée ; taux d'erreur et p95 sont estimés
+        directement sur l'échantillon.
         
         Args:
-            log_entries: Nouvelles entrées à analyser
+            source: Chemin d'un fichier de logs (voir read_logs) ou itérable d'entrées
+            sample_size: Nombre maximal de lignes d'entraînement
+            validation_split: Proportion de l'échantillon réservée à la validation
+            max_metric_samples: Lignes scorées au plus par partie pour les métriques
+            chunk_size: Nombre de lignes lues par lot
+            log_format: Format du fichier ('jsonl', 'access' ou 'auto')
             
         Returns:
-            Liste des prédictions avec scores
+            Métriques d'entraînement, complétées de seen_entries et sampled_entries
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être strictement positif")
+        
+        sampler = ReservoirSampler(sample_size, seed=self.random_state)
+        with self._stage('sampling') as stage:
+            if isinstance(source, (str, Path)):
+                # Échantillonnage des lignes brutes : seules les lignes retenues sont parsées
+                if log_format == 'auto':
+                    log_format = self._detect_log_format(source)
+                if log_format == 'jsonl':
+                    parse = self._parse_json_lines
+                elif log_format == 'access':
+                    parse = self._parse_access_log
+                else:
+                    raise ValueError(f"Format de logs non supporté: {log_format}")
+                
+                with self._open_log(source) as f:
+                    while True:
+                        lines = list(islice(f, chunk_size))
+                        if not lines:
+                            break
+                        sampler.add([line for line in lines if line.strip()])
+                sample = parse(sampler.sample(), 1)
+            else:
+                entries = iter(source)
+                for chunk in iter(lambda: list(islice(entries, chunk_size)), []):
+                    sampler.add(chunk)
+                sample = sampler.sample()
+            stage.set_rows(sampler.seen)
+        
+        if not len(sample):
+            raise ValueError("Aucune entrée de logs à échantillonner")
+        logger.info(f"Échantillon d'entraînement: {len(sample)} entrées sur {sampler.seen}")
+        
+        metrics = self.train(sample, validation_split=validation_split,
+                             max_metric_samples=max_metric_samples,
+                             window_rate_scale=sampler.seen / len(sampler))
+        
+        metrics['seen_entries'] = sampler.seen
+        metrics['sampled_entries'] = len(sample)
+        return metrics
+    
+    def partial_train(self, log_entries: List[Dict], replace_fraction: float = 0.1) -> Dict:
+        """
+        Met à jour le modèle avec de nouvelles données sans tout réentraîner
+        
+        Les arbres les plus anciens (replace_fraction de la forêt) sont
+        remplacés par des arbres entraînés sur les nouvelles données. Le
+        scaler reste figé depuis l'entraînement initial : les arbres conservés
+        continuent de recevoir des entrées normalisées comme à leur
+        entraînement, et les nouveaux partagent le même espace. Le coût ne
+        dépend que du volume des nouvelles données, pas de l'historique.
+        
+        Args:
+            log_entries: Nouvelles entrées de logs
+            replace_fraction: Proportion des arbres à renouveler (0 < f <= 1)
+            
+        Returns:
+            Métriques de la mise à jour
         """
         if not self.is_trained:
-            raise ValueError("Le modèle doit être entraîné avant la prédiction")
+            return self.train(log_entries)
+        if isinstance(self.model, CompactIsolationForest):
+            raise ValueError("Un artefact compact est en lecture seule: "
+                             "recharger le modèle joblib pour le mettre à jour")
+        if not 0 < replace_fraction <= 1:
+            raise ValueError("replace_fraction doit être dans l'intervalle ]0, 1]")
         
-        features_df = self.extract_features(log_entries)
+        logger.info(f"Mise à jour incrémentale sur {len(log_entries)} entrées de logs")
         
-        # S'assurer que toutes les features sont présentes
+        features_df = self._align_features(self.extract_features(log_entries))
+        if len(features_df) < self.model.max_samples_:
+            raise ValueError(f"Au moins {self.model.max_samples_} entrées valides sont nécessaires "
+                             f"pour entraîner de nouveaux arbres ({len(features_df)} reçues)")
+        
+        # Normalisation avec le scaler figé (pas de partial_fit : les arbres
+        # conservés verraient leurs entrées se décaler)
+        with self._stage('scaling', rows=len(features_df)):
+            X_new = self.scaler.transform(features_df)
+        if self.drift_monitor is not None:
+            self.drift_monitor.add_reference(features_df.to_numpy(dtype=float))
+        
+        # Nouveaux arbres, échantillonnés comme ceux de la forêt existante
+        n_trees = len(self.model.estimators_)
+        n_replaced = max(1, int(round(n_trees * replace_fraction)))
+        self.generation += 1
+        with self._stage('partial_fit', rows=len(X_new)):
+            fresh = self._create_model(
+                n_estimators=n_replaced,
+                max_samples=self.model.max_samples_,
+                random_state=None if self.random_state is None else self.random_state + self.generation
+            ).fit(X_new)
+        
+        # Les arbres les plus anciens sortent de la fenêtre
+        slots = np.argsort(self.tree_generations, kind='stable')[:n_replaced]
+        self._replace_trees(fresh, slots)
+        self.tree_generations[slots] = self.generation
+        
+        # Seuil de décision recalculé sur les nouvelles données
+        if self.contamination != 'auto':
+            self.model.offset_ = np.percentile(self.model.score_samples(X_new),
+                                               100.0 * self.contamination)
+        
+        with self._stage('scoring', rows=len(X_new)):
+            scores = self._decision_function(X_new)
+        metrics = {
+            'new_samples': len(X_new),
+            'replaced_trees': n_replaced,
+            'generation': self.generation,
+            'anomalies': np.sum(scores < 0),
+            'anomaly_rate': np.mean(scores < 0),
+            'score_mean': np.mean(scores)
+        }
+        
+        logger.info(f"Mise à jour terminée: {n_replaced} arbres remplacés "
+                   f"(génération {self.generation})")
+        
+        return metrics
+    
+    def _create_model(self, n_estimators: int = 100, max_samples='auto',
+                      random_state: Optional[int] = None) -> 'IsolationForest':
+        """Crée une IsolationForest avec les paramètres du détecteur"""
+        from sklearn.ensemble import IsolationForest
+        
+        return IsolationForest(
+            contamination=self.contamination,
+            random_state=self.random_state if random_state is None else random_state,
+            n_estimators=n_estimators,
+            max_samples=max_samples,
+            n_jobs=self.n_jobs
+        )
+    
+    def _worker_count(self, n_items: int, min_entries: Optional[int] = None) -> int:
+        """Nombre de workers utiles pour n_items lignes (1 = traitement séquentiel)"""
+        if self.n_jobs in (None, 1):
+            return 1
+        from joblib import cpu_count, effective_n_jobs
+        
+        # Plus de workers que de cœurs disponibles ne fait que ralentir
+        return min(effective_n_jobs(self.n_jobs), cpu_count(),
+                   n_items // (min_entries or self.PARALLEL_MIN_ENTRIES))
+    
+    def _replace_trees(self, fresh: 'IsolationForest', slots: np.ndarray):
+        """Remplace les arbres de la forêt aux positions données par ceux de fresh"""
+        model = self.model
+        estimators = list(model.estimators_)
+        estimators_features = list(model.estimators_features_)
+        # Caches internes de scikit-learn (>= 1.3) calculés pendant fit
+        path_lengths = list(getattr(model, '_average_path_length_per_tree', ()))
+        decision_lengths = list(getattr(model, '_decision_path_lengths', ()))
+        
+        for k, slot in enumerate(slots):
+            estimators[slot] = fresh.estimators_[k]
+            estimators_features[slot] = fresh.estimators_features_[k]
+            model._seeds[slot] = fresh._seeds[k]
+            if path_lengths:
+                path_lengths[slot] = fresh._average_path_length_per_tree[k]
+                decision_lengths[slot] = fresh._decision_path_lengths[k]
+        
+        model.estimators_ = estimators
+        model.estimators_features_ = estimators_features
+        if path_lengths:
+            model._average_path_length_per_tree = tuple(path_lengths)
+            model._decision_path_lengths = tuple(decision_lengths)
+    
+    def _align_features(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """Réordonne les colonnes comme à l'entraînement (0 pour les absentes)"""
         for col in self.feature_columns:
             if col not in features_df.columns:
                 features_df[col] = 0
         
-        features_df = features_df[self.feature_columns]
-        features_scaled = self.scaler.transform(features_df)
-        
-        # Prédictions et scores
-        predictions = self.model.predict(features_scaled)
-        scores = self.model.decision_function(features_scaled)
-        
-        results = []
-        for i, (entry, pred, score) in enumerate(zip(log_entries, predictions, scores)):
-            result = {
-                'log_entry': entry,
-                'is_anomaly': pred == -1,
-                'anomaly_score': float(score),
-                'confidence': abs(float(score)),
-                'timestamp': entry.get('timestamp', datetime.now().isoformat())
-            }
-            results.append(result)
+        return features_df[self.feature_columns]
+    
+    def predict(self, log_entries: List[Dict], as_columns: bool = False,
+                window_aggregator: Optional[WindowAggregator] = None) -> Union[List[Dict], PredictionResults]:
+        """
+        Prédit les anomalies dans de nouvelles entrées de logs
         
-        return results
+        Args:
+            log_entries: Nouvelles entrées à analyser
+            as_columns: Retourner un PredictionResults (tableaux NumPy) plutôt
+                qu'une liste de dictionnaires
+            window_aggregator: Agrégateur à état prolongeant les fenêtres
+                glissantes d'un appel à l'autre (voir predict_stream)
+            
+        Returns:
+            Liste des prédictions avec scores, ou PredictionResults
+        """
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné avant la prédiction")
+        if not isinstance(log_entries, (list, LogColumns)):
+            log_entries = list(log_entries)
+        
+        # S'assurer que toutes les features sont présentes
+        features_df = self._align_features(self.extract_features(log_entries, window_aggregator))
+        if not len(features_df):
+            # Toutes les entrées ont été écartées à l'extraction
+            results = PredictionResults(log_entries, np.zeros(0), np.zeros(0, dtype=np.int64))
+            return results if as_columns else results.to_list()
+        if self.drift_monitor is not None:
+            with self._stage('drift', rows=len(features_df)):
+                self.drift_monitor.update(features_df.to_numpy(dtype=float))
+        with self._stage('scaling', rows=len(features_df)):
+            features_scaled = self.scaler.transform(features_df)
+        
+        # Scores (IsolationForest.predict revient à tester score < 0)
+        with self._stage('scoring', rows=len(features_scaled)):
+            scores = self._decision_function(features_scaled)
+        
+        # Entrées écartées à l'extraction : chaque score reste associé à son entrée
+        with self._stage('results', rows=len(log_entries)):
+            results = PredictionResults(log_entries, scores, features_df.index.to_numpy())
+            return results if as_columns else results.to_list()
+    
+    def drift_report(self, psi_threshold: float = 0.2) -> Dict:
+        """
+        Dérive des features scorées depuis le chargement (ou reset_drift)
+        par rapport aux données d'entraînement
+        
+        Args:
+            psi_threshold: PSI au-delà duquel une feature est signalée
+            
+        Returns:
+            Rapport de DriftMonitor.report (vide si le modèle n'a pas de référence)
+        """
+        if self.drift_monitor is None:
+            return {'rows': 0, 'features': {}, 'max_psi': 0.0, 'drifted': []}
+        return self.drift_monitor.report(psi_threshold)
+    
+    def reset_drift(self):
+        """Démarre une nouvelle période d'observation de la dérive"""
+        if self.drift_monitor is not None:
+            self.drift_monitor.reset()
+    
+    def _decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Calcule les scores d'anomalie, répartis entre n_jobs threads
+        
+        Le score d'une ligne ne dépend pas des autres : découper la matrice
+        donne exactement les mêmes valeurs qu'un appel unique.
+        """
+        workers = self._worker_count(len(X))
+        if workers <= 1:
+            return self.model.decision_function(X)
+        
+        from joblib import Parallel, delayed
+        
+        scores = Parallel(n_jobs=workers, prefer='threads')(
+            delayed(self.model.decision_function)(part)
+            for part in np.array_split(X, workers)
+        )
+        return np.concatenate(scores)
+    
+    def predict_stream(self, source: Union[str, Path, Iterable[Dict]],
+                       chunk_size: int = 10000) -> Iterator[Dict]:
+        """
+        Prédit les anomalies par blocs de taille fixe
+        
+        La mémoire utilisée reste bornée par chunk_size quelle que soit la
+        taille de l'entrée : seul le bloc courant est extrait et normalisé.
+        
+        Args:
+            source: Chemin d'un fichier de logs (voir read_logs) ou itérable d'entrées
+            chunk_size: Nombre d'entrées traitées par bloc
+            
+        Yields:
+            Prédictions au même format que predict()
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être strictement positif")
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné avant la prédiction")
+        
+        if isinstance(source, (str, Path)):
+            chunks = self.read_logs(source, chunk_size=chunk_size)
+        else:
+            entries = iter(source)
+            chunks = iter(lambda: list(islice(entries, chunk_size)), [])
+        
+        # Les fenêtres glissantes se prolongent d'un bloc à l'autre ; l'agrégateur
+        # reste propre à ce flux (predict concurrents sur le détecteur non affectés)
+        aggregator = WindowAggregator(self.window_seconds, stateful=True) if self.window_seconds else None
+        for chunk in chunks:
+            yield from self.predict(chunk, as_columns=True, window_aggregator=aggregator)
+    
+    @classmethod
+    def read_logs(cls, filepath: Union[str, Path], log_format: str = 'auto',
+                  chunk_size: int = 100000) -> Iterator[LogColumns]:
+        """
+        Lit un fichier de logs par lots de colonnes typées
+        
+        Les lignes sont lues en octets et décodées lot par lot : un lot
+        JSON-lines est parsé en un seul appel (orjson si disponible), un lot
+        d'access logs en un seul parcours de l'expression régulière, sans
+        dictionnaire intermédiaire par ligne.
+        
+        Args:
+            filepath: Fichier JSON-lines ou access log, éventuellement compressé (.gz)
+            log_format: 'jsonl', 'access' ou 'auto' (extension puis première ligne)
+            chunk_size: Nombre de lignes par lot
+            
+        Yields:
+            Lots LogColumns utilisables par extract_features, train et predict
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être strictement positif")
+        if log_format == 'auto':
+            log_format = cls._detect_log_format(filepath)
+        if log_format == 'jsonl':
+            parse = cls._parse_json_lines
+        elif log_format == 'access':
+            parse = cls._parse_access_log
+        else:
+            raise ValueError(f"Format de logs non supporté: {log_format}")
+        
+        with cls._open_log(filepath) as f:
+            first_line = 1
+            while True:
+                lines = list(islice(f, chunk_size))
+                if not lines:
+                    break
+                batch = parse(lines, first_line)
+                first_line += len(lines)
+                if len(batch):
+                    yield batch
+    
+    @staticmethod
+    def _open_log(filepath: Union[str, Path]):
+        """Ouvre un fichier de logs en binaire, décompressé à la volée si .gz"""
+        if str(filepath).endswith('.gz'):
+            return gzip.open(filepath, 'rb')
+        return open(filepath, 'rb')
+    
+    @classmethod
+    def _detect_log_format(cls, filepath: Union[str, Path]) -> str:
+        """Devine le format d'un fichier de logs ('jsonl' ou 'access')"""
+        suffixes = [suffix.lower() for suffix in Path(filepath).suffixes if suffix.lower() != '.gz']
+        if suffixes and suffixes[-1] in ('.jsonl', '.ndjson', '.json'):
+            return 'jsonl'
+        
+        with cls._open_log(filepath) as f:
+            for line in f:
+                if line.strip():
+                    return 'jsonl' if line.lstrip().startswith(b'{') else 'access'
+        return 'jsonl'
+    
+    @classmethod
+    def _parse_json_lines(cls, lines: List[bytes], first_line: int) -> LogColumns:
+        """Parse un lot de lignes JSON-lines en colonnes"""
+        lines = [line for line in lines if line.strip()]
+        try:
+            # Un seul appel au parseur pour tout le lot
+            document = b'[' + b','.join(lines) + b']'
+            entries = orjson.loads(document) if orjson is not None else json.loads(document)
+        except ValueError:
+            # Lot contenant une ligne invalide : parsing ligne par ligne
+            entries = []
+            for offset, line in enumerate(lines):
+                try:
+                    entries.append(json.loads(line))
+                except ValueError as e:
+                    logger.warning(f"Ligne {first_line + offset} ignorée (JSON invalide): {e}")
+        
+        entries = [entry for entry in entries if isinstance(entry, dict)]
+        columns = cls._raw_columns(entries)
+        for col in cls.NUMERIC_FIELDS:
+            # Colonnes homogènes converties une fois pour toutes en tableaux NumPy
+            values = np.array(columns[col]) if columns[col] else np.zeros(0)
+            if values.dtype.kind in 'iuf':
+                columns[col] = values
+        # Les dictionnaires produits par le parseur sont gardés tels quels :
+        # les lignes rendues par predict conservent leurs champs supplémentaires
+        return LogColumns(columns, entries)
+    
+    @staticmethod
+    def _parse_access_log(lines: List[bytes], first_line: int) -> LogColumns:
+        """
+        Parse un lot d'access logs (Common/Combined Log Format) en colonnes
+        
+        Le user-agent tient lieu de message ; la durée finale éventuelle,
+        en secondes, est convertie en millisecondes.
+        """
+        text = b''.join(lines).decode('utf-8', errors='replace')
+        matches = ACCESS_LOG_REGEX.findall(text)
+        n_lines = sum(1 for line in lines if line.strip())
+        if len(matches) < n_lines:
+            logger.warning(f"{n_lines - len(matches)} ligne(s) ignorée(s) à partir de la ligne "
+                           f"{first_line} (format d'access log non reconnu)")
+        if not matches:
+            return LogColumns({})
+        
+        times, methods, urls, statuses, sizes, agents, request_times = zip(*matches)
+        columns = {
+            # 10/Oct/2000:13:55:36 -0700 -> 2000-10-10T13:55:36-07:00
+            'timestamp': [
+                f'{t[7:11]}-{ACCESS_LOG_MONTHS.get(t[3:6], t[3:6])}-{t[0:2]}T{t[12:20]}{t[21:24]}:{t[24:26]}'
+                for t in times
+            ],
+            'method': [method or 'GET' for method in methods],
+            'url': list(urls),
+            'message': ['' if agent == '-' else agent for agent in agents],
+            'status_code': np.array(statuses, dtype=np.int64),
+            'response_size': np.array([0 if size == '-' else size for size in sizes], dtype=np.int64),
+        }
+        if any(request_times):
+            columns['response_time'] = np.array(
+                [float(value) * 1000 if value else 0.0 for value in request_times]
+            )
+        return LogColumns(columns)
     
-    def save_model(self, filepath: str):
-        """Sauvegarde le modèle entraîné"""
+    def save_model(self, filepath: str, compact: bool = False):
+        """
+        Sauvegarde le modèle entraîné
+        
+        Args:
+            filepath: Fichier joblib, ou répertoire de l'artefact compact
+            compact: Écrit un manifeste JSON et des tableaux NumPy (.npy)
+                     mappables en mémoire au lieu d'un pickle joblib
+        """
         if not self.is_trained:
             raise ValueError("Aucun modèle entraîné à sauvegarder")
         
+        if compact:
+            self._save_compact(Path(filepath))
+            logger.info(f"Modèle compact sauvegardé dans {filepath}")
+            return
+        if isinstance(self.model, CompactIsolationForest):
+            raise ValueError("Un modèle compact ne peut être sauvegardé qu'au format compact")
+        
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_columns': self.feature_columns,
             'contamination': self.contamination,
-            'random_state': self.random_state
+            'random_state': self.random_state,
+            'attack_patterns': self.pattern_scanner.attack_patterns,
+            'error_patterns': self.pattern_scanner.error_patterns,
+            'window_seconds': self.window_seconds,
+            'missing_timestamp': self.timestamp_parser.missing,
+            'generation': self.generation,
+            'tree_generations': self.tree_generations,
+            'drift_edges': None if self.drift_monitor is None else self.drift_monitor.edges,
+            'drift_reference': None if self.drift_monitor is None else self.drift_monitor.reference
         }
         
+        import joblib
+        
         joblib.dump(model_data, filepath)
         logger.info(f"Modèle sauvegardé dans {filepath}")
     
-    def load_model(self, filepath: str):
-        """Charge un modèle pré-entraîné"""
+    def load_model(self, filepath: str, mmap: bool = True):
+        """
+        Charge un modèle pré-entraîné
+        
+        Args:
+            filepath: Fichier joblib ou répertoire d'un artefact compact
+            mmap: Mappe en mémoire les tableaux d'un artefact compact
+                  (lecture seule, pages partagées entre processus)
+        """
+        if Path(filepath).is_dir():
+            self._load_compact(Path(filepath), mmap=mmap)
+            logger.info(f"Modèle compact chargé depuis {filepath}")
+            return
+        
+        import joblib
+        
         model_data = joblib.load(filepath)
         
         self.model = model_data['model']
@@ -260,9 +2091,111 @@ class LogAnomalyDetector:
         self.feature_columns = model_data['feature_columns']
         self.contamination = model_data['contamination']
         self.random_state = model_data['random_state']
+        self.pattern_scanner = PatternScanner(model_data.get('attack_patterns'),
+                                              model_data.get('error_patterns'))
+        self.window_seconds = model_data.get('window_seconds')
+        self.timestamp_parser = TimestampParser(model_data.get('missing_timestamp', 'now'))
+        self.model.set_params(n_jobs=self.n_jobs)
+        self.generation = model_data.get('generation', 0)
+        self.tree_generations = model_data.get(
+            'tree_generations', np.zeros(len(self.model.estimators_), dtype=np.int64)
+        )
+        self.drift_monitor = self._load_drift_monitor(model_data.get('drift_edges'),
+                                                      model_data.get('drift_reference'))
         self.is_trained = True
         
         logger.info(f"Modèle chargé depuis {filepath}")
+    
+    def _save_compact(self, directory: Path):
+        """Écrit l'artefact compact : manifest.json + un fichier .npy par tableau"""
+        if isinstance(self.model, CompactIsolationForest):
+            forest_arrays = dict(self.model.arrays)
+            denominator = self.model.denominator
+        else:
+            forest_arrays, denominator = CompactIsolationForest.export_arrays(self.model)
+        
+        arrays = {f'forest_{name}': values for name, values in forest_arrays.items()}
+        arrays['scaler_mean'] = self.scaler.mean_
+        arrays['scaler_scale'] = self.scaler.scale_
+        arrays['tree_generations'] = self.tree_generations
+        if self.drift_monitor is not None:
+            arrays['drift_edges'] = self.drift_monitor.edges
+            arrays['drift_reference'] = self.drift_monitor.reference
+        
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, values in arrays.items():
+            np.save(directory / f'{name}.npy', np.ascontiguousarray(values))
+        
+        manifest = {
+            'format': ARTIFACT_FORMAT,
+            'version': ARTIFACT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'feature_columns': self.feature_columns,
+            'contamination': self.contamination,
+            'random_state': self.random_state,
+            'attack_patterns': self.pattern_scanner.attack_patterns,
+            'error_patterns': self.pattern_scanner.error_patterns,
+            'window_seconds': self.window_seconds,
+            'missing_timestamp': self.timestamp_parser.missing,
+            'generation': self.generation,
+            'forest': {
+                'offset': float(self.model.offset_),
+                'denominator': denominator,
+                'max_samples': int(self.model.max_samples_)
+            },
+            'arrays': {name: f'{name}.npy' for name in arrays}
+        }
+        with open(directory / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    
+    def _load_compact(self, directory: Path, mmap: bool = True):
+        """Charge un artefact compact (modèle en lecture seule)"""
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(f"Artefact inattendu dans {directory}: {manifest.get('format')}")
+        if manifest.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Version d'artefact non supportée: {manifest.get('version')} "
+                             f"(attendue: {ARTIFACT_VERSION})")
+        
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(directory / filename, mmap_mode=mmap_mode)
+                  for name, filename in manifest['arrays'].items()}
+        
+        forest = manifest['forest']
+        self.model = CompactIsolationForest(
+            {name: arrays[f'forest_{name}'] for name in CompactIsolationForest.ARRAYS},
+            offset=forest['offset'],
+            denominator=forest['denominator'],
+            max_samples=forest['max_samples']
+        )
+        self.scaler = CompactScaler(arrays['scaler_mean'], arrays['scaler_scale'])
+        self.feature_columns = manifest['feature_columns']
+        self.contamination = manifest['contamination']
+        self.random_state = manifest['random_state']
+        self.pattern_scanner = PatternScanner(manifest['attack_patterns'], manifest['error_patterns'])
+        self.window_seconds = manifest.get('window_seconds')
+        self.timestamp_parser = TimestampParser(manifest.get('missing_timestamp', 'now'))
+        self.generation = manifest['generation']
+        self.tree_generations = np.array(arrays['tree_generations'])
+        self.drift_monitor = self._load_drift_monitor(arrays.get('drift_edges'),
+                                                      arrays.get('drift_reference'))
+        self.is_trained = True
+    
+    def _load_drift_monitor(self, edges: Optional[np.ndarray],
+                            reference: Optional[np.ndarray]) -> Optional[DriftMonitor]:
+        """Histogrammes de référence sauvegardés (None pour un modèle antérieur)"""
+        if edges is None or reference is None:
+            return None
+        return DriftMonitor(self.feature_columns, edges, reference)
+
+def _extract_features_worker(attack_patterns: List[str], error_patterns: List[str],
+                             log_entries: List[Dict], window_keys: bool = False,
+                             missing_timestamp: str = 'now', previous_timestamp=None) -> pd.DataFrame:
+    """Extraction des features d'une tranche de logs dans un processus worker"""
+    detector = LogAnomalyDetector(attack_patterns=attack_patterns, error_patterns=error_patterns,
+                                  missing_timestamp=missing_timestamp)
+    return detector._extract_features_batch(log_entries, window_keys, previous_timestamp)
 
 def main():
     """Fonction principale pour tester le détecteur"""
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Suite pytest-benchmark de LogAnomalyDetector
+extract_features, train, predict, save_model et load_model sur des logs
+synthétiques (log_generator) de 10k, 100k et 1M lignes
+
+    pytest benchmarks/bench_detector.py [--bench-sizes 10000,100000] [--benchmark-json out.json]
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from anomaly_detector import LogAnomalyDetector
+from log_generator import SyntheticLogGenerator
+
+ANOMALY_RATE = 0.05
+
+
+@lru_cache(maxsize=None)
+def dataset(size: int):
+    """Logs et étiquettes reproductibles (même graine pour toutes les tailles)"""
+    return SyntheticLogGenerator(anomaly_rate=ANOMALY_RATE, seed=42).generate(size)
+
+
+@lru_cache(maxsize=None)
+def trained_detector(size: int) -> LogAnomalyDetector:
+    """Détecteur entraîné une fois par taille, partagé par les benchmarks"""
+    logs, _ = dataset(size)
+    detector = LogAnomalyDetector(contamination=ANOMALY_RATE)
+    detector.train(logs)
+    return detector
+
+
+def rounds_for(size: int) -> int:
+    """Moins de répétitions pour les gros jeux de données"""
+    return 5 if size <= 10000 else 3 if size <= 100000 else 1
+
+
+def test_extract_features(benchmark, size):
+    logs, _ = dataset(size)
+    detector = LogAnomalyDetector()
+    features = benchmark.pedantic(detector.extract_features, args=(logs,),
+                                  rounds=rounds_for(size), iterations=1)
+    assert len(features) == size
+    benchmark.extra_info['rows_per_s'] = size / benchmark.stats.stats.min
+
+
+def test_train(benchmark, size):
+    logs, _ = dataset(size)
+
+    def train():
+        detector = LogAnomalyDetector(contamination=ANOMALY_RATE)
+        return detector.train(logs)
+
+    metrics = benchmark.pedantic(train, rounds=rounds_for(size), iterations=1)
+    assert metrics['feature_count'] > 0
+
+
+def test_predict(benchmark, size):
+    logs, labels = dataset(size)
+    detector = trained_detector(size)
+    results = benchmark.pedantic(detector.predict, args=(logs,), kwargs={'as_columns': True},
+                                 rounds=rounds_for(size), iterations=1)
+
+    # Qualité de détection sur les étiquettes du générateur
+    truth = labels != 'normal'
+    true_positives = int(np.sum(results.is_anomaly & truth))
+    benchmark.extra_info['precision'] = true_positives / max(results.n_anomalies, 1)
+    benchmark.extra_info['recall'] = true_positives / max(int(truth.sum()), 1)
+    benchmark.extra_info['rows_per_s'] = size / benchmark.stats.stats.min
+
+
+@pytest.mark.parametrize('compact', [False, True], ids=['joblib', 'compact'])
+def test_save_model(benchmark, size, compact, tmp_path):
+    detector = trained_detector(size)
+    target = tmp_path / ('model' if compact else 'model.joblib')
+    benchmark.pedantic(detector.save_model, args=(str(target),), kwargs={'compact': compact},
+                       rounds=5, iterations=1)
+    assert target.exists()
+
+
+@pytest.mark.parametrize('compact', [False, True], ids=['joblib', 'compact'])
+def test_load_model(benchmark, size, compact, tmp_path):
+    target = tmp_path / ('model' if compact else 'model.joblib')
+    trained_detector(size).save_model(str(target), compact=compact)
+
+    def load():
+        detector = LogAnomalyDetector()
+        detector.load_model(str(target))
+        return detector
+
+    detector = benchmark.pedantic(load, rounds=5, iterations=1)
+    assert detector.is_trained
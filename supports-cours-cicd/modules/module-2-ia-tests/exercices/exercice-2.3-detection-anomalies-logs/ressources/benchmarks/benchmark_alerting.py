@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark du pipeline d'alertes
+Envoie un flot d'anomalies dans AlertManager avec un canal lent (webhook simulé)
+et mesure le temps de process() côté scoring et le nombre de notifications émises
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from alerting import AlertManager, AlertSink, FileSink  # noqa: E402
+from anomaly_detector import PredictionResults  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+
+class SlowSink(AlertSink):
+    """Canal simulant la latence d'un webhook distant"""
+
+    name = 'slow-webhook'
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def send(self, alert):
+        time.sleep(self.latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--anomalies', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=10000,
+                        help="Taille des lots transmis à process() (un lot = un appel à predict)")
+    parser.add_argument('--sink-latency-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    logs = generate_logs(args.anomalies)
+    rng = np.random.default_rng(42)
+    results = PredictionResults(logs, -rng.uniform(0.01, 0.3, args.anomalies))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AlertManager([FileSink(Path(tmp) / 'alerts.jsonl'),
+                                SlowSink(args.sink_latency_ms / 1000.0)])
+        process_times = []
+        for start in range(0, len(results), args.batch_size):
+            begin = time.perf_counter()
+            manager.process(results[start:start + args.batch_size])
+            process_times.append(time.perf_counter() - begin)
+
+        begin = time.perf_counter()
+        manager.close()
+        drain = time.perf_counter() - begin
+        stats = manager.stats()
+
+    naive = args.anomalies * args.sink_latency_ms / 1000.0
+    print(f"Anomalies traitées          : {stats['anomalies']}")
+    print(f"Signatures distinctes       : {stats['signatures']}")
+    print(f"Alertes émises              : {stats['alerts']}")
+    for name, sink_stats in stats['sinks'].items():
+        print(f"  {name:<25} : {sink_stats}")
+    print(f"process() total             : {sum(process_times):.3f} s "
+          f"(max {max(process_times) * 1000:.1f} ms par lot de {args.batch_size})")
+    print(f"Vidage des files à l'arrêt  : {drain:.3f} s")
+    print(f"Envoi synchrone par anomalie (estimation) : {naive:.0f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction de features du détecteur d'anomalies
+Compare le chemin vectorisé (extract_features) à l'extraction ligne à ligne
+d'origine, figée dans reference_features (mêmes résultats exigés)
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from reference_features import extract_features_original  # noqa: E402
+
+
+def generate_logs(n_entries: int, seed: int = 42) -> List[Dict]:
+    """Génère des logs d'exemple proches de ceux de main()"""
+    rng = random.Random(seed)
+    methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+    urls = ['/api/users', '/api/login', '/api/orders', '/api/search?q=union select']
+    messages = [
+        'Request processed successfully',
+        'Database connection error - timeout after 5000ms',
+        'Unhandled exception in handler',
+        '<script>alert(1)</script>'
+    ]
+    logs = []
+    for i in range(n_entries):
+        logs.append({
+            'timestamp': f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00Z",
+            'status_code': rng.choice([200, 200, 200, 201, 404, 500]),
+            'response_time': rng.uniform(10, 8000),
+            'method': rng.choice(methods),
+            'url': rng.choice(urls),
+            'request_size': rng.randint(0, 4096),
+            'response_size': rng.randint(0, 65536),
+            'message': rng.choice(messages),
+            'cpu_usage': rng.uniform(0, 100),
+            'memory_usage': rng.uniform(0, 100)
+        })
+    return logs
+
+
+def time_call(func, logs: List[Dict]) -> float:
+    """Retourne la durée d'un appel en secondes"""
+    start = time.perf_counter()
+    func(logs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    detector = LogAnomalyDetector()
+    print(f"{'lignes':>10} {'ligne/ligne (l/s)':>20} {'vectorisé (l/s)':>18} {'gain':>8}")
+    for size in args.sizes:
+        logs = generate_logs(size)
+        original = extract_features_original(logs)
+        batched = detector.extract_features(logs)
+        pd.testing.assert_frame_equal(original, batched)
+
+        rowwise_time = time_call(extract_features_original, logs)
+        batched_time = time_call(detector.extract_features, logs)
+        print(f"{size:>10} {size / rowwise_time:>20,.0f} {size / batched_time:>18,.0f} "
+              f"{rowwise_time / batched_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'ingestion de fichiers de logs
+Compare json.loads ligne à ligne + extract_features aux lecteurs colonnes de
+LogAnomalyDetector.read_logs (JSON-lines, JSON-lines gzip, access logs) en MB/s
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import anomaly_detector  # noqa: E402
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+
+def write_access_log(path: Path, n_entries: int, seed: int = 42):
+    """Écrit un access log au format Combined suivi de la durée en secondes"""
+    rng = random.Random(seed)
+    urls = ['/api/users', '/api/login', '/api/orders', '/api/search?q=union+select']
+    agents = ['Mozilla/5.0', 'curl/8.0', 'sqlmap/1.7']
+    with open(path, 'w') as f:
+        for i in range(n_entries):
+            f.write(
+                f'10.0.{i % 256}.{rng.randint(1, 254)} - - '
+                f'[{1 + i % 28:02d}/Jan/2024:{i % 24:02d}:{i % 60:02d}:00 +0000] '
+                f'"{rng.choice(["GET", "POST", "PUT"])} {rng.choice(urls)} HTTP/1.1" '
+                f'{rng.choice([200, 200, 201, 404, 500])} {rng.randint(0, 65536)} '
+                f'"-" "{rng.choice(agents)}" {rng.uniform(0.01, 8):.3f}\n'
+            )
+
+
+def baseline(path: Path, detector: LogAnomalyDetector):
+    """Lecture historique : json.loads par ligne puis extraction sur la liste de dicts"""
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return detector.extract_features(entries)
+
+
+def columnar(path: Path, detector: LogAnomalyDetector, chunk_size: int):
+    """Lecteurs colonnes de read_logs"""
+    for batch in detector.read_logs(path, chunk_size=chunk_size):
+        detector.extract_features(batch)
+
+
+def read_only(path: Path, detector: LogAnomalyDetector, chunk_size: int):
+    """Lecture et parsing seuls, sans extraction des features"""
+    for _ in detector.read_logs(path, chunk_size=chunk_size):
+        pass
+
+
+def measure(func, *args, repeat: int = 3) -> float:
+    """Meilleure durée sur repeat exécutions"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    detector = LogAnomalyDetector()
+    print(f"Parseur JSON: {'orjson' if anomaly_detector.orjson is not None else 'json (stdlib)'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        logs = generate_logs(args.entries)
+        jsonl = tmp / 'logs.jsonl'
+        with open(jsonl, 'w') as f:
+            for entry in logs:
+                f.write(json.dumps(entry) + '\n')
+        jsonl_gz = tmp / 'logs.jsonl.gz'
+        with open(jsonl, 'rb') as src, gzip.open(jsonl_gz, 'wb', compresslevel=6) as dst:
+            dst.write(src.read())
+        access = tmp / 'access.log'
+        write_access_log(access, args.entries)
+        del logs
+
+        print(f"{'fichier':<14} {'Mo':>7} {'mode':<22} {'temps (s)':>10} {'MB/s':>8}")
+        cases = [(jsonl, True), (jsonl_gz, True), (access, False)]
+        for path, has_baseline in cases:
+            size_mb = path.stat().st_size / 1e6
+            runs = []
+            if has_baseline:
+                runs.append(('json.loads + dicts', measure(baseline, path, detector, repeat=args.repeat)))
+            runs.append(('read_logs (parsing)', measure(read_only, path, detector, args.chunk_size,
+                                                        repeat=args.repeat)))
+            runs.append(('read_logs + features', measure(columnar, path, detector, args.chunk_size,
+                                                         repeat=args.repeat)))
+            for mode, elapsed in runs:
+                print(f"{path.name:<14} {size_mb:>7.1f} {mode:<22} {elapsed:>10.3f} {size_mb / elapsed:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark des formats de sauvegarde du détecteur d'anomalies
+Compare temps de chargement et mémoire résidente (RSS) : joblib contre artefact compact
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RESSOURCES_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RESSOURCES_DIR))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+# Script exécuté dans un processus neuf : import, chargement, une prédiction
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {ressources!r})
+from anomaly_detector import LogAnomalyDetector
+imported = time.perf_counter()
+detector = LogAnomalyDetector()
+detector.load_model({path!r})
+loaded = time.perf_counter()
+detector.predict([{{'timestamp': '2024-01-15T10:30:00Z', 'status_code': 500, 'message': 'error'}}])
+print(json.dumps({{
+    'import_s': imported - start,
+    'load_s': loaded - imported,
+    'first_predict_s': time.perf_counter() - loaded,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}}))
+"""
+
+
+def probe(path: Path) -> dict:
+    """Mesure import + chargement + première prédiction dans un processus neuf"""
+    code = PROBE.format(ressources=str(RESSOURCES_DIR), path=str(path))
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger('anomaly_detector').setLevel(logging.WARNING)
+    logs = generate_logs(args.size)
+    detector = LogAnomalyDetector()
+    detector.train(logs)
+
+    print(f"{'format':>8} {'load (ms)':>10} {'import (s)':>11} {'1re préd. (s)':>14} {'RSS max (Mo)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'joblib': Path(tmp) / 'model.pkl', 'compact': Path(tmp) / 'model_compact'}
+        detector.save_model(str(paths['joblib']))
+        detector.save_model(str(paths['compact']), compact=True)
+
+        # Les deux formats doivent donner les mêmes scores
+        reference = [r['anomaly_score'] for r in detector.predict(logs[:2000])]
+        reloaded = LogAnomalyDetector()
+        reloaded.load_model(str(paths['compact']))
+        np.testing.assert_array_equal(reference, [r['anomaly_score'] for r in reloaded.predict(logs[:2000])])
+
+        for label, path in paths.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                LogAnomalyDetector().load_model(str(path))
+            load_ms = (time.perf_counter() - start) / args.repeat * 1000
+            stats = probe(path)
+            print(f"{label:>8} {load_ms:>10.2f} {stats['import_s']:>11.3f} "
+                  f"{stats['first_predict_s']:>14.3f} {stats['max_rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
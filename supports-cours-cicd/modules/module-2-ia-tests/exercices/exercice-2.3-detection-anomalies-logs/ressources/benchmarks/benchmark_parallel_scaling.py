@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark de mise à l'échelle du détecteur d'anomalies sur plusieurs cœurs
+Mesure extraction, entraînement et prédiction pour 1/2/4/8 workers
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+
+def elapsed(func, *args):
+    """Retourne le résultat d'un appel et sa durée en secondes"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=400000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--min-entries', type=int, default=LogAnomalyDetector.PARALLEL_MIN_ENTRIES,
+                        help="Taille minimale d'une tranche par thread de scoring")
+    parser.add_argument('--extract-min-entries', type=int,
+                        default=LogAnomalyDetector.PARALLEL_EXTRACT_MIN_ENTRIES,
+                        help="Taille minimale d'une tranche par processus d'extraction")
+    args = parser.parse_args()
+
+    logging.getLogger('anomaly_detector').setLevel(logging.WARNING)
+    LogAnomalyDetector.PARALLEL_MIN_ENTRIES = args.min_entries
+    LogAnomalyDetector.PARALLEL_EXTRACT_MIN_ENTRIES = args.extract_min_entries
+    logs = generate_logs(args.size)
+
+    reference = None
+    print(f"{'workers':>8} {'extraction (s)':>15} {'train (s)':>10} {'predict (s)':>12} {'predict (l/s)':>14}")
+    for n_jobs in args.workers:
+        detector = LogAnomalyDetector(n_jobs=n_jobs)
+        features, extract_time = elapsed(detector.extract_features, logs)
+        _, train_time = elapsed(detector.train, logs)
+        results, predict_time = elapsed(detector.predict, logs)
+
+        scores = np.array([result['anomaly_score'] for result in results])
+        if reference is None:
+            reference = (features, scores)
+        else:
+            pd.testing.assert_frame_equal(reference[0], features)
+            np.testing.assert_array_equal(reference[1], scores)
+
+        print(f"{n_jobs:>8} {extract_time:>15.2f} {train_time:>10.2f} {predict_time:>12.2f} "
+              f"{args.size / predict_time:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
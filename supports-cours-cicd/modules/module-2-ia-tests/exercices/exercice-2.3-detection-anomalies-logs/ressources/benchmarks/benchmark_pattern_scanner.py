@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark du scanner de patterns (signatures d'attaque et mots-clés d'erreur)
+Compare l'ancienne approche (une recherche par signature) à PatternScanner
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import DEFAULT_ATTACK_PATTERNS, PatternScanner  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+
+def legacy_scan_columns(messages: pd.Series, urls: pd.Series):
+    """Ancienne approche : un .str.count puis un .str.contains par signature"""
+    error_counts = messages.str.count(r'error|exception|fail')
+    haystack = messages + ' ' + urls
+    hits = [haystack.str.contains(pattern, regex=True) for pattern in DEFAULT_ATTACK_PATTERNS]
+    return error_counts, hits
+
+
+def legacy_scan(message: str, url: str):
+    """Ancienne approche ligne à ligne : re.findall puis un re.search par signature"""
+    error_count = len(re.findall(r'error|exception|fail', message))
+    hits = [re.search(pattern, message + ' ' + url) is not None for pattern in DEFAULT_ATTACK_PATTERNS]
+    return error_count, hits
+
+
+def elapsed(func) -> float:
+    """Retourne la durée d'un appel en secondes"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    scanner = PatternScanner()
+    print(f"{'lignes':>10} {'messages':>10} {'re.* (l/s)':>12} {'scan (l/s)':>12} "
+          f"{'.str (l/s)':>12} {'colonnes (l/s)':>15}")
+    for size in args.sizes:
+        logs = generate_logs(size)
+        for cardinality in ('répétés', 'uniques'):
+            messages = [entry['message'].lower() for entry in logs]
+            if cardinality == 'uniques':
+                messages = [f"{message} request_id={i}" for i, message in enumerate(messages)]
+            urls = [entry['url'].lower() for entry in logs]
+            message_col = pd.Series(messages, dtype=object)
+            url_col = pd.Series(urls, dtype=object)
+
+            legacy_rows = elapsed(lambda: [legacy_scan(m, u) for m, u in zip(messages, urls)])
+            scanner_rows = elapsed(lambda: [scanner.scan(m, u) for m, u in zip(messages, urls)])
+            legacy_cols = elapsed(lambda: legacy_scan_columns(message_col, url_col))
+            scanner_cols = elapsed(lambda: scanner.scan_columns(message_col, url_col))
+
+            print(f"{size:>10} {cardinality:>10} {size / legacy_rows:>12,.0f} {size / scanner_rows:>12,.0f} "
+                  f"{size / legacy_cols:>12,.0f} {size / scanner_cols:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
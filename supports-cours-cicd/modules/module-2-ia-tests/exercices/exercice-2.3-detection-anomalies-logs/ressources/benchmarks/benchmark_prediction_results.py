@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark des formats de résultats de predict
+Compare la liste de dictionnaires historique au format colonnes (PredictionResults) :
+latence, mémoire allouée par les résultats et sélection des k entrées les plus anormales
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+
+
+def measure(func):
+    """Durée et pic de mémoire Python (tracemalloc) d'un appel"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6, retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--top-k', type=int, default=100)
+    args = parser.parse_args()
+
+    detector = LogAnomalyDetector()
+    detector.train(generate_logs(10000))
+
+    print(f"{'entrées':>9} {'format':<10} {'temps (s)':>10} {'pic (Mo)':>9} "
+          f"{'conservé (Mo)':>14} {'top-k (ms)':>11}")
+    for size in args.sizes:
+        logs = generate_logs(size)
+
+        results, elapsed, peak, retained = measure(lambda: detector.predict(logs))
+        start = time.perf_counter()
+        top_list = sorted(results, key=lambda r: r['anomaly_score'])[:args.top_k]
+        top_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>9} {'dicts':<10} {elapsed:>10.3f} {peak:>9.1f} {retained:>14.1f} {top_ms:>11.2f}")
+        del results
+
+        columns, elapsed, peak, retained = measure(lambda: detector.predict(logs, as_columns=True))
+        start = time.perf_counter()
+        top_columns = columns.top_k(args.top_k)
+        top_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>9} {'colonnes':<10} {elapsed:>10.3f} {peak:>9.1f} {retained:>14.1f} {top_ms:>11.2f}")
+
+        # Même classement : scores identiques des k entrées retenues
+        np.testing.assert_array_equal([r['anomaly_score'] for r in top_list],
+                                      columns.anomaly_score[top_columns])
+        del columns, logs
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark du registre de modèles multi-services
+Simule des requêtes réparties selon une loi de Zipf sur de nombreux services
+et compare le cache LRU du registre à un load_model par requête
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from log_generator import SyntheticLogGenerator  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--services', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--budget-mb', type=float, default=64.0)
+    parser.add_argument('--zipf', type=float, default=1.2, help="Exposant de la loi de Zipf")
+    parser.add_argument('--compact', action='store_true', help="Artefacts compacts plutôt que joblib")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    logs, _ = SyntheticLogGenerator(seed=42).generate(5000)
+    detector = LogAnomalyDetector()
+    detector.train(logs)
+
+    rng = np.random.default_rng(42)
+    services = (rng.zipf(args.zipf, args.requests) - 1) % args.services
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp, memory_budget_mb=args.budget_mb)
+        for service in range(args.services):
+            registry.register(f'svc{service}', detector, version='v1', compact=args.compact)
+
+        # Référence : un chargement depuis le disque par requête
+        sample = services[:min(200, args.requests)]
+        start = time.perf_counter()
+        for service in sample:
+            LogAnomalyDetector().load_model(str(registry.artifact_path(f'svc{service}', 'v1')))
+        reload_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+        parts = np.array_split(services, args.threads)
+
+        def worker(part):
+            for service in part:
+                registry.get(f'svc{service}')
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(part,)) for part in parts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stats = registry.stats()
+
+    print(f"Services / requêtes / threads : {args.services} / {args.requests} / {args.threads}")
+    print(f"Taux de succès du cache       : {stats['hit_rate']:.1%} "
+          f"({stats['hits']} succès, {stats['misses']} défauts, {stats['loads']} chargements)")
+    print(f"Évictions                     : {stats['evictions']} "
+          f"({stats['cached_models']} modèles, {stats['memory_bytes'] / 1e6:.1f} Mo en cache)")
+    print(f"Accès moyen via le registre   : {elapsed / args.requests * 1000:.3f} ms")
+    print(f"load_model à chaque requête   : {reload_ms:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la conversion des horodatages (TimestampParser)
+Compare, pour chaque format, la conversion par lot (format détecté une fois,
+valeurs distinctes converties une fois) à pd.to_datetime ligne à ligne
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import TimestampParser  # noqa: E402
+
+
+def columns(n_entries: int, seed: int = 42):
+    """Colonnes d'horodatages d'un trafic à ~100 requêtes/s, dans chaque format"""
+    rng = np.random.default_rng(seed)
+    seconds = 1705305600 + np.cumsum(rng.exponential(0.01, n_entries)).astype(np.int64)
+    stamps = pd.to_datetime(seconds, unit='s')
+    iso = stamps.strftime('%Y-%m-%dT%H:%M:%SZ').tolist()
+    offsets = ['+00:00', '+02:00', '-05:00', '+05:30']
+    return {
+        'iso8601': iso,
+        'iso8601 (fuseaux mélangés)': [value[:-1] + offsets[i % 4] for i, value in enumerate(iso)],
+        'epoch': seconds.tolist(),
+        'clf': stamps.strftime('%d/%b/%Y:%H:%M:%S +0000').tolist(),
+        'compact (AAAAMMJJHHMMSS)': stamps.strftime('%Y%m%d%H%M%S').tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=200000)
+    parser.add_argument('--rowwise-max', type=int, default=20000,
+                        help="Lignes converties une à une pour la référence (extrapolée)")
+    args = parser.parse_args()
+
+    print(f"{'format':<28} {'par lot':>10} {'ligne à ligne':>14} {'accélération':>13}")
+    reference = None
+    for name, values in columns(args.entries).items():
+        start = time.perf_counter()
+        utc, _, ok = TimestampParser().parse(values)
+        batch = time.perf_counter() - start
+        assert ok.all(), name
+        # Mêmes instants UTC dans chaque format (hors fuseaux mélangés)
+        if reference is None:
+            reference = utc
+        elif 'fuseaux' not in name:
+            np.testing.assert_array_equal(utc, reference, err_msg=name)
+
+        sample = values[:args.rowwise_max]
+        start = time.perf_counter()
+        for value in sample:
+            pd.to_datetime(value, unit='s' if name == 'epoch' else None,
+                           format=TimestampParser.CLF_FORMAT if name == 'clf' else None)
+        rowwise = (time.perf_counter() - start) * len(values) / len(sample)
+        print(f"{name:<28} {batch:>9.3f}s {rowwise:>13.3f}s {rowwise / batch:>12.0f}x")
+
+
+if __name__ == '__main__':
+    main()
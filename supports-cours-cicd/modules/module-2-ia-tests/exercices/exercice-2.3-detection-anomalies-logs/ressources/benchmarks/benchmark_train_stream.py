@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'entraînement échantillonné (train_stream)
+Compare train() sur tout l'historique et train_stream() avec un budget fixe
+pour des fichiers JSON-lines de tailles croissantes : le temps de
+train_stream doit rester quasi constant, hors lecture des lignes
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from log_generator import SyntheticLogGenerator  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='100000,1000000,3000000',
+                        help="Nombres de lignes d'historique, séparés par des virgules")
+    parser.add_argument('--sample-size', type=int, default=100000)
+    parser.add_argument('--full-max', type=int, default=1000000,
+                        help="Taille maximale pour laquelle train() complet est mesuré")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'lignes':>10} {'train()':>10} {'train_stream':>13} {'taux val':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(size) for size in args.sizes.split(',')]:
+            path = Path(tmp) / f'logs_{size}.jsonl'
+            SyntheticLogGenerator(seed=42).write(path, size)
+
+            full = '-'
+            if size <= args.full_max:
+                logs = [entry for chunk in LogAnomalyDetector.read_logs(path) for entry in chunk]
+                full = f"{timed(LogAnomalyDetector().train, logs)[0]:.2f}s"
+                del logs
+
+            sampled, metrics = timed(LogAnomalyDetector().train_stream, path,
+                                     sample_size=args.sample_size)
+            print(f"{size:>10} {full:>10} {sampled:>12.2f}s {metrics['val_anomaly_rate']:>9.3f}")
+            path.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Configuration pytest de la suite de benchmarks (pytest-benchmark)
+
+Lancement :
+    pytest benchmarks/bench_detector.py --bench-sizes 10000,100000,1000000
+
+Sans --benchmark-json, les résultats sont écrits dans
+benchmarks/results/<commit>.json pour comparer les commits entre eux.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent))
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-sizes', default='10000,100000,1000000',
+                     help="Tailles de jeux de logs, séparées par des virgules")
+
+
+def pytest_generate_tests(metafunc):
+    if 'size' in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption('--bench-sizes').split(',')]
+        metafunc.parametrize('size', sizes, ids=[f'{size // 1000}k' for size in sizes])
+
+
+def _commit_id() -> str:
+    """Commit courant (horodatage si le dépôt git est indisponible)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        from datetime import datetime
+        return datetime.now().strftime('%Y%m%d-%H%M%S')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Fichier JSON par défaut, avant la création de la session pytest-benchmark
+    if config.pluginmanager.hasplugin('benchmark') and config.getoption('benchmark_json', None) is None:
+        import pytest_benchmark
+
+        results_dir = BENCHMARKS_DIR / 'results'
+        results_dir.mkdir(exist_ok=True)
+        output = results_dir / f'{_commit_id()}.json'
+        # pytest-benchmark 4 attend un fichier ouvert, les versions suivantes un chemin
+        if int(pytest_benchmark.__version__.split('.')[0]) >= 5:
+            config.option.benchmark_json = str(output)
+        else:
+            config.option.benchmark_json = open(output, 'wb')
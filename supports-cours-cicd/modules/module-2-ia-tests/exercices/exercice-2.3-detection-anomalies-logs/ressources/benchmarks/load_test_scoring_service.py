@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test de charge du service de scoring sur localhost
+Mesure débit et latences pour plusieurs fenêtres de micro-batching
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from werkzeug.serving import make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anomaly_detector import LogAnomalyDetector  # noqa: E402
+from benchmark_extract_features import generate_logs  # noqa: E402
+from scoring_service import create_app  # noqa: E402
+
+
+def post_json(url: str, payload) -> float:
+    """Envoie une requête POST et retourne sa latence en secondes"""
+    data = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_load(detector: LogAnomalyDetector, batch_window: float, logs, concurrency: int,
+             n_requests: int, entries_per_request: int):
+    """Démarre un serveur local, l'alimente et retourne les mesures"""
+    app = create_app(detector, batch_window=batch_window)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/score"
+
+    payloads = [logs[(i * entries_per_request) % len(logs):][:entries_per_request]
+                for i in range(n_requests)]
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = np.array(list(pool.map(lambda payload: post_json(url, payload), payloads)))
+        duration = time.perf_counter() - start
+        server_stats = app.config['BATCHER'].stats()
+    finally:
+        server.shutdown()
+        app.config['BATCHER'].close()
+
+    return {
+        'throughput_rps': n_requests / duration,
+        'client_p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'client_p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'server_p50_ms': server_stats['latency_p50_ms'],
+        'server_p99_ms': server_stats['latency_p99_ms'],
+        'mean_batch_size': server_stats['mean_batch_size']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--windows-ms', type=float, nargs='+', default=[0, 1, 5, 20])
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--entries-per-request', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger('anomaly_detector').setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    logs = generate_logs(5000)
+    detector = LogAnomalyDetector()
+    detector.train(logs)
+
+    print(f"{'fenêtre (ms)':>12} {'req/s':>8} {'p50 client':>11} {'p99 client':>11} "
+          f"{'p50 serveur':>12} {'p99 serveur':>12} {'lot moyen':>10}")
+    for window_ms in args.windows_ms:
+        stats = run_load(detector, window_ms / 1000.0, logs, args.concurrency,
+                         args.requests, args.entries_per_request)
+        print(f"{window_ms:>12.1f} {stats['throughput_rps']:>8,.0f} {stats['client_p50_ms']:>11.1f} "
+              f"{stats['client_p99_ms']:>11.1f} {stats['server_p50_ms']:>12.1f} "
+              f"{stats['server_p99_ms']:>12.1f} {stats['mean_batch_size']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
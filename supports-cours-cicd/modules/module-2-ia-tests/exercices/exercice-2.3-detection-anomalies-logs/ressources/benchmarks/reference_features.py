@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Extraction de features d'origine de LogAnomalyDetector, figée
+Copie de la boucle ligne à ligne d'avant la vectorisation, servant de
+référence aux benchmarks et aux tests d'équivalence. Ne pas modifier.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_method(method: str) -> int:
+    """Encode les méthodes HTTP en valeurs numériques"""
+    method_mapping = {
+        'GET': 1, 'POST': 2, 'PUT': 3, 'DELETE': 4,
+        'PATCH': 5, 'HEAD': 6, 'OPTIONS': 7
+    }
+    return method_mapping.get(method.upper(), 0)
+
+
+def _detect_suspicious_patterns(entry: Dict) -> int:
+    """Détecte des patterns suspects dans les logs"""
+    suspicious_count = 0
+    message = entry.get('message', '').lower()
+    url = entry.get('url', '').lower()
+
+    # Patterns d'attaque courants
+    attack_patterns = [
+        r'sql.*injection', r'xss', r'script.*alert',
+        r'union.*select', r'drop.*table', r'../.*/',
+        r'cmd.*exec', r'eval\(', r'base64_decode'
+    ]
+
+    for pattern in attack_patterns:
+        if re.search(pattern, message + ' ' + url):
+            suspicious_count += 1
+
+    return suspicious_count
+
+
+def extract_features_original(log_entries: List[Dict]) -> pd.DataFrame:
+    """LogAnomalyDetector.extract_features tel qu'écrit à l'origine"""
+    features = []
+
+    for entry in log_entries:
+        try:
+            # Features temporelles
+            timestamp = pd.to_datetime(entry.get('timestamp', datetime.now()))
+            hour_of_day = timestamp.hour
+            day_of_week = timestamp.weekday()
+
+            # Features de requête HTTP
+            status_code = int(entry.get('status_code', 200))
+            response_time = float(entry.get('response_time', 0))
+            request_size = int(entry.get('request_size', 0))
+            response_size = int(entry.get('response_size', 0))
+
+            # Features de contenu
+            method = entry.get('method', 'GET')
+            method_encoded = _encode_method(method)
+
+            # Features d'erreur
+            error_count = len(re.findall(r'error|exception|fail',
+                                         entry.get('message', '').lower()))
+
+            # Features de performance
+            cpu_usage = float(entry.get('cpu_usage', 0))
+            memory_usage = float(entry.get('memory_usage', 0))
+
+            # Features de sécurité
+            suspicious_patterns = _detect_suspicious_patterns(entry)
+
+            feature_dict = {
+                'hour_of_day': hour_of_day,
+                'day_of_week': day_of_week,
+                'status_code': status_code,
+                'response_time': response_time,
+                'request_size': request_size,
+                'response_size': response_size,
+                'method_encoded': method_encoded,
+                'error_count': error_count,
+                'cpu_usage': cpu_usage,
+                'memory_usage': memory_usage,
+                'suspicious_patterns': suspicious_patterns,
+                'status_is_error': 1 if status_code >= 400 else 0,
+                'response_time_high': 1 if response_time > 5000 else 0,
+                'size_ratio': response_size / max(request_size, 1)
+            }
+
+            features.append(feature_dict)
+
+        except Exception as e:
+            logger.warning(f"Erreur lors de l'extraction des features: {e}")
+            continue
+
+    df = pd.DataFrame(features)
+
+    # Gestion des valeurs manquantes
+    df = df.fillna(0)
+
+    return df
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Générateur de logs synthétiques pour LogAnomalyDetector
+Produit un trafic HTTP reproductible (graine) avec un taux d'anomalies et un
+mélange de types d'attaques contrôlés, étiqueté pour mesurer la détection
+"""
+
+import argparse
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Endpoints du trafic normal : (méthode, url, temps de réponse médian en ms)
+NORMAL_ENDPOINTS = [
+    ('GET', '/api/users', 80), ('GET', '/api/products', 120), ('GET', '/api/orders', 150),
+    ('POST', '/api/orders', 250), ('POST', '/api/login', 180), ('PUT', '/api/users', 200),
+    ('DELETE', '/api/sessions', 60), ('GET', '/health', 5)
+]
+NORMAL_STATUSES = [200, 201, 204, 304, 404]
+NORMAL_STATUS_WEIGHTS = [0.80, 0.08, 0.04, 0.05, 0.03]
+NORMAL_MESSAGES = ['Request processed successfully', 'Cache hit', 'User authenticated',
+                   'Order created', 'Resource not modified']
+
+# Types d'anomalies : champs imposés à la ligne (les autres suivent le trafic normal)
+ANOMALY_KINDS = {
+    'sql_injection': {'method': 'GET', 'url': "/api/search?q=1' union select password from users--",
+                      'message': 'SQL injection attempt blocked', 'status_code': 403},
+    'xss': {'method': 'POST', 'url': '/api/comments',
+            'message': '<script>alert(document.cookie)</script>', 'status_code': 400},
+    'path_traversal': {'method': 'GET', 'url': '/static/../../../etc/passwd',
+                       'message': 'File access denied', 'status_code': 403},
+    'command_injection': {'method': 'POST', 'url': '/api/tools/ping?host=127.0.0.1;cmd_exec',
+                          'message': 'cmd exec rejected', 'status_code': 400},
+    'code_injection': {'method': 'POST', 'url': '/api/templates/render',
+                       'message': 'eval(base64_decode(payload))', 'status_code': 500},
+    'error_storm': {'message': 'Database connection error - timeout after 5000ms', 'status_code': 500},
+    'latency_spike': {'message': 'Upstream service slow'},
+    'resource_exhaustion': {'message': 'Out of memory exception in worker', 'status_code': 503},
+}
+
+class SyntheticLogGenerator:
+    """
+    Générateur de trafic HTTP synthétique et étiqueté
+
+    Les horodatages avancent d'un appel à l'autre (rate requêtes/s en
+    moyenne) : des appels successifs forment un flux continu.
+    """
+
+    def __init__(self, anomaly_rate: float = 0.05, attack_mix: Optional[Dict[str, float]] = None,
+                 rate: float = 100.0, start: Optional[datetime] = None, seed: int = 42):
+        """
+        Initialise le générateur
+
+        Args:
+            anomaly_rate: Proportion de lignes anormales (0.05 = 5%)
+            attack_mix: Poids relatifs des types d'anomalies (ANOMALY_KINDS), tous égaux par défaut
+            rate: Débit moyen simulé en requêtes par seconde
+            start: Horodatage de la première ligne (2024-01-15 08:00 par défaut)
+            seed: Graine du générateur aléatoire
+        """
+        if not 0 <= anomaly_rate <= 1:
+            raise ValueError("anomaly_rate doit être compris entre 0 et 1")
+        if rate <= 0:
+            raise ValueError("rate doit être strictement positif")
+
+        attack_mix = attack_mix or {kind: 1.0 for kind in ANOMALY_KINDS}
+        unknown = set(attack_mix) - set(ANOMALY_KINDS)
+        if unknown:
+            raise ValueError(f"Types d'anomalies inconnus: {sorted(unknown)}")
+        total = sum(attack_mix.values())
+        if total <= 0:
+            raise ValueError("attack_mix doit contenir au moins un poids positif")
+
+        self.anomaly_rate = anomaly_rate
+        self.kinds = list(attack_mix)
+        self.kind_weights = np.array([attack_mix[kind] for kind in self.kinds], dtype=float) / total
+        self.rate = rate
+        self.rng = np.random.default_rng(seed)
+        self._clock = start or datetime(2024, 1, 15, 8, 0, 0)
+
+    def generate(self, n_entries: int) -> Tuple[List[Dict], np.ndarray]:
+        """
+        Génère un lot de logs
+
+        Args:
+            n_entries: Nombre de lignes
+
+        Returns:
+            Entrées de logs et, pour chaque ligne, son type ('normal' ou une clé d'ANOMALY_KINDS)
+        """
+        rng = self.rng
+
+        # Trafic normal, colonne par colonne
+        gaps = rng.exponential(1.0 / self.rate, n_entries)
+        offsets = np.cumsum(gaps)
+        endpoints = rng.integers(0, len(NORMAL_ENDPOINTS), n_entries)
+        medians = np.array([median for _, _, median in NORMAL_ENDPOINTS], dtype=float)[endpoints]
+        columns = {
+            'method': np.array([method for method, _, _ in NORMAL_ENDPOINTS], dtype=object)[endpoints],
+            'url': np.array([url for _, url, _ in NORMAL_ENDPOINTS], dtype=object)[endpoints],
+            'status_code': rng.choice(NORMAL_STATUSES, n_entries, p=NORMAL_STATUS_WEIGHTS),
+            'response_time': np.round(medians * rng.lognormal(0.0, 0.35, n_entries), 2),
+            'request_size': rng.lognormal(6.5, 0.8, n_entries).astype(np.int64),
+            'response_size': rng.lognormal(8.5, 1.0, n_entries).astype(np.int64),
+            'message': np.array(NORMAL_MESSAGES, dtype=object)[rng.integers(0, len(NORMAL_MESSAGES), n_entries)],
+            'cpu_usage': np.round(rng.uniform(15, 60, n_entries), 1),
+            'memory_usage': np.round(rng.uniform(30, 70, n_entries), 1),
+        }
+
+        # Anomalies : tirage des lignes puis de leur type selon le mélange
+        labels = np.full(n_entries, 'normal', dtype=object)
+        anomalous = np.flatnonzero(rng.random(n_entries) < self.anomaly_rate)
+        kinds = np.array(self.kinds, dtype=object)[
+            rng.choice(len(self.kinds), len(anomalous), p=self.kind_weights)
+        ]
+        labels[anomalous] = kinds
+        for kind in self.kinds:
+            rows = anomalous[kinds == kind]
+            if len(rows) == 0:
+                continue
+            for field, value in ANOMALY_KINDS[kind].items():
+                columns[field][rows] = value
+            if kind == 'latency_spike':
+                columns['response_time'][rows] = np.round(rng.uniform(8000, 30000, len(rows)), 2)
+            elif kind == 'resource_exhaustion':
+                columns['cpu_usage'][rows] = np.round(rng.uniform(95, 100, len(rows)), 1)
+                columns['memory_usage'][rows] = np.round(rng.uniform(95, 100, len(rows)), 1)
+            elif kind == 'error_storm':
+                columns['response_time'][rows] = np.round(rng.uniform(4000, 6000, len(rows)), 2)
+
+        # Horodatages ISO-8601 à la seconde
+        start = self._clock
+        timestamps = self._format_timestamps(start, offsets.astype(np.int64))
+        self._clock = start + timedelta(seconds=float(offsets[-1]) if n_entries else 0.0)
+
+        names = list(columns)
+        values = [columns[name].tolist() for name in names]
+        logs = [dict(zip(names, row), timestamp=timestamp) for *row, timestamp in zip(*values, timestamps)]
+        return logs, labels
+
+    @staticmethod
+    def _format_timestamps(start: datetime, seconds: np.ndarray) -> List[str]:
+        """Formate les horodatages une fois par seconde distincte"""
+        base = np.datetime64(start.replace(microsecond=0), 's')
+        uniques, codes = np.unique(seconds, return_inverse=True)
+        formatted = np.datetime_as_string(base + uniques.astype('timedelta64[s]'), unit='s')
+        formatted = np.array([value + 'Z' for value in formatted.tolist()], dtype=object)
+        return formatted[codes].tolist()
+
+    def write(self, path: Union[str, Path], n_entries: int, chunk_size: int = 100000) -> Dict[str, int]:
+        """
+        Écrit n_entries lignes en JSON-lines (compressé si le nom finit par .gz)
+
+        Returns:
+            Nombre de lignes par type
+        """
+        path = Path(path)
+        opener = gzip.open if path.suffix == '.gz' else open
+        counts: Dict[str, int] = {}
+        with opener(path, 'wt', encoding='utf-8') as f:
+            remaining = n_entries
+            while remaining > 0:
+                logs, labels = self.generate(min(chunk_size, remaining))
+                f.writelines(json.dumps(entry) + '\n' for entry in logs)
+                kinds, kind_counts = np.unique(labels.astype(str), return_counts=True)
+                for kind, count in zip(kinds.tolist(), kind_counts.tolist()):
+                    counts[kind] = counts.get(kind, 0) + count
+                remaining -= len(logs)
+        return counts
+
+def parse_attack_mix(value: str) -> Dict[str, float]:
+    """Parse 'sql_injection=2,xss=1' en dictionnaire de poids"""
+    mix = {}
+    for item in value.split(','):
+        kind, _, weight = item.partition('=')
+        mix[kind.strip()] = float(weight) if weight else 1.0
+    return mix
+
+def main():
+    """Génère un fichier de logs synthétiques"""
+    parser = argparse.ArgumentParser(description="Générateur de logs synthétiques étiquetés")
+    volume = parser.add_mutually_exclusive_group()
+    volume.add_argument('--entries', type=int, help="Nombre de lignes à générer")
+    volume.add_argument('--duration', type=float, default=300.0,
+                        help="Durée de trafic simulée en secondes (avec --rate)")
+    parser.add_argument('--rate', type=float, default=100.0, help="Requêtes par seconde simulées")
+    parser.add_argument('--anomaly-rate', type=float, default=0.05)
+    parser.add_argument('--attack-mix', type=parse_attack_mix,
+                        help=f"Poids par type, ex. 'sql_injection=2,xss=1' parmi {', '.join(ANOMALY_KINDS)}")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='logs.jsonl', help="Fichier JSON-lines (.gz accepté)")
+    args = parser.parse_args()
+
+    n_entries = args.entries if args.entries is not None else int(args.duration * args.rate)
+    generator = SyntheticLogGenerator(anomaly_rate=args.anomaly_rate, attack_mix=args.attack_mix,
+                                      rate=args.rate, seed=args.seed)
+    counts = generator.write(args.output, n_entries)
+    logger.info(f"{n_entries} lignes écrites dans {args.output}: {counts}")
+
+if __name__ == "__main__":
+    main()
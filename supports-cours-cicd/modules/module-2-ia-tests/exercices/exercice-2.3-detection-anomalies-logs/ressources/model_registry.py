@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Registre de modèles multi-services pour LogAnomalyDetector
+Charge à la demande les artefacts rangés par service et version, garde les
+détecteurs chauds dans un cache LRU borné en mémoire et évince les plus froids
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from anomaly_detector import LogAnomalyDetector
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Noms de services et de versions utilisables comme répertoires
+NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+def _natural_key(version: str) -> List:
+    """Clé de tri 'naturelle' : v2 < v10, 20240115 < 20240116"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', version)]
+
+def _artifact_size(path: Path) -> int:
+    """Taille d'un artefact sur disque (fichier joblib ou répertoire compact)"""
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.iterdir() if child.is_file())
+    return path.stat().st_size
+
+class ModelRegistry:
+    """
+    Registre de détecteurs par (service, version)
+
+    Arborescence : <root>/<service>/<version>/ (artefact compact) ou
+    <root>/<service>/<version>.joblib. La version None désigne la plus
+    récente (tri naturel des noms), relue sur disque au plus toutes les
+    latest_ttl secondes.
+
+    Les détecteurs chargés sont gardés dans un cache LRU dont la taille
+    est estimée par celle des artefacts sur disque ; au-delà de
+    memory_budget_mb, les moins récemment utilisés sont évincés (jamais
+    celui qui vient d'être demandé). Le registre est partageable entre
+    threads : un seul chargement a lieu par clé, les autres demandeurs
+    attendent son résultat.
+    """
+
+    def __init__(self, root: Union[str, Path], memory_budget_mb: float = 512,
+                 mmap: bool = True, latest_ttl: float = 30.0,
+                 loader: Optional[Callable[[Path], LogAnomalyDetector]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise le registre
+
+        Args:
+            root: Répertoire racine des artefacts
+            memory_budget_mb: Budget mémoire du cache en Mo
+            mmap: Mappe en mémoire les artefacts compacts (voir load_model)
+            latest_ttl: Durée de validité de la résolution de la dernière version (s)
+            loader: Fonction de chargement d'un artefact (load_model par défaut)
+            clock: Horloge monotone (remplaçable pour les tests)
+        """
+        if memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb doit être strictement positif")
+        self.root = Path(root)
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.mmap = mmap
+        self.latest_ttl = latest_ttl
+        self.loader = loader or self._load_detector
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        # (service, version) -> (détecteur, taille estimée), du plus ancien au plus récent
+        self._cache: 'OrderedDict[Tuple[str, str], Tuple[LogAnomalyDetector, int]]' = OrderedDict()
+        self._memory = 0
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+        self._latest: Dict[str, Tuple[str, float]] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'load_errors': 0,
+                       'evictions': 0, 'load_seconds': 0.0}
+
+    def get(self, service: str, version: Optional[str] = None) -> LogAnomalyDetector:
+        """
+        Détecteur d'un service, chargé si absent du cache
+
+        Args:
+            service: Nom du service
+            version: Version de l'artefact (None = la plus récente)
+
+        Returns:
+            Détecteur entraîné, partagé entre les appelants
+        """
+        key = (service, version or self.latest_version(service))
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[0]
+            self._stats['misses'] += 1
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Chargement hors du verrou global : les autres clés restent servies
+        with load_lock:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    # Chargé entre-temps par un autre thread
+                    self._cache.move_to_end(key)
+                    return entry[0]
+            try:
+                detector, size = self._load(*key)
+                with self._lock:
+                    self._insert(key, detector, size)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return detector
+
+    def _load(self, service: str, version: str) -> Tuple[LogAnomalyDetector, int]:
+        path = self.artifact_path(service, version)
+        start = time.perf_counter()
+        try:
+            detector = self.loader(path)
+        except Exception:
+            with self._lock:
+                self._stats['load_errors'] += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats['loads'] += 1
+            self._stats['load_seconds'] += elapsed
+        logger.info(f"Modèle {service}/{version} chargé en {elapsed * 1000:.1f} ms")
+        return detector, _artifact_size(path)
+
+    def _load_detector(self, path: Path) -> LogAnomalyDetector:
+        detector = LogAnomalyDetector()
+        detector.load_model(str(path), mmap=self.mmap)
+        return detector
+
+    def _insert(self, key: Tuple[str, str], detector: LogAnomalyDetector, size: int):
+        """Ajoute un détecteur au cache puis évince les plus froids (verrou tenu)"""
+        self._cache[key] = (detector, size)
+        self._memory += size
+        while self._memory > self.memory_budget and len(self._cache) > 1:
+            cold_key, (_, cold_size) = self._cache.popitem(last=False)
+            self._memory -= cold_size
+            self._stats['evictions'] += 1
+            logger.info(f"Modèle {cold_key[0]}/{cold_key[1]} évincé du cache")
+        if self._memory > self.memory_budget:
+            logger.warning(f"Le modèle {key[0]}/{key[1]} ({size} octets) dépasse "
+                           f"à lui seul le budget du cache ({self.memory_budget} octets)")
+
+    def artifact_path(self, service: str, version: str) -> Path:
+        """Chemin de l'artefact d'une version (répertoire compact ou fichier joblib)"""
+        for name in (service, version):
+            if not NAME_PATTERN.match(name):
+                raise ValueError(f"Nom de service ou de version invalide: {name!r}")
+        directory = self.root / service / version
+        if directory.is_dir():
+            return directory
+        joblib_file = self.root / service / f'{version}.joblib'
+        if joblib_file.is_file():
+            return joblib_file
+        raise KeyError(f"Aucun artefact pour {service}/{version} dans {self.root}")
+
+    def versions(self, service: str) -> List[str]:
+        """Versions disponibles d'un service, de la plus ancienne à la plus récente"""
+        if not NAME_PATTERN.match(service):
+            raise ValueError(f"Nom de service invalide: {service!r}")
+        directory = self.root / service
+        if not directory.is_dir():
+            return []
+        # Les répertoires temporaires de register commencent par un point
+        names = {child.name[:-len('.joblib')] if child.suffix == '.joblib' else child.name
+                 for child in directory.iterdir()
+                 if (child.is_dir() or child.suffix == '.joblib') and NAME_PATTERN.match(child.name)}
+        return sorted(names, key=_natural_key)
+
+    def latest_version(self, service: str) -> str:
+        """Version la plus récente d'un service (résolution mise en cache latest_ttl secondes)"""
+        now = self.clock()
+        with self._lock:
+            cached = self._latest.get(service)
+        if cached is not None and now - cached[1] < self.latest_ttl:
+            return cached[0]
+
+        versions = self.versions(service)
+        if not versions:
+            raise KeyError(f"Aucun modèle enregistré pour le service {service!r}")
+        with self._lock:
+            self._latest[service] = (versions[-1], now)
+        return versions[-1]
+
+    def services(self) -> List[str]:
+        """Services ayant au moins un répertoire dans le registre"""
+        if not self.root.is_dir():
+            return []
+        return sorted(child.name for child in self.root.iterdir() if child.is_dir())
+
+    def register(self, service: str, detector: LogAnomalyDetector,
+                 version: Optional[str] = None, compact: bool = True) -> str:
+        """
+        Sauvegarde un détecteur entraîné comme nouvelle version d'un service
+
+        L'artefact est écrit dans un répertoire temporaire voisin puis mis en
+        place par renommage : une version réenregistrée remplace l'ancienne
+        sans réécrire ses fichiers, que les détecteurs en cache peuvent encore
+        mapper en mémoire (les anciens fichiers sont supprimés, pas tronqués).
+
+        Args:
+            service: Nom du service
+            detector: Détecteur entraîné
+            version: Nom de version (horodatage AAAAMMJJHHMMSS par défaut)
+            compact: Format compact (sinon joblib)
+
+        Returns:
+            Version enregistrée
+        """
+        version = version or datetime.now().strftime('%Y%m%d%H%M%S')
+        for name in (service, version):
+            if not NAME_PATTERN.match(name):
+                raise ValueError(f"Nom de service ou de version invalide: {name!r}")
+        directory = self.root / service
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / version if compact else directory / f'{version}.joblib'
+        staging = Path(tempfile.mkdtemp(prefix=f'.{version}.', dir=directory))
+        try:
+            staged = staging / target.name
+            detector.save_model(str(staged), compact=compact)
+            if compact and target.is_dir():
+                # Un répertoire non vide ne peut pas être remplacé : l'ancien est d'abord écarté
+                os.replace(target, staging / 'replaced')
+            os.replace(staged, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        with self._lock:
+            # Une version réécrite doit être rechargée ; la dernière version est à relire
+            self._drop((service, version))
+            self._latest.pop(service, None)
+        return version
+
+    def evict(self, service: str, version: Optional[str] = None):
+        """Retire du cache une version d'un service, ou toutes ses versions"""
+        with self._lock:
+            keys = [key for key in self._cache
+                    if key[0] == service and (version is None or key[1] == version)]
+            for key in keys:
+                self._drop(key)
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._cache.clear()
+            self._memory = 0
+            self._latest.clear()
+
+    def _drop(self, key: Tuple[str, str]):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._memory -= entry[1]
+
+    def stats(self) -> Dict:
+        """Taux de succès du cache, chargements, évictions et mémoire occupée"""
+        with self._lock:
+            stats = dict(self._stats)
+            requests = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+            stats['miss_rate'] = stats['misses'] / requests if requests else 0.0
+            stats['cached_models'] = len(self._cache)
+            stats['memory_bytes'] = self._memory
+            stats['memory_budget_bytes'] = self.memory_budget
+            return stats
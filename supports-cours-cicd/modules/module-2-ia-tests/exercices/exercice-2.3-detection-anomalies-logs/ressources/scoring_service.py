@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Service de scoring temps réel autour de LogAnomalyDetector
+Regroupe les requêtes concurrentes en micro-lots traités par un seul appel à predict
+"""
+
+import argparse
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+import numpy as np
+from flask import Flask, Response, jsonify, request
+
+from alerting import AlertManager, FileSink, WebhookSink
+from anomaly_detector import LogAnomalyDetector, PredictionResults
+from model_registry import ModelRegistry
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Regroupe les demandes de scoring arrivant dans une même fenêtre de temps
+
+    Un thread unique consomme la file : il attend la première demande, puis
+    accumule celles qui arrivent pendant batch_window secondes (ou jusqu'à
+    max_batch_size entrées) et les score en un seul appel à predict par
+    détecteur (celui du service, pour les demandes soumises avec un
+    détecteur du registre). Une erreur pendant un lot est transmise aux
+    demandes de ce lot ; le thread continue de servir les suivantes.
+    """
+
+    # Attente maximale d'une demande par défaut (s)
+    DEFAULT_TIMEOUT = 30.0
+
+    def __init__(self, detector: LogAnomalyDetector, batch_window: float = 0.005,
+                 max_batch_size: int = 1000, latency_history: int = 10000,
+                 alert_manager: Optional[AlertManager] = None):
+        """
+        Initialise le micro-batcher
+
+        Args:
+            detector: Détecteur entraîné, gardé en mémoire
+            batch_window: Durée maximale d'attente d'un lot en secondes
+            max_batch_size: Nombre maximal d'entrées par appel à predict
+            latency_history: Nombre de latences conservées pour les percentiles
+            alert_manager: Gestionnaire d'alertes alimenté par chaque lot scoré
+        """
+        if not detector.is_trained:
+            raise ValueError("Le détecteur doit être entraîné avant le démarrage du service")
+
+        self.detector = detector
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.alert_manager = alert_manager
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_history)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._entries = 0
+        self._batches = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, entries: List[Dict], detector: Optional[LogAnomalyDetector] = None) -> Future:
+        """
+        Soumet des entrées de logs au scoring
+
+        Args:
+            entries: Entrées de logs d'une requête
+            detector: Détecteur à utiliser (celui du micro-batcher par défaut)
+
+        Returns:
+            Future résolue avec les prédictions de ces entrées (PredictionResults)
+        """
+        future = Future()
+        # Refusé ici plutôt que dans le thread de traitement
+        if not isinstance(entries, list):
+            raise TypeError(f"Liste d'entrées attendue, reçu {type(entries).__name__}")
+        with self._lock:
+            # Sous verrou : aucune demande ne peut suivre le signal d'arrêt dans la file
+            if not self._running:
+                raise RuntimeError("Le micro-batcher est arrêté")
+            self._queue.put((entries, future, time.perf_counter(), detector or self.detector))
+        return future
+
+    def score(self, entries: List[Dict], timeout: Optional[float] = DEFAULT_TIMEOUT,
+              detector: Optional[LogAnomalyDetector] = None) -> PredictionResults:
+        """
+        Soumet des entrées et attend leurs prédictions
+
+        Raises:
+            concurrent.futures.TimeoutError: Pas de résultat après timeout secondes
+        """
+        return self.submit(entries, detector).result(timeout=timeout)
+
+    def close(self):
+        """Arrête le thread de traitement après le lot en cours"""
+        with self._lock:
+            self._running = False
+            self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict:
+        """Statistiques de latence (ms) et de remplissage des lots"""
+        with self._lock:
+            latencies = np.array(self._latencies)
+            stats = {
+                'requests': self._requests,
+                'entries': self._entries,
+                'batches': self._batches,
+                'mean_batch_size': self._entries / self._batches if self._batches else 0.0
+            }
+
+        if len(latencies):
+            stats['latency_p50_ms'] = float(np.percentile(latencies, 50) * 1000)
+            stats['latency_p99_ms'] = float(np.percentile(latencies, 99) * 1000)
+        else:
+            stats['latency_p50_ms'] = stats['latency_p99_ms'] = 0.0
+        return stats
+
+    def _run(self):
+        """Boucle de traitement des micro-lots"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            pending = [item]
+            try:
+                size = len(item[0])
+                deadline = time.perf_counter() + self.batch_window
+                while size < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._running = False
+                        break
+                    pending.append(item)
+                    size += len(item[0])
+
+                self._process(pending)
+            except Exception as e:
+                # Le thread ne doit pas mourir : les demandes sans réponse reçoivent l'erreur
+                logger.exception(f"Échec du traitement d'un micro-lot: {e}")
+                for _, future, _, _ in pending:
+                    if not future.done():
+                        future.set_exception(e)
+            if not self._running:
+                return
+
+    def _process(self, pending: List):
+        """Score un micro-lot, un appel à predict par détecteur"""
+        groups: Dict[int, List] = {}
+        for item in pending:
+            groups.setdefault(id(item[3]), []).append(item)
+        for group in groups.values():
+            self._score_group(group[0][3], group)
+        with self._lock:
+            self._batches += 1
+
+    def _score_group(self, detector: LogAnomalyDetector, pending: List):
+        """
+        Score les demandes d'un même détecteur et répartit les résultats
+
+        Les résultats sont attribués par position d'entrée (PredictionResults.rows) :
+        une entrée écartée à l'extraction ne décale pas celles des autres demandes.
+        """
+        batch = [entry for entries, _, _, _ in pending for entry in entries]
+        try:
+            results = detector.predict(batch, as_columns=True)
+        except Exception as e:
+            # Une demande invalide ne doit pas faire échouer les autres
+            logger.warning(f"Échec du scoring groupé, repli demande par demande: {e}")
+            results = None
+
+        if results is not None:
+            # Première ligne de résultat de chaque demande (rows est croissant)
+            starts = np.cumsum([0] + [len(entries) for entries, _, _, _ in pending])
+            bounds = np.searchsorted(results.rows, starts)
+        for k, (entries, future, submitted_at, _) in enumerate(pending):
+            try:
+                if results is not None:
+                    rows = slice(bounds[k], bounds[k + 1])
+                    entry_results = PredictionResults(entries, results.anomaly_score[rows],
+                                                      results.rows[rows] - starts[k])
+                else:
+                    entry_results = detector.predict(entries, as_columns=True)
+                    self._alert(entry_results)
+                future.set_result(entry_results)
+            except Exception as e:
+                future.set_exception(e)
+            self._record(len(entries), time.perf_counter() - submitted_at)
+
+        if results is not None:
+            self._alert(results)
+
+    def _alert(self, results):
+        """Transmet un lot scoré aux alertes (envoi asynchrone, jamais bloquant)"""
+        if self.alert_manager is None or not len(results):
+            return
+        try:
+            self.alert_manager.process(results)
+        except Exception as e:
+            logger.warning(f"Échec du traitement des alertes: {e}")
+
+    def _record(self, n_entries: int, latency: float):
+        """Enregistre la latence d'une demande"""
+        with self._lock:
+            self._requests += 1
+            self._entries += n_entries
+            self._latencies.append(latency)
+
+def _parse_entries(payload) -> Optional[List[Dict]]:
+    """Entrées d'un corps JSON : une entrée, une liste ou {'logs': [...]} (None si invalide)"""
+    if isinstance(payload, dict):
+        payload = payload.get('logs', [payload])
+    if isinstance(payload, list) and all(isinstance(entry, dict) for entry in payload):
+        return payload
+    return None
+
+def _json_value(value):
+    """Valeur sérialisable telle quelle en JSON (None et NaN -> null)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def _serialize(results: PredictionResults) -> List[Dict]:
+    """
+    Réponse JSON de /score : un élément par entrée soumise, dans l'ordre
+
+    Les entrées écartées à l'extraction (horodatage absent avec la politique
+    'drop', entrée invalide) ont des scores null.
+    """
+    now = datetime.now().isoformat()
+    response = [
+        {
+            'is_anomaly': None,
+            'anomaly_score': None,
+            'confidence': None,
+            'timestamp': _json_value(entry.get('timestamp', now))
+        }
+        for entry in results.log_entries
+    ]
+    for row, is_anomaly, score, confidence in zip(
+        results.rows.tolist(), results.is_anomaly.tolist(),
+        results.anomaly_score.tolist(), results.confidence.tolist()
+    ):
+        response[row].update(is_anomaly=is_anomaly, anomaly_score=score, confidence=confidence)
+    return response
+
+def create_app(detector: LogAnomalyDetector, batch_window: float = 0.005,
+               max_batch_size: int = 1000, alert_manager: Optional[AlertManager] = None,
+               registry: Optional[ModelRegistry] = None,
+               request_timeout: float = MicroBatcher.DEFAULT_TIMEOUT) -> Flask:
+    """
+    Crée l'application Flask de scoring
+
+    Args:
+        detector: Détecteur entraîné
+        batch_window: Fenêtre de regroupement des requêtes en secondes
+        max_batch_size: Nombre maximal d'entrées par appel à predict
+        alert_manager: Gestionnaire d'alertes optionnel
+        registry: Registre de modèles par service (route /score/<service>)
+        request_timeout: Attente maximale d'un résultat de scoring (504 au-delà)
+
+    Returns:
+        Application Flask (le micro-batcher est accessible via app.config['BATCHER'])
+    """
+    app = Flask(__name__)
+    batcher = MicroBatcher(detector, batch_window=batch_window, max_batch_size=max_batch_size,
+                           alert_manager=alert_manager)
+    app.config['BATCHER'] = batcher
+
+    def scored_response(entries: List[Dict], service_detector: Optional[LogAnomalyDetector] = None):
+        try:
+            results = batcher.score(entries, timeout=request_timeout, detector=service_detector)
+        except FutureTimeoutError:
+            return jsonify({'error': f"Aucun résultat après {request_timeout} s"}), 504
+        except RuntimeError as e:
+            # Micro-batcher arrêté
+            return jsonify({'error': str(e)}), 503
+        except Exception as e:
+            return jsonify({'error': str(e)}), 422
+        return jsonify(_serialize(results))
+
+    @app.route('/score', methods=['POST'])
+    def score():
+        entries = _parse_entries(request.get_json(silent=True))
+        if entries is None:
+            return jsonify({'error': "Corps JSON attendu: une entrée, une liste ou {'logs': [...]}"}), 400
+
+        return scored_response(entries)
+
+    @app.route('/score/<service>', methods=['POST'])
+    def score_service(service):
+        # Détecteur propre au service, servi par le cache du registre ; les
+        # demandes passent par le même micro-batcher (lots et alertes) que /score
+        if registry is None:
+            return jsonify({'error': "Aucun registre de modèles configuré (--registry)"}), 404
+        entries = _parse_entries(request.get_json(silent=True))
+        if entries is None:
+            return jsonify({'error': "Corps JSON attendu: une entrée, une liste ou {'logs': [...]}"}), 400
+
+        try:
+            service_detector = registry.get(service, request.args.get('version'))
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 404
+        return scored_response(entries, service_detector)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        stats = batcher.stats()
+        if alert_manager is not None:
+            stats['alerts'] = alert_manager.stats()
+        if registry is not None:
+            stats['registry'] = registry.stats()
+        return jsonify(stats)
+
+    @app.route('/metrics/prometheus', methods=['GET'])
+    def prometheus_metrics():
+        # Métriques par étape du détecteur (vides si l'instrumentation est désactivée)
+        return Response(detector.instrumentation.to_prometheus(),
+                        mimetype='text/plain; version=0.0.4')
+
+    @app.route('/drift', methods=['GET'])
+    def drift():
+        # Dérive des features scorées depuis le démarrage ou le dernier ?reset=1
+        report = detector.drift_report(psi_threshold=request.args.get('psi_threshold', 0.2, type=float))
+        if request.args.get('reset') == '1':
+            detector.reset_drift()
+        return jsonify(report)
+
+    @app.route('/health', methods=['GET'])
+    def health():
+        return jsonify({'status': 'ok', 'features': len(detector.feature_columns)})
+
+    return app
+
+def main():
+    """Démarre le service de scoring sur un modèle sauvegardé"""
+    parser = argparse.ArgumentParser(description="Service de scoring d'anomalies en temps réel")
+    parser.add_argument('--model', required=True, help="Modèle sauvegardé par save_model")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-window-ms', type=float, default=5.0)
+    parser.add_argument('--max-batch-size', type=int, default=1000)
+    parser.add_argument('--request-timeout', type=float, default=MicroBatcher.DEFAULT_TIMEOUT,
+                        help="Attente maximale d'un résultat de scoring en secondes (504 au-delà)")
+    parser.add_argument('--alert-file', help="Fichier JSON-lines recevant les alertes")
+    parser.add_argument('--alert-webhook', help="URL de webhook (Slack entrant ou équivalent)")
+    parser.add_argument('--dedup-window', type=float, default=300.0,
+                        help="Fenêtre de déduplication des alertes en secondes")
+    parser.add_argument('--registry', help="Répertoire de modèles par service (route /score/<service>)")
+    parser.add_argument('--registry-budget-mb', type=float, default=512.0,
+                        help="Budget mémoire du cache de modèles du registre")
+    parser.add_argument('--instrument', choices=['off', 'time', 'memory'], default='off',
+                        help="Métriques par étape sur /metrics/prometheus "
+                             "(memory ajoute le pic mémoire, plus coûteux : requêtes sérialisées)")
+    args = parser.parse_args()
+
+    detector = LogAnomalyDetector()
+    detector.load_model(args.model)
+    if args.instrument != 'off':
+        detector.instrumentation.enable(trace_memory=args.instrument == 'memory')
+
+    sinks = []
+    if args.alert_file:
+        sinks.append(FileSink(args.alert_file))
+    if args.alert_webhook:
+        sinks.append(WebhookSink(args.alert_webhook))
+    alert_manager = None
+    if sinks:
+        alert_manager = AlertManager(sinks, scanner=detector.pattern_scanner,
+                                     dedup_window=args.dedup_window)
+
+    registry = None
+    if args.registry:
+        registry = ModelRegistry(args.registry, memory_budget_mb=args.registry_budget_mb)
+
+    app = create_app(detector, batch_window=args.batch_window_ms / 1000.0,
+                     max_batch_size=args.max_batch_size, alert_manager=alert_manager,
+                     registry=registry, request_timeout=args.request_timeout)
+    logger.info(f"Service de scoring démarré sur http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == "__main__":
+    main()
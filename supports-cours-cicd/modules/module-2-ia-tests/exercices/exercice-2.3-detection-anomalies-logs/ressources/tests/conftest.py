@@ -0,0 +1,34 @@
+"""
+Configuration pytest des tests de l'exercice
+
+Lancement :
+    pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+RESSOURCES_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RESSOURCES_DIR))
+# Références figées partagées avec les benchmarks (reference_features)
+sys.path.insert(1, str(RESSOURCES_DIR / 'benchmarks'))
+
+
+@pytest.fixture(scope='session')
+def logs():
+    """Logs synthétiques reproductibles"""
+    from log_generator import SyntheticLogGenerator
+
+    return SyntheticLogGenerator(seed=1).generate(2000)[0]
+
+
+@pytest.fixture(scope='session')
+def trained_detector(logs):
+    """Détecteur entraîné une fois pour toute la session"""
+    from anomaly_detector import LogAnomalyDetector
+
+    detector = LogAnomalyDetector()
+    detector.train(logs)
+    return detector
@@ -0,0 +1,46 @@
+"""Tests de l'extraction vectorisée des features (équivalence avec l'original, débordements)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomaly_detector import LogAnomalyDetector, LogColumns
+from reference_features import extract_features_original
+
+
+def test_matches_original_extraction(logs):
+    pd.testing.assert_frame_equal(extract_features_original(logs), LogAnomalyDetector().extract_features(logs))
+
+
+def test_atypical_entries_match_original(logs):
+    entries = [dict(entry) for entry in logs[:6]]
+    entries[0]['status_code'] = '404'
+    entries[1]['response_time'] = 'lent'
+    entries[2]['request_size'] = 12.5
+    entries[3]['method'] = 'post'
+    entries[4]['message'] = 'Unhandled EXCEPTION: drop table users'
+    features = LogAnomalyDetector().extract_features(entries)
+    # L'entrée écartée ne décale pas les autres : index = position d'origine
+    assert features.index.tolist() == [0, 2, 3, 4, 5]
+    pd.testing.assert_frame_equal(extract_features_original(entries), features.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('field, value', [
+    ('request_size', 10 ** 20),
+    ('response_size', 2 ** 62 + 1),
+    ('status_code', -2 ** 63),
+])
+def test_large_integers_are_not_wrapped(logs, field, value):
+    entries = [dict(entry) for entry in logs[:5]]
+    entries[2][field] = value
+    features = LogAnomalyDetector().extract_features(entries)
+    assert features[field].iloc[2] == value
+    pd.testing.assert_frame_equal(extract_features_original(entries), features)
+
+
+def test_large_integers_from_typed_columns(logs):
+    columns = LogColumns({
+        'timestamp': [entry['timestamp'] for entry in logs[:3]],
+        'request_size': np.array([1, 2 ** 62 + 1, 3], dtype=np.int64),
+    })
+    assert LogAnomalyDetector().extract_features(columns)['request_size'].tolist() == [1, 2 ** 62 + 1, 3]
@@ -0,0 +1,41 @@
+"""Tests du registre d'instrumentation (étapes concurrentes, suivi mémoire optionnel)"""
+
+import threading
+
+from instrumentation import Instrumentation
+
+
+def test_stages_of_concurrent_threads_overlap():
+    instrumentation = Instrumentation(enabled=True)
+    assert not instrumentation.trace_memory
+    # Les deux étapes doivent être ouvertes en même temps (aucun verrou global)
+    barrier = threading.Barrier(2, timeout=5)
+    errors = []
+
+    def work():
+        try:
+            with instrumentation.stage('service', 'scoring', rows=1):
+                barrier.wait()
+        except threading.BrokenBarrierError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    metrics = instrumentation.snapshot()['service']['scoring']
+    assert metrics['calls'] == 2 and metrics['peak_memory_bytes'] == 0
+
+
+def test_memory_tracing_on_demand():
+    instrumentation = Instrumentation()
+    instrumentation.enable(trace_memory=True)
+    try:
+        with instrumentation.stage('service', 'allocation'):
+            block = bytearray(1 << 20)
+        del block
+    finally:
+        instrumentation.disable()
+    assert instrumentation.snapshot()['service']['allocation']['peak_memory_bytes'] >= 1 << 20
@@ -0,0 +1,53 @@
+"""Tests du générateur de logs synthétiques (reproductibilité, taux et mélange d'anomalies)"""
+
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from log_generator import ANOMALY_KINDS, SyntheticLogGenerator
+
+
+def test_same_seed_same_logs():
+    first, first_labels = SyntheticLogGenerator(seed=7).generate(500)
+    second, second_labels = SyntheticLogGenerator(seed=7).generate(500)
+    assert first == second
+    np.testing.assert_array_equal(first_labels, second_labels)
+
+
+def test_anomaly_rate_and_mix():
+    logs, labels = SyntheticLogGenerator(anomaly_rate=0.2, attack_mix={'xss': 3, 'latency_spike': 1},
+                                         seed=3).generate(20000)
+    assert set(labels) == {'normal', 'xss', 'latency_spike'}
+    assert np.mean(labels != 'normal') == pytest.approx(0.2, abs=0.01)
+    assert np.sum(labels == 'xss') / np.sum(labels != 'normal') == pytest.approx(0.75, abs=0.03)
+    for entry, label in zip(logs, labels):
+        if label == 'xss':
+            assert entry['message'] == ANOMALY_KINDS['xss']['message']
+        elif label == 'latency_spike':
+            assert entry['response_time'] >= 8000
+
+
+def test_successive_batches_form_a_stream():
+    generator = SyntheticLogGenerator(seed=1)
+    first, _ = generator.generate(100)
+    second, _ = generator.generate(100)
+    assert first[-1]['timestamp'] <= second[0]['timestamp']
+
+
+def test_write_counts_match_file(tmp_path):
+    path = tmp_path / 'logs.jsonl.gz'
+    counts = SyntheticLogGenerator(seed=5).write(path, 2500, chunk_size=1000)
+    assert sum(counts.values()) == 2500
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 2500
+
+
+@pytest.mark.parametrize('kwargs', [{'anomaly_rate': 1.5}, {'rate': 0}, {'attack_mix': {'unknown': 1}},
+                                    {'attack_mix': {'xss': 0}}])
+def test_invalid_settings_rejected(kwargs):
+    with pytest.raises(ValueError):
+        SyntheticLogGenerator(**kwargs)
@@ -0,0 +1,42 @@
+"""Tests de l'extraction répartie entre processus (mêmes résultats qu'en série)"""
+
+import joblib
+import pandas as pd
+import pytest
+
+from anomaly_detector import LogAnomalyDetector, LogColumns
+
+
+@pytest.fixture
+def gapped_logs(logs):
+    """40 entrées sans horodatage en tête, en début de tranche et sur une tranche entière"""
+    entries = [dict(entry) for entry in logs[:40]]
+    for i in [0, 1, 10, 11, 12] + list(range(20, 30)):
+        del entries[i]['timestamp']
+    return entries
+
+
+@pytest.mark.parametrize('columns', [False, True])
+def test_previous_timestamp_crosses_shards(gapped_logs, monkeypatch, columns):
+    monkeypatch.setattr(LogAnomalyDetector, 'PARALLEL_EXTRACT_MIN_ENTRIES', 10)
+    # Découpage en 4 tranches quel que soit le nombre de cœurs de la machine
+    monkeypatch.setattr(joblib, 'cpu_count', lambda: 4)
+    entries = gapped_logs
+    if columns:
+        entries = LogColumns({field: [entry.get('timestamp') if field == 'timestamp' else entry[field]
+                                      for entry in gapped_logs]
+                              for field in gapped_logs[-1]})
+
+    serial = LogAnomalyDetector(missing_timestamp='previous').extract_features(entries)
+    sharded = LogAnomalyDetector(missing_timestamp='previous', n_jobs=4).extract_features(entries)
+    assert len(serial) == 40
+    pd.testing.assert_frame_equal(serial, sharded)
+
+
+def test_small_worker_counts_stay_serial(logs, monkeypatch):
+    monkeypatch.setattr(LogAnomalyDetector, 'PARALLEL_EXTRACT_MIN_ENTRIES', 10)
+    monkeypatch.setattr(joblib, 'cpu_count', lambda: 4)
+    detector = LogAnomalyDetector(n_jobs=LogAnomalyDetector.PARALLEL_EXTRACT_MIN_WORKERS - 1)
+    monkeypatch.setattr('anomaly_detector._extract_features_worker', None)
+    # Le worker n'est jamais appelé : extraction en série
+    assert len(detector.extract_features(logs[:100])) == 100
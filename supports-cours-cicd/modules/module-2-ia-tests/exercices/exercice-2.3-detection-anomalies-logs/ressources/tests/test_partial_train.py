@@ -0,0 +1,28 @@
+"""Tests de la mise à jour incrémentale du détecteur (scaler figé)"""
+
+import numpy as np
+
+from anomaly_detector import LogAnomalyDetector
+from log_generator import SyntheticLogGenerator
+
+
+def test_partial_train_keeps_scaler_frozen(logs):
+    detector = LogAnomalyDetector(random_state=0)
+    detector.train(logs)
+    mean, scale = detector.scaler.mean_.copy(), detector.scaler.scale_.copy()
+    features = detector._align_features(detector.extract_features(logs[:500]))
+    reference = detector.scaler.transform(features)
+    retained = detector.model.estimators_[-1]
+
+    # Nouvelles données décalées : temps de réponse multipliés par 10
+    drifted = SyntheticLogGenerator(seed=2).generate(1000)[0]
+    for entry in drifted:
+        entry['response_time'] = entry['response_time'] * 10
+    metrics = detector.partial_train(drifted, replace_fraction=0.2)
+
+    assert metrics['replaced_trees'] == 20
+    np.testing.assert_array_equal(detector.scaler.mean_, mean)
+    np.testing.assert_array_equal(detector.scaler.scale_, scale)
+    # Un arbre conservé reçoit les mêmes entrées qu'à son entraînement
+    assert any(tree is retained for tree in detector.model.estimators_)
+    np.testing.assert_array_equal(detector.scaler.transform(features), reference)
@@ -0,0 +1,80 @@
+"""Tests du service de scoring (corps invalides, robustesse du micro-batcher)"""
+
+import time
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip('flask')
+
+from scoring_service import MicroBatcher, _parse_entries, create_app  # noqa: E402
+
+
+@pytest.fixture
+def client(trained_detector):
+    app = create_app(trained_detector, batch_window=0.001)
+    yield app.test_client()
+    app.config['BATCHER'].close()
+
+
+@pytest.mark.parametrize('payload', [
+    {'logs': 5},
+    {'logs': 'GET /'},
+    {'logs': [1, 2]},
+    [{'url': '/'}, 'texte'],
+    5,
+    'texte',
+])
+def test_parse_entries_rejects_malformed_payloads(payload):
+    assert _parse_entries(payload) is None
+
+
+def test_parse_entries_accepts_entry_list_and_logs(logs):
+    assert _parse_entries(logs[0]) == [logs[0]]
+    assert _parse_entries(logs[:3]) == logs[:3]
+    assert _parse_entries({'logs': logs[:3]}) == logs[:3]
+
+
+@pytest.mark.parametrize('payload', [{'logs': 5}, [1, 2], 'texte'])
+def test_malformed_payload_returns_400_and_service_keeps_working(client, logs, payload):
+    assert client.post('/score', json=payload).status_code == 400
+    response = client.post('/score', json={'logs': logs[:5]})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 5
+
+
+def test_batcher_survives_failing_batch(trained_detector, logs):
+    batcher = MicroBatcher(trained_detector, batch_window=0.001)
+    try:
+        # Élément invalide injecté directement dans la file : len() échoue dans le thread
+        broken = Future()
+        batcher._queue.put((5, broken, time.perf_counter(), trained_detector))
+        with pytest.raises(TypeError):
+            broken.result(timeout=5)
+        assert len(batcher.score(logs[:10], timeout=5)) == 10
+    finally:
+        batcher.close()
+
+
+def test_submit_rejects_non_list(trained_detector):
+    batcher = MicroBatcher(trained_detector)
+    try:
+        with pytest.raises(TypeError):
+            batcher.submit(5)
+    finally:
+        batcher.close()
+
+
+def test_slow_scoring_returns_504(trained_detector, logs, monkeypatch):
+    app = create_app(trained_detector, batch_window=0.001, request_timeout=0.05)
+    predict = trained_detector.predict
+
+    def slow_predict(*args, **kwargs):
+        time.sleep(0.3)
+        return predict(*args, **kwargs)
+
+    monkeypatch.setattr(trained_detector, 'predict', slow_predict)
+    try:
+        assert app.test_client().post('/score', json=logs[:3]).status_code == 504
+    finally:
+        app.config['BATCHER'].close()
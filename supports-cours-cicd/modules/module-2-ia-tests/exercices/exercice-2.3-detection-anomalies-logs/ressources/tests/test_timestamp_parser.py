@@ -0,0 +1,46 @@
+"""Tests de TimestampParser (lots de formats mélangés, unités d'epoch)"""
+
+import pandas as pd
+import pytest
+
+from anomaly_detector import TimestampParser
+
+INSTANT = pd.Timestamp('2024-01-15T10:30:00Z').value
+
+MIXED = [
+    '2024-01-15T10:30:00Z',
+    1705314600,
+    1705314600.0,
+    '1705314600',
+    1705314600000,
+    '15/Jan/2024:10:30:00 +0000',
+    '20240115103000',
+]
+
+
+@pytest.mark.parametrize('values', [MIXED, MIXED[::-1], MIXED[1:] + MIXED[:1]],
+                         ids=['ordre', 'inverse', 'epoch en tête'])
+def test_mixed_batch_is_order_independent(values):
+    utc, local, ok = TimestampParser().parse(values)
+    assert ok.all()
+    assert (utc == INSTANT).all()
+    assert (local == INSTANT).all()
+
+
+def test_iso_then_epoch_is_not_read_as_nanoseconds():
+    utc, _, _ = TimestampParser().parse(['2024-01-15T10:30:00Z', 1705314600])
+    assert pd.Timestamp(utc[1]).hour == 10
+    utc_reversed, _, _ = TimestampParser().parse([1705314600, '2024-01-15T10:30:00Z'])
+    assert utc_reversed[0] == utc[1]
+
+
+def test_epoch_unit_is_per_value():
+    utc, _, ok = TimestampParser().parse([1705314600, 1705314600123, 1705314600123456])
+    assert ok.all()
+    assert utc.tolist() == [INSTANT, INSTANT + 123 * 10**6, INSTANT + 123456 * 10**3]
+
+
+def test_compact_dates_are_not_epochs():
+    utc, _, ok = TimestampParser().parse([1705314600, '20240115'])
+    assert ok.all()
+    assert utc[1] == pd.Timestamp('2024-01-15').value
@@ -13,6 +13,9 @@ from pathlib import Path
 import logging
 from datetime import datetime
 
+# Instrumentation par étape (module instrumentation.py des ressources)
+from instrumentation import Instrumentation, default_instrumentation
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -104,13 +107,19 @@ class SpecificationParser:
 class TestGenerator:
     """Générateur principal de cas de test"""
     
-    def __init__(self, config_path: str = "config.yaml"):
+    # Nom du composant dans les métriques d'instrumentation
+    COMPONENT = 'test_generator'
+    
+    def __init__(self, config_path: str = "config.yaml",
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Initialise le générateur
         
         Args:
             config_path: Chemin vers le fichier de configuration
+            instrumentation: Registre des métriques par étape (default_instrumentation par défaut)
         """
+        self.instrumentation = instrumentation or default_instrumentation
         self.config = self._load_config(config_path)
         self.parser = SpecificationParser()
         self.templates = self._load_templates()
@@ -202,22 +211,25 @@ def test_{endpoint_name}_{test_type}():
             spec_content = f.read()
         
         # Parse de la spécification
-        parsed_spec = self.parser.parse_specification(spec_content)
+        with self._stage('parse_specification', rows=spec_content.count('\n') + 1):
+            parsed_spec = self.parser.parse_specification(spec_content)
         
         # Génération des tests
         test_cases = []
         
-        # Tests basés sur les user stories
-        for story in parsed_spec['user_stories']:
-            test_cases.extend(self._generate_tests_from_user_story(story, parsed_spec))
-        
-        # Tests basés sur les endpoints API
-        for endpoint in parsed_spec['api_endpoints']:
-            test_cases.extend(self._generate_api_tests(endpoint, parsed_spec))
-        
-        # Tests basés sur les critères d'acceptation
-        for criterion in parsed_spec['acceptance_criteria']:
-            test_cases.extend(self._generate_tests_from_criterion(criterion, parsed_spec))
+        with self._stage('generate_tests') as stage:
+            # Tests basés sur les user stories
+            for story in parsed_spec['user_stories']:
+                test_cases.extend(self._generate_tests_from_user_story(story, parsed_spec))
+            
+            # Tests basés sur les endpoints API
+            for endpoint in parsed_spec['api_endpoints']:
+                test_cases.extend(self._generate_api_tests(endpoint, parsed_spec))
+            
+            # Tests basés sur les critères d'acceptation
+            for criterion in parsed_spec['acceptance_criteria']:
+                test_cases.extend(self._generate_tests_from_criterion(criterion, parsed_spec))
+            stage.set_rows(len(test_cases))
         
         logger.info(f"Génération terminée: {len(test_cases)} tests créés")
         return test_cases
@@ -387,12 +399,18 @@ def test_{endpoint_name}_{test_type}():
             output_path: Chemin de sortie
             format_type: Format d'export (pytest, unittest, etc.)
         """
-        if format_type == 'pytest':
-            self._export_pytest(test_cases, output_path)
-        elif format_type == 'json':
-            self._export_json(test_cases, output_path)
-        else:
+        if format_type not in ('pytest', 'json'):
             raise ValueError(f"Format {format_type} non supporté")
+        
+        with self._stage('export_tests', rows=len(test_cases)):
+            if format_type == 'pytest':
+                self._export_pytest(test_cases, output_path)
+            else:
+                self._export_json(test_cases, output_path)
+    
+    def _stage(self, name: str, rows: Optional[int] = None):
+        """Mesure d'une étape du pipeline (sans effet si l'instrumentation est désactivée)"""
+        return self.instrumentation.stage(self.COMPONENT, name, rows)
     
     def _export_pytest(self, test_cases: List[TestCase], output_path: str):
         """Exporte au format pytest"""
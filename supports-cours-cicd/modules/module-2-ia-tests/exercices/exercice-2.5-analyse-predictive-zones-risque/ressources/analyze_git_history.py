@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Analyse de l'historique Git pour RiskPredictor
+Calcule par fichier commit_count, author_count, lines_added, lines_deleted,
+file_age_days et bug_count en une seule lecture en flux de git log --numstat,
+puis seulement sur les nouveaux commits grâce au cache du dernier commit vu
+"""
+
+import argparse
+import json
+import logging
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sujets de commits considérés comme des corrections de bugs
+BUG_FIX_PATTERN = r'\b(fix(e[sd])?|bug(fix)?s?|hotfix|corrig\w*|correction|defect|crash|regression)\b'
+
+# Séparateurs du format de git log : début d'en-tête de commit, champs de l'en-tête
+_COMMIT_MARK = b'\x1e'
+_FIELD_SEP = b'\x1f'
+_LOG_FORMAT = '--format=%x1e%H%x1f%at%x1f%aE%x1f%s'
+
+# Taille des blocs lus sur la sortie de git log
+_READ_SIZE = 1 << 20
+
+# Date de premier commit des fichiers pas encore vus
+_NO_TIME = np.iinfo(np.int64).max
+
+class GitHistoryAnalyzer:
+    """
+    Métriques d'historique par fichier d'un dépôt Git local
+
+    git log --reverse --numstat -z est lu en flux, du plus ancien commit au
+    plus récent, afin que les renommages (-M) transportent l'historique vers
+    le nouveau chemin. Les statistiques sont agrégées dans des tableaux NumPy
+    indexés par fichier (sommes par np.bincount, couples fichier/auteur
+    dédoublonnés par np.unique) ; avec cache_path, ces tableaux et le dernier
+    commit vu sont conservés et une nouvelle exécution ne lit que les
+    commits ajoutés depuis (relecture complète si l'historique a été réécrit).
+    """
+
+    METRIC_COLUMNS = ('commit_count', 'author_count', 'lines_added', 'lines_deleted',
+                      'file_age_days', 'bug_count')
+
+    # Version du format de cache (relecture complète si elle change)
+    CACHE_VERSION = 1
+
+    _ARRAYS = ('commit_count', 'lines_added', 'lines_deleted', 'bug_count',
+               'first_time', 'last_time', 'author_pairs')
+
+    def __init__(self, repo: Union[str, Path] = '.', bug_pattern: str = BUG_FIX_PATTERN,
+                 cache_path: Optional[Union[str, Path]] = None, detect_renames: bool = True):
+        """
+        Initialise l'analyseur
+
+        Args:
+            repo: Répertoire du dépôt Git
+            bug_pattern: Expression régulière (insensible à la casse) des sujets
+                         de commits de correction
+            cache_path: Fichier .npz du cache incrémental (aucun cache si None)
+            detect_renames: Suit les fichiers renommés (git log -M)
+        """
+        self.repo = Path(repo)
+        self.bug_pattern = bug_pattern
+        self._bug_regex = re.compile(bug_pattern, re.IGNORECASE)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.detect_renames = detect_renames
+        self._reset()
+
+    def _reset(self):
+        """État vide : aucun commit lu"""
+        self.last_commit: Optional[str] = None
+        self.commits_seen = 0
+        # Chemin courant de chaque fichier (None quand un renommage l'a remplacé)
+        self.paths: List[Optional[str]] = []
+        self.authors: List[str] = []
+        self._path_index: Dict[bytes, int] = {}
+        self._author_index: Dict[bytes, int] = {}
+        self.commit_count = np.zeros(0, dtype=np.int64)
+        self.lines_added = np.zeros(0, dtype=np.int64)
+        self.lines_deleted = np.zeros(0, dtype=np.int64)
+        self.bug_count = np.zeros(0, dtype=np.int64)
+        self.first_time = np.zeros(0, dtype=np.int64)
+        self.last_time = np.zeros(0, dtype=np.int64)
+        # Couples (fichier << 32) | auteur distincts, triés
+        self.author_pairs = np.zeros(0, dtype=np.int64)
+
+    def _git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        return subprocess.run(['git', '-C', str(self.repo), *args],
+                              capture_output=True, text=True, check=check)
+
+    def head(self) -> Optional[str]:
+        """Commit HEAD du dépôt (None pour un dépôt sans commit)"""
+        result = self._git('rev-parse', '--verify', '-q', 'HEAD', check=False)
+        return result.stdout.strip() or None
+
+    def update(self, full: bool = False) -> int:
+        """
+        Intègre les commits pas encore vus
+
+        Args:
+            full: Ignore le cache et relit tout l'historique
+
+        Returns:
+            Nombre de commits lus
+        """
+        if full:
+            self._reset()
+        elif self.last_commit is None and self.cache_path is not None and self.cache_path.exists():
+            self._load_cache()
+
+        head = self.head()
+        if head is None or head == self.last_commit:
+            return 0
+
+        revision = head
+        if self.last_commit is not None:
+            ancestor = self._git('merge-base', '--is-ancestor', self.last_commit, head, check=False)
+            if ancestor.returncode == 0:
+                revision = f'{self.last_commit}..{head}'
+            else:
+                logger.warning(f"Commit {self.last_commit[:12]} absent de l'historique de HEAD, "
+                               f"relecture complète")
+                self._reset()
+
+        start = time.perf_counter()
+        commits = self._read_log(revision)
+        self.last_commit = head
+        self.commits_seen += commits
+        logger.info(f"{commits} commits lus en {time.perf_counter() - start:.2f}s "
+                    f"({len(self.paths)} fichiers suivis)")
+
+        if self.cache_path is not None:
+            self._save_cache()
+        return commits
+
+    def analyze(self, full: bool = False, reference_time: Optional[float] = None,
+                include_deleted: bool = False) -> pd.DataFrame:
+        """
+        Métriques d'historique de chaque fichier
+
+        Args:
+            full: Ignore le cache et relit tout l'historique
+            reference_time: Horodatage Unix de calcul de l'âge (maintenant par défaut)
+            include_deleted: Garde les fichiers absents de HEAD
+
+        Returns:
+            DataFrame file_path + METRIC_COLUMNS, trié par chemin ; avec
+            set_index('file_path') il alimente directement RiskPredictor
+            (analyze_repository accepte la colonne telle quelle)
+        """
+        self.update(full=full)
+        reference_time = time.time() if reference_time is None else reference_time
+
+        n_files = len(self.paths)
+        author_count = np.bincount(self.author_pairs >> 32, minlength=n_files)
+        keep = np.array([path is not None for path in self.paths], dtype=bool)
+        if not include_deleted and n_files:
+            tracked = self._tracked_files()
+            keep &= np.array([path in tracked for path in self.paths], dtype=bool)
+
+        rows = np.flatnonzero(keep)
+        paths = np.array(self.paths, dtype=object)[rows] if n_files else np.array([], dtype=object)
+        table = pd.DataFrame({
+            'file_path': paths,
+            'commit_count': self.commit_count[rows],
+            'author_count': author_count[rows],
+            'lines_added': self.lines_added[rows],
+            'lines_deleted': self.lines_deleted[rows],
+            'file_age_days': np.maximum((int(reference_time) - self.first_time[rows]) // 86400, 0),
+            'bug_count': self.bug_count[rows],
+        })
+        return table.sort_values('file_path', kind='stable').reset_index(drop=True)
+
+    def analyze_files(self, paths: List[str], reference_time: Optional[float] = None) -> pd.DataFrame:
+        """
+        Métriques d'historique des seuls fichiers paths (ex. fichiers d'une PR)
+
+        Avec un cache (ou un historique déjà lu), mise à jour incrémentale
+        puis sélection ; sinon un git log restreint à ces chemins évite de
+        relire tout le dépôt. La détection des renommages ne voit que les
+        chemins de la sélection : les anciens noms de ces fichiers (voir
+        _rename_sources) y sont ajoutés pour que leur historique soit complet.
+
+        Args:
+            paths: Chemins relatifs à la racine du dépôt
+            reference_time: Horodatage Unix de calcul de l'âge (maintenant par défaut)
+
+        Returns:
+            DataFrame file_path + METRIC_COLUMNS des fichiers ayant un historique
+        """
+        analyzer = self
+        if self.cache_path is None and self.last_commit is None:
+            analyzer = GitHistoryAnalyzer(self.repo, bug_pattern=self.bug_pattern,
+                                          detect_renames=self.detect_renames)
+            head = analyzer.head()
+            if head is not None and paths:
+                selection = sorted(self._rename_sources(head, paths)) if self.detect_renames else paths
+                analyzer._read_log(head, selection)
+                analyzer.last_commit = head
+        table = analyzer.analyze(reference_time=reference_time, include_deleted=True)
+        return table[table['file_path'].isin(set(paths))].reset_index(drop=True)
+
+    def _rename_sources(self, revision: str, paths: List[str]) -> set:
+        """
+        Chemins paths et tous leurs anciens noms dans l'historique de revision
+
+        Un seul git log des renommages (--diff-filter=R, sans statistiques
+        de lignes) ; les chaînes de renommages sont remontées depuis paths.
+        """
+        output = subprocess.run(['git', '--literal-pathspecs', '-C', str(self.repo), 'log', '-M', '-z',
+                                 '--diff-filter=R', '--name-status', '--format=', revision],
+                                capture_output=True, check=True).stdout
+        sources: Dict[str, List[str]] = {}
+        tokens = [token.lstrip(b'\n') for token in output.split(b'\0')]
+        i = 0
+        while i + 2 < len(tokens):
+            if tokens[i].startswith(b'R'):
+                old_path, new_path = (token.decode('utf-8', 'surrogateescape') for token in tokens[i + 1:i + 3])
+                sources.setdefault(new_path, []).append(old_path)
+                i += 3
+            else:
+                i += 1
+
+        selection = set(paths)
+        pending = list(paths)
+        while pending:
+            for old_path in sources.get(pending.pop(), ()):
+                if old_path not in selection:
+                    selection.add(old_path)
+                    pending.append(old_path)
+        return selection
+
+    def _tracked_files(self) -> set:
+        """Fichiers présents dans l'arbre de HEAD"""
+        output = subprocess.run(['git', '-C', str(self.repo), 'ls-tree', '-r', '-z', '--name-only', 'HEAD'],
+                                capture_output=True, check=True).stdout
+        return {path.decode('utf-8', 'surrogateescape') for path in output.split(b'\0') if path}
+
+    def _log_tokens(self, revision: str, paths: Optional[List[str]] = None) -> Iterator[bytes]:
+        """Éléments séparés par NUL de git log, lus en flux"""
+        # Avec des chemins, --full-history garde les commits des branches que la
+        # simplification d'historique écarterait : mêmes commits qu'une lecture complète
+        command = ['git', '--literal-pathspecs', '-C', str(self.repo), 'log', '--reverse', '-z', '--numstat', '--no-color',
+                   '-M' if self.detect_renames else '--no-renames', *(['--full-history'] if paths else []),
+                   _LOG_FORMAT, revision, '--', *(paths or [])]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            tail = b''
+            while True:
+                block = process.stdout.read(_READ_SIZE)
+                if not block:
+                    break
+                tokens = (tail + block).split(b'\0')
+                tail = tokens.pop()
+                yield from tokens
+            if tail:
+                yield tail
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            if process.wait() != 0:
+                raise RuntimeError(f"git log a échoué: {stderr.decode(errors='replace').strip()}")
+
+    def _read_log(self, revision: str, paths: Optional[List[str]] = None) -> int:
+        """
+        Lit les commits de revision (limités à paths) et agrège leurs statistiques
+
+        Le flux n'alimente que des listes d'entiers (une entrée par fichier
+        modifié) ; l'agrégation dans les tableaux se fait ensuite en une fois.
+        """
+        path_index = self._path_index
+        known = self.paths
+        author_index = self._author_index
+        bug_search = self._bug_regex.search
+
+        commit_times: List[int] = []
+        commit_authors: List[int] = []
+        commit_bugs: List[int] = []
+        record_files: List[int] = []
+        record_commits: List[int] = []
+        record_added: List[int] = []
+        record_deleted: List[int] = []
+
+        def file_id(path: bytes) -> int:
+            index = path_index.get(path)
+            if index is None:
+                index = path_index[path] = len(known)
+                known.append(path.decode('utf-8', 'surrogateescape'))
+            return index
+
+        commit = -1
+        rename: Optional[List[bytes]] = None
+        for token in self._log_tokens(revision, paths):
+            if rename is not None:
+                # Renommage : "ajouts\tsuppressions\t" puis ancien et nouveau chemin
+                rename.append(token)
+                if len(rename) < 4:
+                    continue
+                added, deleted, old_path, new_path = rename
+                rename = None
+                index = path_index.pop(old_path, None)
+                if index is None:
+                    index = file_id(new_path)
+                else:
+                    replaced = path_index.get(new_path)
+                    if replaced is not None:
+                        known[replaced] = None
+                    path_index[new_path] = index
+                    known[index] = new_path.decode('utf-8', 'surrogateescape')
+            elif token.startswith(_COMMIT_MARK):
+                _, timestamp, author, subject = token[1:].split(_FIELD_SEP, 3)
+                author = author.lower()
+                author_id = author_index.get(author)
+                if author_id is None:
+                    author_id = author_index[author] = len(self.authors)
+                    self.authors.append(author.decode('utf-8', 'replace'))
+                commit += 1
+                commit_times.append(int(timestamp))
+                commit_authors.append(author_id)
+                commit_bugs.append(bug_search(subject.decode('utf-8', 'replace')) is not None)
+                continue
+            else:
+                token = token.lstrip(b'\n')
+                if not token:
+                    continue
+                added, deleted, path = token.split(b'\t', 2)
+                if not path:
+                    rename = [added, deleted]
+                    continue
+                index = file_id(path)
+
+            record_files.append(index)
+            record_commits.append(commit)
+            # Fichiers binaires : "-" en ajouts et suppressions
+            record_added.append(int(added) if added != b'-' else 0)
+            record_deleted.append(int(deleted) if deleted != b'-' else 0)
+
+        self._aggregate(np.array(record_files, dtype=np.int64), np.array(record_commits, dtype=np.int64),
+                        np.array(record_added, dtype=np.int64), np.array(record_deleted, dtype=np.int64),
+                        np.array(commit_times, dtype=np.int64), np.array(commit_authors, dtype=np.int64),
+                        np.array(commit_bugs, dtype=bool))
+        return commit + 1
+
+    def _aggregate(self, files: np.ndarray, commits: np.ndarray, added: np.ndarray,
+                   deleted: np.ndarray, commit_times: np.ndarray, commit_authors: np.ndarray,
+                   commit_bugs: np.ndarray):
+        """Ajoute les entrées (fichier, commit, ajouts, suppressions) aux tableaux par fichier"""
+        n_files = len(self.paths)
+        grow = n_files - len(self.commit_count)
+        if grow:
+            for name in ('commit_count', 'lines_added', 'lines_deleted', 'bug_count', 'last_time'):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow, dtype=np.int64)]))
+            self.first_time = np.concatenate([self.first_time, np.full(grow, _NO_TIME, dtype=np.int64)])
+        if not len(files):
+            return
+
+        self.commit_count += np.bincount(files, minlength=n_files)
+        self.lines_added += np.bincount(files, weights=added, minlength=n_files).astype(np.int64)
+        self.lines_deleted += np.bincount(files, weights=deleted, minlength=n_files).astype(np.int64)
+        self.bug_count += np.bincount(files, weights=commit_bugs[commits], minlength=n_files).astype(np.int64)
+
+        times = commit_times[commits]
+        np.minimum.at(self.first_time, files, times)
+        np.maximum.at(self.last_time, files, times)
+
+        pairs = (files << 32) | commit_authors[commits]
+        self.author_pairs = np.unique(np.concatenate([self.author_pairs, pairs]))
+
+    def _cache_meta(self) -> Dict:
+        return {'version': self.CACHE_VERSION, 'bug_pattern': self.bug_pattern,
+                'detect_renames': self.detect_renames}
+
+    def _save_cache(self):
+        """Écrit les tableaux et le dernier commit vu (npz, sans pickle)"""
+        state = dict(self._cache_meta(), last_commit=self.last_commit, commits_seen=self.commits_seen,
+                     paths=self.paths, authors=self.authors)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            np.savez(f, state=np.array(json.dumps(state)),
+                     **{name: getattr(self, name) for name in self._ARRAYS})
+        temporary.replace(self.cache_path)
+
+    def _load_cache(self):
+        """Reprend l'état du cache s'il a été produit avec les mêmes réglages"""
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as archive:
+                state = json.loads(str(archive['state']))
+                arrays = {name: archive[name] for name in self._ARRAYS}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Cache {self.cache_path} illisible, relecture complète: {e}")
+            return
+        if any(state.get(key) != value for key, value in self._cache_meta().items()):
+            logger.info(f"Cache {self.cache_path} produit avec d'autres réglages, relecture complète")
+            return
+
+        self._reset()
+        for name, values in arrays.items():
+            setattr(self, name, values)
+        self.last_commit = state['last_commit']
+        self.commits_seen = state['commits_seen']
+        self.paths = state['paths']
+        self.authors = state['authors']
+        self._path_index = {path.encode('utf-8', 'surrogateescape'): index
+                            for index, path in enumerate(self.paths) if path is not None}
+        self._author_index = {author.encode('utf-8'): index for index, author in enumerate(self.authors)}
+
+def default_cache_path(repo: Union[str, Path]) -> Optional[Path]:
+    """Emplacement par défaut du cache : dans le répertoire .git du dépôt"""
+    result = subprocess.run(['git', '-C', str(repo), 'rev-parse', '--absolute-git-dir'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return Path(result.stdout.strip()) / 'risk_history_cache.npz'
+
+def main():
+    """Extrait les métriques d'historique d'un dépôt Git"""
+    parser = argparse.ArgumentParser(description="Métriques d'historique Git par fichier")
+    parser.add_argument('--repo', default='.', help="Répertoire du dépôt Git")
+    parser.add_argument('--output', default='git_metrics.json',
+                        help="Fichier de sortie (.json : liste d'enregistrements, .csv)")
+    parser.add_argument('--cache', help="Cache incrémental (.git/risk_history_cache.npz par défaut)")
+    parser.add_argument('--no-cache', action='store_true', help="N'utilise ni n'écrit de cache")
+    parser.add_argument('--full', action='store_true', help="Relit tout l'historique")
+    parser.add_argument('--bug-pattern', default=BUG_FIX_PATTERN,
+                        help="Expression régulière des sujets de commits de correction")
+    parser.add_argument('--no-renames', action='store_true', help="Ne suit pas les renommages")
+    parser.add_argument('--include-deleted', action='store_true',
+                        help="Garde les fichiers supprimés depuis")
+    args = parser.parse_args()
+
+    cache_path = None if args.no_cache else (args.cache or default_cache_path(args.repo))
+    analyzer = GitHistoryAnalyzer(args.repo, bug_pattern=args.bug_pattern, cache_path=cache_path,
+                                  detect_renames=not args.no_renames)
+    table = analyzer.analyze(full=args.full, include_deleted=args.include_deleted)
+
+    if args.output.endswith('.csv'):
+        table.to_csv(args.output, index=False)
+    else:
+        table.to_json(args.output, orient='records', indent=2, force_ascii=False)
+    logger.info(f"Métriques de {len(table)} fichiers écrites dans {args.output}")
+
+if __name__ == "__main__":
+    main()
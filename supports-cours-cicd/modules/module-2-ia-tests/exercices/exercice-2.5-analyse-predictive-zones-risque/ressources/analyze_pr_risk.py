@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Analyse de risque des fichiers modifiés par une pull request
+Ne calcule les métriques (code et historique Git) que pour les fichiers du
+diff et les évalue avec le référentiel du dépôt figé à l'entraînement
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+
+from analyze_git_history import GitHistoryAnalyzer, default_cache_path
+from extract_code_metrics import CodeMetricsExtractor, merge_with_history
+from risk_predictor import RiskPredictor
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def changed_files(repo: Union[str, Path], base: str, head: str = 'HEAD',
+                  suffixes: Tuple[str, ...] = ('.py',)) -> List[str]:
+    """
+    Fichiers ajoutés, modifiés ou renommés entre la base de la PR et head
+
+    Args:
+        repo: Répertoire du dépôt Git
+        base: Branche ou commit cible de la PR (comparaison base...head)
+        head: Commit de la PR
+        suffixes: Extensions retenues
+
+    Returns:
+        Chemins relatifs à la racine du dépôt, triés
+    """
+    output = subprocess.run(['git', '-C', str(repo), 'diff', '--name-only', '-z', '-M',
+                             '--diff-filter=d', f'{base}...{head}'],
+                            capture_output=True, check=True).stdout
+    paths = {path.decode('utf-8', 'surrogateescape') for path in output.split(b'\0') if path}
+    return sorted(path for path in paths if path.endswith(suffixes))
+
+def analyze_pull_request(predictor: RiskPredictor, repo: Union[str, Path], base: str,
+                         head: str = 'HEAD', history: Optional[GitHistoryAnalyzer] = None,
+                         extractor: Optional[CodeMetricsExtractor] = None,
+                         reference_time: Optional[float] = None) -> pd.DataFrame:
+    """
+    Risque des fichiers modifiés par une PR
+
+    Les métriques de code sont lues dans l'arbre de travail (head doit être
+    extrait) ; l'historique vient du cache incrémental de history s'il en a
+    un, sinon d'un git log restreint aux fichiers modifiés.
+
+    Args:
+        predictor: Prédicteur entraîné ou chargé (avec son référentiel)
+        repo: Répertoire du dépôt Git
+        base: Branche ou commit cible de la PR
+        head: Commit de la PR
+        history: Analyseur d'historique (sans cache par défaut)
+        extractor: Extracteur de métriques de code (en série, sans cache par défaut)
+        reference_time: Horodatage Unix de calcul de l'âge des fichiers
+
+    Returns:
+        Sortie d'analyze_repository (baseline=True) triée par risque décroissant
+    """
+    files = changed_files(repo, base, head)
+    history = history or GitHistoryAnalyzer(repo)
+    extractor = extractor or CodeMetricsExtractor(max_workers=1)
+
+    code_metrics = extractor.extract(repo, paths=files)
+    git_metrics = history.analyze_files(code_metrics['file_path'].tolist(), reference_time=reference_time)
+    table = merge_with_history(code_metrics, git_metrics)
+    return predictor.analyze_repository(table, baseline=True)
+
+def main():
+    """Évalue les fichiers d'une PR et échoue au-delà d'un seuil de risque"""
+    parser = argparse.ArgumentParser(description="Analyse de risque des fichiers d'une pull request")
+    parser.add_argument('--repo', default='.', help="Répertoire du dépôt Git (head extrait)")
+    parser.add_argument('--base', default='origin/main', help="Branche cible de la PR")
+    parser.add_argument('--head', default='HEAD', help="Commit de la PR")
+    parser.add_argument('--model', default='risk_model',
+                        help="Modèle entraîné (artefact compact ou fichier joblib)")
+    parser.add_argument('--pr-number', help="Numéro de la PR, repris dans le rapport")
+    parser.add_argument('--output', help="Rapport JSON (sortie standard par défaut)")
+    parser.add_argument('--git-cache',
+                        help="Cache d'historique incrémental (.git/risk_history_cache.npz par défaut)")
+    parser.add_argument('--no-git-cache', action='store_true',
+                        help="Sans cache : git log restreint aux fichiers de la PR et à leurs anciens noms")
+    parser.add_argument('--fail-above', type=float,
+                        help="Code de sortie 1 si un fichier dépasse cette probabilité de risque")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    predictor = RiskPredictor()
+    predictor.load_model(args.model)
+    # Même historique que celui du référentiel : cache du dépôt entier par défaut
+    git_cache = None if args.no_git_cache else (args.git_cache or default_cache_path(args.repo))
+    history = GitHistoryAnalyzer(args.repo, cache_path=git_cache)
+    results = analyze_pull_request(predictor, args.repo, args.base, args.head, history=history)
+
+    report = {
+        'pr_number': args.pr_number,
+        'base': args.base,
+        'head': args.head,
+        'files': results.to_dict('records'),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+    logger.info(f"{len(results)} fichiers évalués en {report['seconds']}s")
+
+    if args.fail_above is not None and (results['risk_probability'] > args.fail_above).any():
+        risky = results.loc[results['risk_probability'] > args.fail_above, 'file_path'].tolist()
+        logger.error(f"Risque supérieur à {args.fail_above:.0%}: {', '.join(risky)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
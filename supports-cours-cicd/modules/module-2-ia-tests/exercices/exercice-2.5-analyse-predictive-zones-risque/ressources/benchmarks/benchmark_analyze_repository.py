@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'analyse de risque d'un dépôt entier
+Compare une boucle analyze_file_risk (un appel au modèle par fichier) à
+analyze_repository (un seul appel, règles par masques de colonnes), puis
+mesure analyze_repository et son mode flux sur de gros dépôts synthétiques
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_predictor import RiskPredictor  # noqa: E402
+from benchmark_model_artifacts import generate_file_metrics  # noqa: E402
+
+
+def repository_table(n_files: int, seed: int = 7):
+    """Métriques d'un dépôt synthétique, une ligne par fichier"""
+    table = generate_file_metrics(n_files, seed=seed).drop(columns=['is_buggy'])
+    table.insert(0, 'file_path', [f'src/module_{i // 50}/file_{i}.py' for i in range(n_files)])
+    return table
+
+
+def per_file_loop(predictor: RiskPredictor, table) -> list:
+    """Analyse historique : analyze_file_risk fichier par fichier"""
+    records = table.drop(columns=['file_path']).to_dict('records')
+    analyses = [predictor.analyze_file_risk(path, metrics)
+                for path, metrics in zip(table['file_path'].tolist(), records)]
+    return sorted(analyses, key=lambda analysis: -analysis['risk_probability'])
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loop-sizes', type=int, nargs='+', default=[1000, 5000],
+                        help="Tailles comparées à la boucle fichier par fichier")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000],
+                        help="Tailles mesurées avec analyze_repository seul")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--top-n', type=int, default=100)
+    parser.add_argument('--model', default='random_forest', choices=RiskPredictor.MODEL_TYPES)
+    args = parser.parse_args()
+
+    predictor = RiskPredictor(args.model)
+    predictor.train(generate_file_metrics(5000))
+
+    print(f"{'fichiers':>9} {'boucle':>9} {'vectorisé':>10} {'accélération':>13}")
+    for n_files in args.loop_sizes:
+        table = repository_table(n_files)
+        analyses, loop_time = timed(per_file_loop, predictor, table)
+        results, batch_time = timed(predictor.analyze_repository, table)
+
+        # Fichier isolé évalué avec le référentiel figé : même résultat que le dépôt en mode baseline
+        by_path = predictor.analyze_repository(table, baseline=True).set_index('file_path')
+        for analysis in analyses:
+            row = by_path.loc[analysis['file_path']]
+            assert np.isclose(row['risk_probability'], analysis['risk_probability'])
+            assert row['risk_factors'] == analysis['risk_factors']
+            assert row['recommendations'] == analysis['recommendations']
+        assert np.all(np.diff(results['risk_probability'].to_numpy()) <= 0)
+        print(f"{n_files:>9} {loop_time:>8.2f}s {batch_time:>9.3f}s {loop_time / batch_time:>12.1f}x")
+
+    print(f"\n{'fichiers':>9} {'complet':>9} {'flux top-' + str(args.top_n):>14} {'fichiers/s':>12}")
+    for n_files in args.sizes:
+        table = repository_table(n_files)
+        results, full_time = timed(predictor.analyze_repository, table)
+        top, stream_time = timed(predictor.analyze_repository, table,
+                                 top_n=args.top_n, chunk_size=args.chunk_size)
+        assert top['file_path'].tolist() == results['file_path'].head(args.top_n).tolist()
+        print(f"{n_files:>9} {full_time:>8.2f}s {stream_time:>13.2f}s {n_files / full_time:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark des modèles de RiskPredictor
+Compare, pour chaque model_type, la durée d'entraînement (étape fit, hors
+validation croisée), la durée de prédiction d'un dépôt entier et l'AUC
+sur un jeu de test, avec une part de métriques manquantes (remplacées par
+0 pour les modèles classiques, conservées par le gradient boosting par
+histogrammes)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_predictor import Instrumentation, RiskPredictor  # noqa: E402
+from benchmark_model_artifacts import generate_file_metrics  # noqa: E402
+
+MISSING_COLUMNS = ['lines_added', 'lines_deleted', 'bug_count', 'file_age_days']
+
+
+def with_missing(data, rate: float, seed: int):
+    """Efface une part rate des métriques d'historique (fichiers hors historique Git)"""
+    rng = np.random.default_rng(seed)
+    data = data.copy()
+    for column in MISSING_COLUMNS:
+        data[column] = data[column].astype(float).mask(rng.random(len(data)) < rate)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="Tailles des jeux d'entraînement")
+    parser.add_argument('--test-files', type=int, default=50000)
+    parser.add_argument('--missing-rate', type=float, default=0.05)
+    parser.add_argument('--models', nargs='+', default=list(RiskPredictor.MODEL_TYPES),
+                        choices=RiskPredictor.MODEL_TYPES)
+    args = parser.parse_args()
+
+    test = with_missing(generate_file_metrics(args.test_files, seed=7), args.missing_rate, seed=8)
+    y_test = test.pop('is_buggy').to_numpy()
+
+    from sklearn.metrics import roc_auc_score
+
+    print(f"{'fichiers':>9} {'modèle':<24} {'entraînement':>13} {'prédiction':>11} {'AUC test':>9}")
+    for size in args.sizes:
+        data = with_missing(generate_file_metrics(size), args.missing_rate, seed=1)
+        for model_type in args.models:
+            instrumentation = Instrumentation(enabled=True)
+            predictor = RiskPredictor(model_type, instrumentation=instrumentation)
+            # La validation croisée de train() n'entre pas dans la mesure
+            predictor.train(data)
+            fit_time = instrumentation.snapshot()[RiskPredictor.COMPONENT]['fit']['last_seconds']
+
+            start = time.perf_counter()
+            probabilities = predictor.predict_risk(test)['risk_probability'].to_numpy()
+            predict_time = time.perf_counter() - start
+
+            auc = roc_auc_score(y_test, probabilities)
+            print(f"{size:>9} {model_type:<24} {fit_time:>12.2f}s {predict_time:>10.2f}s {auc:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
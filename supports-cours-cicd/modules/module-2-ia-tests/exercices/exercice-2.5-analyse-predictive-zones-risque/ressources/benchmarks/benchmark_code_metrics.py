@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction des métriques de code
+Fichiers/s sur une grande arborescence Python (bibliothèque standard par
+défaut) : analyse en série, pool de processus, puis réexécution avec le
+cache (aucun fichier modifié, puis quelques fichiers modifiés)
+"""
+
+import argparse
+import shutil
+import sys
+import sysconfig
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extract_code_metrics import CodeMetricsExtractor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tree', default=sysconfig.get_paths()['stdlib'],
+                        help="Arborescence analysée (bibliothèque standard par défaut)")
+    parser.add_argument('--workers', type=int, help="Processus du pool (nombre de CPU par défaut)")
+    parser.add_argument('--modified', type=int, default=20,
+                        help="Fichiers modifiés avant la dernière réexécution")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Copie de travail : la dernière mesure modifie des fichiers
+        tree = Path(tmp) / 'tree'
+        shutil.copytree(args.tree, tree, ignore=shutil.ignore_patterns('__pycache__', 'site-packages'))
+        cache = Path(tmp) / 'cache.json'
+
+        serial = CodeMetricsExtractor(max_workers=1)
+        serial_table = serial.extract(tree)
+        parallel = CodeMetricsExtractor(max_workers=args.workers)
+        parallel_table = parallel.extract(tree)
+        pd.testing.assert_frame_equal(serial_table, parallel_table)
+
+        CodeMetricsExtractor(cache_path=cache, max_workers=args.workers).extract(tree)
+        warm = CodeMetricsExtractor(cache_path=cache, max_workers=args.workers)
+        warm_table = warm.extract(tree)
+        pd.testing.assert_frame_equal(warm_table, serial_table)
+
+        for path in serial.source_files(tree)[:args.modified]:
+            path.write_text(path.read_text(encoding='utf-8', errors='replace') + '\n\ndef _added(x):\n'
+                            '    return x if x else None\n', encoding='utf-8')
+        time.sleep(0.01)
+        touched = CodeMetricsExtractor(cache_path=cache, max_workers=args.workers)
+        touched.extract(tree)
+
+        print(f"{len(serial_table)} fichiers Python dans {args.tree}")
+        print(f"{'mode':<34} {'durée':>8} {'fichiers/s':>12} {'analysés':>9}")
+        for label, extractor in (('série', serial), (f'pool ({parallel.max_workers} processus)', parallel),
+                                 ('cache à jour', warm),
+                                 (f'cache, {args.modified} fichiers modifiés', touched)):
+            stats = extractor.stats
+            print(f"{label:<34} {stats['seconds']:>7.2f}s {stats['files_per_s']:>12,.0f} {stats['analyzed']:>9}")
+
+
+if __name__ == '__main__':
+    main()
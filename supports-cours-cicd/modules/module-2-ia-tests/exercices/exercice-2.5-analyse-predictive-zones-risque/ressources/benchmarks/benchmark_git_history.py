@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'analyse de l'historique Git
+Construit un dépôt synthétique (git fast-import) puis mesure une lecture
+complète, une réexécution sans nouveau commit et une mise à jour
+incrémentale après quelques commits (dont un renommage), en vérifiant
+qu'elle donne les mêmes métriques qu'une relecture complète
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyze_git_history import GitHistoryAnalyzer  # noqa: E402
+
+START_TIME = 1600000000
+SUBJECTS = ['Add feature', 'Refactor module', 'Fix crash on empty input', 'Update docs', 'Bugfix: off by one']
+
+
+def append_commits(repo: Path, n_commits: int, n_files: int, first_mark: int, seed: int):
+    """Ajoute n_commits commits synthétiques (3 fichiers modifiés chacun) via git fast-import"""
+    rng = np.random.default_rng(seed)
+    files = rng.integers(0, n_files, (n_commits, 3))
+    authors = rng.integers(0, 40, n_commits)
+    subjects = rng.integers(0, len(SUBJECTS), n_commits)
+    sizes = rng.integers(1, 40, (n_commits, 3))
+    parent = subprocess.run(['git', '-C', str(repo), 'rev-parse', '--verify', '-q', 'HEAD'],
+                            capture_output=True, text=True).stdout.strip()
+
+    chunks = []
+    for i in range(n_commits):
+        mark = first_mark + i
+        timestamp = START_TIME + mark * 600
+        subject = SUBJECTS[subjects[i]].encode()
+        chunks.append(b'commit refs/heads/main\n')
+        chunks.append(f'author Dev {authors[i]} <dev{authors[i]}@example.com> {timestamp} +0000\n'.encode())
+        chunks.append(f'committer CI <ci@example.com> {timestamp} +0000\n'.encode())
+        chunks.append(b'data %d\n%s\n' % (len(subject), subject))
+        if i == 0 and parent:
+            chunks.append(f'from {parent}\n'.encode())
+        for file_id, size in zip(files[i].tolist(), sizes[i].tolist()):
+            content = ''.join(f'line {mark} {j}\n' for j in range(size)).encode()
+            chunks.append(f'M 100644 inline src/pkg_{file_id % 50}/module_{file_id}.py\n'.encode())
+            chunks.append(b'data %d\n%s\n' % (len(content), content))
+    subprocess.run(['git', '-C', str(repo), 'fast-import', '--quiet'], input=b''.join(chunks), check=True)
+    subprocess.run(['git', '-C', str(repo), 'reset', '-q', '--hard', 'main'], check=True)
+
+
+def rename_file(repo: Path, old_path: str, new_path: str, mark: int):
+    """Renomme un fichier puis le modifie (deux commits, via git fast-import)"""
+    parent = subprocess.run(['git', '-C', str(repo), 'rev-parse', 'HEAD'],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    old_content = subprocess.run(['git', '-C', str(repo), 'show', f'HEAD:{old_path}'],
+                                 capture_output=True, check=True).stdout
+    chunks = []
+    for i, (subject, operation) in enumerate([
+        (b'Move module', f'R {old_path} {new_path}\n'.encode()),
+        (b'Fix crash after move', f'M 100644 inline {new_path}\n'.encode()
+         + b'data %d\n%s\n' % (len(old_content) + 6, old_content + b'fixed\n')),
+    ]):
+        timestamp = START_TIME + (mark + i) * 600
+        chunks.append(b'commit refs/heads/main\n')
+        chunks.append(f'author Dev 99 <dev99@example.com> {timestamp} +0000\n'.encode())
+        chunks.append(f'committer CI <ci@example.com> {timestamp} +0000\n'.encode())
+        chunks.append(b'data %d\n%s\n' % (len(subject), subject))
+        if i == 0:
+            chunks.append(f'from {parent}\n'.encode())
+        chunks.append(operation)
+    subprocess.run(['git', '-C', str(repo), 'fast-import', '--quiet'], input=b''.join(chunks), check=True)
+    subprocess.run(['git', '-C', str(repo), 'reset', '-q', '--hard', 'main'], check=True)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=100000)
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--new-commits', type=int, default=100)
+    parser.add_argument('--repo', help="Dépôt de travail (temporaire par défaut)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(args.repo or Path(tmp) / 'repo')
+        subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+        _, build_time = timed(append_commits, repo, args.commits, args.files, 0, seed=1)
+        print(f"Dépôt synthétique : {args.commits} commits, {args.files} fichiers ({build_time:.1f}s)")
+
+        cache = Path(tmp) / 'history.npz'
+        reference_time = START_TIME + (args.commits + args.new_commits + 2) * 600
+
+        def run(full: bool = False) -> pd.DataFrame:
+            analyzer = GitHistoryAnalyzer(repo, cache_path=cache)
+            return analyzer.analyze(full=full, reference_time=reference_time)
+
+        table, full_time = timed(run, full=True)
+        _, cached_time = timed(run)
+        append_commits(repo, args.new_commits, args.files, args.commits, seed=2)
+        # Fichier renommé : son historique doit suivre le nouveau chemin
+        renamed = table['file_path'].iloc[0]
+        moved = f'src/moved/{Path(renamed).name}'
+        rename_file(repo, renamed, moved, args.commits + args.new_commits)
+        incremental, incremental_time = timed(run)
+
+        # Même résultat qu'une relecture complète du dépôt enrichi
+        rebuilt = GitHistoryAnalyzer(repo).analyze(reference_time=reference_time)
+        pd.testing.assert_frame_equal(incremental, rebuilt)
+
+        # git log restreint à quelques fichiers : mêmes métriques que la lecture complète
+        selection = sorted(np.random.default_rng(3).choice(rebuilt['file_path'].to_numpy(), 9, replace=False))
+        selection = sorted(set(selection) | {moved})
+        moved_metrics = rebuilt.set_index('file_path').loc[moved]
+        assert moved_metrics['commit_count'] == table.set_index('file_path').loc[renamed, 'commit_count'] + 2
+        limited, limited_time = timed(GitHistoryAnalyzer(repo).analyze_files, selection,
+                                      reference_time=reference_time)
+        pd.testing.assert_frame_equal(limited, rebuilt[rebuilt['file_path'].isin(selection)].reset_index(drop=True))
+
+        print(f"{'lecture complète':<32} {full_time:>8.2f}s  {args.commits / full_time:>10,.0f} commits/s")
+        print(f"{'réexécution (cache à jour)':<32} {cached_time:>8.2f}s")
+        print(f"{f'incrémentale (+{args.new_commits} commits)':<32} {incremental_time:>8.2f}s")
+        print(f"{'restreinte à 10 fichiers':<32} {limited_time:>8.2f}s")
+        print(f"{len(table)} fichiers, {int(table['bug_count'].sum())} corrections de bugs attribuées")
+
+
+if __name__ == '__main__':
+    main()
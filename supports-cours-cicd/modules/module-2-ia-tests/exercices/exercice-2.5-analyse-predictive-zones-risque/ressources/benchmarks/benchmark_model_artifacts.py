@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark des formats de sauvegarde du prédicteur de risques
+Compare temps de chargement et mémoire résidente (RSS) : joblib contre artefact compact
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESSOURCES_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RESSOURCES_DIR))
+
+from risk_predictor import RiskPredictor  # noqa: E402
+
+# Script exécuté dans un processus neuf : import, chargement, une prédiction
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {ressources!r})
+import pandas as pd
+from risk_predictor import RiskPredictor
+imported = time.perf_counter()
+predictor = RiskPredictor({model_type!r})
+predictor.load_model({path!r})
+loaded = time.perf_counter()
+predictor.predict_risk(pd.read_csv({sample!r}))
+print(json.dumps({{
+    'import_s': imported - start,
+    'load_s': loaded - imported,
+    'first_predict_s': time.perf_counter() - loaded,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}}))
+"""
+
+
+def generate_file_metrics(n_files: int, seed: int = 42) -> pd.DataFrame:
+    """Génère des métriques de fichiers synthétiques avec une cible is_buggy"""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'cyclomatic_complexity': rng.poisson(8, n_files),
+        'lines_of_code': rng.lognormal(5, 1, n_files).astype(int),
+        'commit_count': rng.poisson(12, n_files),
+        'author_count': rng.integers(1, 8, n_files),
+        'lines_added': rng.poisson(300, n_files),
+        'lines_deleted': rng.poisson(120, n_files),
+        'bug_count': rng.poisson(1, n_files),
+        'file_age_days': rng.integers(1, 1500, n_files),
+        'code_smells': rng.poisson(2, n_files)
+    })
+    risk = (0.08 * data['cyclomatic_complexity'] + 0.002 * data['lines_of_code']
+            + 0.05 * data['commit_count'] + 0.4 * data['bug_count'] - 2.5)
+    data['is_buggy'] = (rng.random(n_files) < 1 / (1 + np.exp(-risk))).astype(int)
+    return data
+
+
+def probe(path: Path, model_type: str, sample: Path) -> dict:
+    """Mesure import + chargement + première prédiction dans un processus neuf"""
+    code = PROBE.format(ressources=str(RESSOURCES_DIR), model_type=model_type,
+                        path=str(path), sample=str(sample))
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--model-types', nargs='+',
+                        default=['random_forest', 'gradient_boosting', 'logistic'])
+    args = parser.parse_args()
+
+    data = generate_file_metrics(args.files)
+    print(f"{'modèle':>18} {'format':>8} {'import (s)':>11} {'load (s)':>9} "
+          f"{'1re préd. (s)':>14} {'RSS max (Mo)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sample = tmp / 'sample.csv'
+        data.drop(columns=['is_buggy']).head(1000).to_csv(sample, index=False)
+
+        for model_type in args.model_types:
+            predictor = RiskPredictor(model_type)
+            predictor.train(data)
+            joblib_path = tmp / f'{model_type}.pkl'
+            compact_path = tmp / f'{model_type}_compact'
+            predictor.save_model(str(joblib_path))
+            predictor.save_model(str(compact_path), compact=True)
+
+            # Les deux formats doivent donner les mêmes probabilités
+            reference = predictor.predict_risk(data.head(1000).drop(columns=['is_buggy']))
+            reloaded = RiskPredictor(model_type)
+            reloaded.load_model(str(compact_path))
+            compact = reloaded.predict_risk(data.head(1000).drop(columns=['is_buggy']))
+            np.testing.assert_allclose(reference['risk_probability'], compact['risk_probability'],
+                                       rtol=0, atol=1e-12)
+
+            for label, path in (('joblib', joblib_path), ('compact', compact_path)):
+                start = time.perf_counter()
+                RiskPredictor(model_type).load_model(str(path))
+                in_process = time.perf_counter() - start
+                stats = probe(path, model_type, sample)
+                print(f"{model_type:>18} {label:>8} {stats['import_s']:>11.3f} {in_process:>9.4f} "
+                      f"{stats['first_predict_s']:>14.3f} {stats['max_rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'évaluation des fichiers d'une pull request
+Compare, pour des lots de la taille d'une PR, l'évaluation avec le
+référentiel figé (baseline=True) à la réévaluation du dépôt entier, et
+mesure l'écart de probabilité introduit par des quantiles calculés sur le
+seul lot
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_predictor import RiskPredictor  # noqa: E402
+from benchmark_model_artifacts import generate_file_metrics  # noqa: E402
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repo-files', type=int, default=100000, help="Taille du dépôt synthétique")
+    parser.add_argument('--pr-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--model', default='random_forest', choices=RiskPredictor.MODEL_TYPES)
+    args = parser.parse_args()
+
+    repository = generate_file_metrics(args.repo_files, seed=3).drop(columns=['is_buggy'])
+    repository.insert(0, 'file_path', [f'src/file_{i}.py' for i in range(args.repo_files)])
+
+    trained = RiskPredictor(args.model)
+    trained.train(generate_file_metrics(20000))
+    trained.fit_baseline(repository)
+
+    # Artefact compact rechargé, comme dans un job de CI
+    with tempfile.TemporaryDirectory() as tmp:
+        trained.save_model(f'{tmp}/model', compact=True)
+        predictor = RiskPredictor()
+        predictor.load_model(f'{tmp}/model')
+
+        full = predictor.analyze_repository(repository)
+        full_time = best_of(lambda: predictor.analyze_repository(repository), repeat=1)
+        reference = full.set_index('file_path')['risk_probability']
+        print(f"Dépôt entier ({args.repo_files} fichiers) : {full_time * 1000:.0f} ms")
+
+        print(f"{'fichiers PR':>11} {'référentiel':>12} {'écart max':>10} {'quantiles du lot':>17} {'écart max':>10}")
+        rng = np.random.default_rng(0)
+        for size in args.pr_sizes:
+            pr = repository.iloc[np.sort(rng.choice(args.repo_files, size, replace=False))]
+            expected = reference.loc[pr['file_path']].to_numpy()
+
+            frozen = predictor.analyze_repository(pr, baseline=True).set_index('file_path')
+            batch = predictor.analyze_repository(pr).set_index('file_path')
+            frozen_error = np.abs(frozen.loc[pr['file_path'], 'risk_probability'].to_numpy() - expected).max()
+            batch_error = np.abs(batch.loc[pr['file_path'], 'risk_probability'].to_numpy() - expected).max()
+
+            frozen_time = best_of(lambda: predictor.analyze_repository(pr, baseline=True))
+            batch_time = best_of(lambda: predictor.analyze_repository(pr))
+            print(f"{size:>11} {frozen_time * 1000:>10.1f}ms {frozen_error:>10.4f} "
+                  f"{batch_time * 1000:>15.1f}ms {batch_error:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la préparation des features et de la catégorisation du risque
+Compare prepare_features et _categorize_risk à leur version historique
+(copie du DataFrame, insertions successives, boucle Python) à 10k, 100k et
+1M fichiers, en vérifiant que les résultats sont identiques
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_predictor import RiskPredictor  # noqa: E402
+from benchmark_model_artifacts import generate_file_metrics  # noqa: E402
+
+
+def reference_prepare_features(predictor: RiskPredictor, data: pd.DataFrame) -> pd.DataFrame:
+    """Construction historique des features (référence)"""
+    features = data.copy()
+    if 'cyclomatic_complexity' in features.columns:
+        features['complexity_high'] = (features['cyclomatic_complexity'] > 10).astype(int)
+        features['complexity_very_high'] = (features['cyclomatic_complexity'] > 20).astype(int)
+    if 'lines_of_code' in features.columns:
+        features['loc_large'] = (features['lines_of_code'] > 200).astype(int)
+        features['loc_very_large'] = (features['lines_of_code'] > 500).astype(int)
+    if 'commit_count' in features.columns:
+        features['high_churn'] = (features['commit_count'] > features['commit_count'].quantile(0.8)).astype(int)
+        features['very_high_churn'] = (features['commit_count'] > features['commit_count'].quantile(0.95)).astype(int)
+    if 'file_age_days' in features.columns:
+        features['file_new'] = (features['file_age_days'] < 30).astype(int)
+        features['file_old'] = (features['file_age_days'] > 365).astype(int)
+    if 'author_count' in features.columns:
+        features['multiple_authors'] = (features['author_count'] > 1).astype(int)
+        features['many_authors'] = (features['author_count'] > 3).astype(int)
+    if 'lines_added' in features.columns and 'lines_deleted' in features.columns:
+        features['churn_ratio'] = features['lines_added'] / (features['lines_deleted'] + 1)
+        features['total_churn'] = features['lines_added'] + features['lines_deleted']
+    if 'bug_count' in features.columns and 'commit_count' in features.columns:
+        features['bug_density'] = features['bug_count'] / (features['commit_count'] + 1)
+    if 'code_smells' in features.columns:
+        features['has_code_smells'] = (features['code_smells'] > 0).astype(int)
+        features['many_code_smells'] = (features['code_smells'] > 5).astype(int)
+    for col in features.select_dtypes(include=['object']).columns:
+        features[col] = predictor.label_encoders[col].transform(features[col].astype(str))
+    return features.fillna(0)
+
+
+def reference_categorize_risk(probabilities: np.ndarray) -> list:
+    """Catégorisation historique, probabilité par probabilité (référence)"""
+    categories = []
+    for prob in probabilities:
+        if prob >= 0.8:
+            categories.append('ÉLEVÉ')
+        elif prob >= 0.6:
+            categories.append('MOYEN-ÉLEVÉ')
+        elif prob >= 0.4:
+            categories.append('MOYEN')
+        elif prob >= 0.2:
+            categories.append('FAIBLE-MOYEN')
+        else:
+            categories.append('FAIBLE')
+    return categories
+
+
+def best_of(func, *args, repeat: int = 3) -> float:
+    """Meilleur temps sur quelques répétitions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'fichiers':>9} {'étape':<20} {'historique':>11} {'vectorisé':>10} {'accélération':>13}")
+    for n_files in args.sizes:
+        data = generate_file_metrics(n_files).drop(columns=['is_buggy'])
+        data['language'] = np.where(np.arange(n_files) % 3 == 0, 'python', 'javascript')
+        data.loc[data.index[::17], 'lines_added'] = np.nan
+
+        predictor = RiskPredictor()
+        features = predictor.prepare_features(data)
+        pd.testing.assert_frame_equal(features, reference_prepare_features(predictor, data))
+        probabilities = np.random.default_rng(42).random(n_files)
+        assert predictor._categorize_risk(probabilities) == reference_categorize_risk(probabilities)
+
+        for step, reference, vectorized, arg in (
+            ('prepare_features', lambda d: reference_prepare_features(predictor, d),
+             predictor.prepare_features, data),
+            ('_categorize_risk', reference_categorize_risk, predictor._categorize_risk, probabilities),
+        ):
+            before = best_of(reference, arg)
+            after = best_of(vectorized, arg)
+            print(f"{n_files:>9} {step:<20} {before:>10.3f}s {after:>9.3f}s {before / after:>12.1f}x")
+
+
+if __name__ == '__main__':
+    main()
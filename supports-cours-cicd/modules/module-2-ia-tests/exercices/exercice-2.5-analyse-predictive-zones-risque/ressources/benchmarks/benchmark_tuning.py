@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche d'hyperparamètres
+Compare la recherche exhaustive en série (un train() complet, validation
+croisée comprise, par candidat de SEARCH_SPACE) à tune() : réductions
+successives, plis précalculés, entraînements parallèles, puis réexécution
+servie par le cache
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_predictor import RiskPredictor  # noqa: E402
+from benchmark_model_artifacts import generate_file_metrics  # noqa: E402
+
+
+def serial_search(data) -> tuple:
+    """Recherche historique : train() pour chaque candidat, meilleur AUC de validation croisée"""
+    best = None
+    for model_type, grid in RiskPredictor.SEARCH_SPACE.items():
+        for params in grid:
+            metrics = RiskPredictor(model_type, model_params=params).train(data)
+            if best is None or metrics['cv_auc_mean'] > best[0]:
+                best = (metrics['cv_auc_mean'], model_type, params)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=5000, help="Taille du jeu d'entraînement")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+
+    data = generate_file_metrics(args.files)
+    candidates = sum(len(grid) for grid in RiskPredictor.SEARCH_SPACE.values())
+    print(f"{candidates} candidats, {args.files} fichiers, {os.cpu_count()} CPU")
+
+    start = time.perf_counter()
+    serial_auc, serial_type, serial_params = serial_search(data)
+    serial_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = f'{tmp}/tuning.json'
+        cold = RiskPredictor().tune(data, n_jobs=args.n_jobs, cache_path=cache, refit=False)
+        warm = RiskPredictor().tune(data, n_jobs=args.n_jobs, cache_path=cache, refit=False)
+
+    print(f"{'mode':<28} {'durée':>8} {'entraînements':>14} {'accélération':>13}  meilleur candidat")
+    print(f"{'série exhaustive':<28} {serial_time:>7.1f}s {candidates * 6:>14} {1.0:>12.1f}x  "
+          f"{serial_type} {serial_params} (AUC cv {serial_auc:.3f})")
+    for label, report in (('tune (réductions)', cold), ('tune (cache)', warm)):
+        print(f"{label:<28} {report['seconds']:>7.1f}s {report['fits']:>14} "
+              f"{serial_time / report['seconds']:>12.1f}x  {report['best_model_type']} "
+              f"{report['best_params']} (AUC cv {report['best_cv_auc']:.3f})")
+
+
+if __name__ == '__main__':
+    main()
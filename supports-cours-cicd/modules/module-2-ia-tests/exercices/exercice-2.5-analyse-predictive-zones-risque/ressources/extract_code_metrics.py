@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Extraction des métriques de code pour RiskPredictor
+Calcule par fichier Python cyclomatic_complexity, lines_of_code et
+code_smells à partir de l'AST, en parallèle sur un pool de processus, avec
+un cache par empreinte de contenu qui évite de réanalyser les fichiers inchangés
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ('cyclomatic_complexity', 'lines_of_code', 'code_smells')
+
+# Répertoires jamais parcourus
+EXCLUDED_DIRS = {'.git', '.hg', '.svn', '__pycache__', '.venv', 'venv', 'env', '.tox', '.nox',
+                 'node_modules', 'build', 'dist', '.eggs', '.mypy_cache', '.pytest_cache'}
+
+# Seuils des code smells
+SMELL_THRESHOLDS = {
+    'function_lines': 50,        # fonction trop longue
+    'function_params': 5,        # trop de paramètres
+    'function_complexity': 10,   # fonction trop complexe
+    'nesting_depth': 4,          # imbrication trop profonde
+    'class_methods': 20,         # classe trop chargée
+    'line_length': 120,          # ligne trop longue
+}
+
+# Nœuds ajoutant un chemin d'exécution (McCabe)
+_BRANCH_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler,
+                 ast.Assert) + ((ast.match_case,) if hasattr(ast, 'match_case') else ())
+
+# Nœuds ouvrant un niveau d'imbrication
+_NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try) + \
+    ((ast.TryStar,) if hasattr(ast, 'TryStar') else ())
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Analyse en série en dessous de ce nombre de fichiers (démarrage du pool trop coûteux)
+PARALLEL_MIN_FILES = 64
+
+class _MetricsVisitor(ast.NodeVisitor):
+    """
+    Parcours unique de l'AST d'un module
+
+    La complexité cyclomatique est comptée par fonction (1 + points de
+    décision, opérateurs booléens et compréhensions compris) et pour le
+    code de niveau module ; la métrique du fichier est le maximum.
+    """
+
+    def __init__(self):
+        # Complexité de chaque fonction terminée
+        self.complexities: List[int] = []
+        self.smells = 0
+        # Complexité et profondeur d'imbrication de chaque bloc ouvert (module puis fonctions)
+        self._complexity = [1]
+        self._depth = [0]
+        self._max_depth = [0]
+
+    def visit_FunctionDef(self, node):
+        arguments = node.args
+        params = (len(arguments.posonlyargs) + len(arguments.args) + len(arguments.kwonlyargs)
+                  + (arguments.vararg is not None) + (arguments.kwarg is not None))
+        if arguments.args and arguments.args[0].arg in ('self', 'cls'):
+            params -= 1
+        if params > SMELL_THRESHOLDS['function_params']:
+            self.smells += 1
+        if (node.end_lineno or node.lineno) - node.lineno + 1 > SMELL_THRESHOLDS['function_lines']:
+            self.smells += 1
+        # Valeurs par défaut mutables
+        self.smells += sum(isinstance(default, (ast.List, ast.Dict, ast.Set))
+                           for default in arguments.defaults + arguments.kw_defaults)
+
+        self._complexity.append(1)
+        self._depth.append(0)
+        self._max_depth.append(0)
+        self.generic_visit(node)
+        complexity = self._complexity.pop()
+        self._depth.pop()
+        if self._max_depth.pop() > SMELL_THRESHOLDS['nesting_depth']:
+            self.smells += 1
+        if complexity > SMELL_THRESHOLDS['function_complexity']:
+            self.smells += 1
+        self.complexities.append(complexity)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        methods = sum(isinstance(child, _FUNCTION_NODES) for child in node.body)
+        if methods > SMELL_THRESHOLDS['class_methods']:
+            self.smells += 1
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        if node.type is None:
+            # except: nu
+            self.smells += 1
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        if any(alias.name == '*' for alias in node.names):
+            self.smells += 1
+
+    def visit_BoolOp(self, node):
+        self._complexity[-1] += len(node.values) - 1
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node):
+        self._complexity[-1] += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+    def generic_visit(self, node):
+        # Un elif est un If seul dans le orelse de son parent : même niveau que le if
+        elif_branch = node.orelse[0] if isinstance(node, ast.If) and len(node.orelse) == 1 else None
+        for child in ast.iter_child_nodes(node):
+            nesting = isinstance(child, _NESTING_NODES) and not (child is elif_branch
+                                                                 and isinstance(child, ast.If))
+            if isinstance(child, _BRANCH_NODES):
+                self._complexity[-1] += 1
+            if nesting:
+                depth = self._depth[-1] = self._depth[-1] + 1
+                if depth > self._max_depth[-1]:
+                    self._max_depth[-1] = depth
+            self.visit(child)
+            if nesting:
+                self._depth[-1] -= 1
+
+def compute_metrics(source: Union[str, bytes]) -> Dict[str, float]:
+    """
+    Métriques d'un fichier source Python
+
+    Args:
+        source: Contenu du fichier
+
+    Returns:
+        cyclomatic_complexity (maximum par fonction), lines_of_code (lignes
+        non vides hors commentaires) et code_smells ; complexité et smells
+        valent NaN si le fichier n'est pas analysable
+    """
+    # ast.parse reçoit le contenu brut (déclaration d'encodage respectée)
+    text = source.decode('utf-8', 'replace') if isinstance(source, bytes) else source
+    lines = text.splitlines()
+    lines_of_code = 0
+    long_lines = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            lines_of_code += 1
+        if len(line) > SMELL_THRESHOLDS['line_length']:
+            long_lines += 1
+
+    visitor = _MetricsVisitor()
+    try:
+        visitor.visit(ast.parse(source))
+    except (SyntaxError, ValueError, RecursionError):
+        return {'cyclomatic_complexity': np.nan, 'lines_of_code': lines_of_code, 'code_smells': np.nan}
+
+    # Code de niveau module
+    if visitor._max_depth[0] > SMELL_THRESHOLDS['nesting_depth']:
+        visitor.smells += 1
+    return {
+        'cyclomatic_complexity': max([visitor._complexity[0]] + visitor.complexities),
+        'lines_of_code': lines_of_code,
+        'code_smells': visitor.smells + long_lines,
+    }
+
+def _content_digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+def _analyze_file(path: str) -> Optional[Tuple[str, Dict[str, float]]]:
+    """Tâche d'un processus du pool : empreinte et métriques d'un fichier (None s'il est illisible)"""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        logger.warning(f"Fichier {path} illisible, ignoré: {e}")
+        return None
+    return _content_digest(content), compute_metrics(content)
+
+class CodeMetricsExtractor:
+    """
+    Métriques de code de tous les fichiers Python d'une arborescence
+
+    Le cache associe à chaque chemin sa taille, sa date de modification et
+    l'empreinte de son contenu, et à chaque empreinte ses métriques : un
+    fichier dont la taille et la date n'ont pas changé n'est pas relu, un
+    fichier relu dont le contenu est connu (copie, touch, retour arrière)
+    n'est pas réanalysé. Seuls les autres fichiers partent dans le pool.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None,
+                 max_workers: Optional[int] = None, excluded_dirs=EXCLUDED_DIRS):
+        """
+        Initialise l'extracteur
+
+        Args:
+            cache_path: Fichier JSON du cache (aucun cache si None)
+            max_workers: Nombre de processus (nombre de CPU par défaut, 1 = en série)
+            excluded_dirs: Noms de répertoires ignorés
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.excluded_dirs = set(excluded_dirs)
+        self.stats: Dict[str, float] = {}
+        self._files: Dict[str, List] = {}
+        self._metrics: Dict[str, List] = {}
+        if self.cache_path is not None and self.cache_path.exists():
+            self._load_cache()
+
+    def source_files(self, root: Union[str, Path]) -> List[Path]:
+        """Fichiers .py de l'arborescence, hors répertoires exclus, triés"""
+        files = []
+        for directory, subdirs, names in os.walk(root):
+            subdirs[:] = [name for name in subdirs
+                          if name not in self.excluded_dirs and not name.endswith('.egg-info')]
+            files.extend(Path(directory) / name for name in names if name.endswith('.py'))
+        return sorted(files)
+
+    def extract(self, root: Union[str, Path], paths: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Analyse une arborescence
+
+        Args:
+            root: Répertoire du projet
+            paths: Chemins relatifs à root à analyser seuls (ex. fichiers
+                   modifiés par une PR) ; les fichiers non Python ou absents
+                   sont ignorés et le cache des autres fichiers est conservé
+
+        Returns:
+            DataFrame file_path (relatif à root, séparateurs '/') +
+            METRIC_COLUMNS, trié par chemin
+        """
+        start = time.perf_counter()
+        root = Path(root)
+        if paths is None:
+            files = self.source_files(root)
+        else:
+            files = sorted(root / path for path in set(paths)
+                           if path.endswith('.py') and (root / path).is_file())
+        keys = [path.relative_to(root).as_posix() for path in files]
+
+        digests: Dict[str, str] = {}
+        pending: List[int] = []
+        reread = 0
+        for i, (path, key) in enumerate(zip(files, keys)):
+            try:
+                stat = path.stat()
+                cached = self._files.get(key)
+                if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns \
+                        and cached[2] in self._metrics:
+                    digests[key] = cached[2]
+                    continue
+                # Taille ou date changée : le contenu est peut-être déjà connu
+                digest = _content_digest(path.read_bytes())
+            except OSError as e:
+                # Lien symbolique cassé, droits insuffisants...
+                logger.warning(f"Fichier {path} illisible, ignoré: {e}")
+                self._files.pop(key, None)
+                continue
+            reread += 1
+            self._files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            if digest in self._metrics:
+                digests[key] = digest
+            else:
+                pending.append(i)
+
+        for i, result in zip(pending, self._run([str(files[i]) for i in pending])):
+            if result is None:
+                # Devenu illisible entre la lecture de l'empreinte et l'analyse
+                del self._files[keys[i]]
+                continue
+            digest, metrics = result
+            self._files[keys[i]][2] = digest
+            self._metrics[digest] = [metrics[column] for column in METRIC_COLUMNS]
+            digests[keys[i]] = digest
+        analyzed = sum(keys[i] in digests for i in pending)
+        # Fichiers illisibles écartés
+        keys = [key for key in keys if key in digests]
+
+        table = pd.DataFrame(
+            [self._metrics[digests[key]] for key in keys] if keys else None,
+            columns=list(METRIC_COLUMNS)
+        )
+        table.insert(0, 'file_path', keys)
+
+        elapsed = time.perf_counter() - start
+        self.stats = {'files': len(keys), 'analyzed': analyzed, 'reread': reread,
+                      'cached': len(keys) - analyzed, 'seconds': elapsed,
+                      'files_per_s': len(keys) / elapsed if elapsed else 0.0}
+        logger.info(f"{len(keys)} fichiers ({analyzed} analysés, "
+                    f"{len(keys) - analyzed} en cache) en {elapsed:.2f}s")
+
+        if self.cache_path is not None:
+            if paths is None:
+                self._prune(set(keys))
+            self._save_cache()
+        return table
+
+    def _run(self, paths: List[str]) -> List[Optional[Tuple[str, Dict[str, float]]]]:
+        """Analyse les fichiers, en parallèle au-delà de PARALLEL_MIN_FILES"""
+        if self.max_workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+            return [_analyze_file(path) for path in paths]
+        workers = min(self.max_workers, len(paths))
+        chunksize = max(1, len(paths) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_analyze_file, paths, chunksize=chunksize))
+
+    def _prune(self, keys: set):
+        """Oublie les fichiers disparus et les empreintes qui ne servent plus"""
+        self._files = {key: entry for key, entry in self._files.items() if key in keys}
+        used = {entry[2] for entry in self._files.values()}
+        self._metrics = {digest: values for digest, values in self._metrics.items() if digest in used}
+
+    def _save_cache(self):
+        state = {'version': self.CACHE_VERSION, 'thresholds': SMELL_THRESHOLDS,
+                 'files': self._files, 'metrics': self._metrics}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        # NaN (fichiers non analysables) accepté par le module json
+        temporary.write_text(json.dumps(state), encoding='utf-8')
+        temporary.replace(self.cache_path)
+
+    def _load_cache(self):
+        try:
+            state = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache {self.cache_path} illisible, ignoré: {e}")
+            return
+        if state.get('version') != self.CACHE_VERSION or state.get('thresholds') != SMELL_THRESHOLDS:
+            logger.info(f"Cache {self.cache_path} produit avec d'autres réglages, ignoré")
+            return
+        self._files = state['files']
+        self._metrics = state['metrics']
+
+def merge_with_history(code_metrics: pd.DataFrame, git_metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    Table de métriques complète pour RiskPredictor
+
+    Args:
+        code_metrics: Sortie de CodeMetricsExtractor.extract
+        git_metrics: Sortie de GitHistoryAnalyzer.analyze (analyze_git_history)
+
+    Returns:
+        Une ligne par fichier de code_metrics, métriques d'historique à 0
+        pour les fichiers sans historique
+    """
+    merged = code_metrics.merge(git_metrics, on='file_path', how='left', copy=False)
+    history_columns = [column for column in git_metrics.columns if column != 'file_path']
+    merged[history_columns] = merged[history_columns].fillna(0).astype(np.int64)
+    return merged
+
+def main():
+    """Extrait les métriques de code d'un projet"""
+    parser = argparse.ArgumentParser(description="Métriques de code par fichier Python")
+    parser.add_argument('--project', default='.', help="Répertoire du projet")
+    parser.add_argument('--output', default='metrics.json',
+                        help="Fichier de sortie (.json : liste d'enregistrements, .csv)")
+    parser.add_argument('--cache', default='.code_metrics_cache.json', help="Fichier de cache")
+    parser.add_argument('--no-cache', action='store_true', help="N'utilise ni n'écrit de cache")
+    parser.add_argument('--workers', type=int, help="Nombre de processus (nombre de CPU par défaut)")
+    parser.add_argument('--git-metrics',
+                        help="Sortie d'analyze_git_history.py à joindre (table complète pour RiskPredictor)")
+    args = parser.parse_args()
+
+    extractor = CodeMetricsExtractor(cache_path=None if args.no_cache else args.cache,
+                                     max_workers=args.workers)
+    table = extractor.extract(args.project)
+    if args.git_metrics:
+        reader = pd.read_csv if args.git_metrics.endswith('.csv') else pd.read_json
+        table = merge_with_history(table, reader(args.git_metrics))
+
+    if args.output.endswith('.csv'):
+        table.to_csv(args.output, index=False)
+    else:
+        table.to_json(args.output, orient='records', indent=2, force_ascii=False)
+    logger.info(f"Métriques de {len(table)} fichiers écrites dans {args.output} "
+                f"({extractor.stats['files_per_s']:.0f} fichiers/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Instrumentation par étape des outils du module (détection d'anomalies,
+génération de tests, prédiction de risques)
+Mesure le temps, le nombre de lignes et le pic de mémoire allouée de chaque
+étape d'un pipeline et les expose au format texte Prometheus
+
+Module autonome, copié à l'identique dans les ressources de chaque exercice
+qui l'utilise : chaque répertoire ressources reste utilisable seul
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+# Activation globale par variable d'environnement (ML_INSTRUMENTATION=1,
+# ML_INSTRUMENTATION=memory pour mesurer aussi la mémoire)
+ENV_VARIABLE = 'ML_INSTRUMENTATION'
+METRIC_PREFIX = 'ml_stage'
+
+class _NullStage:
+    """Étape factice renvoyée quand l'instrumentation est désactivée"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_rows(self, rows: int):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """Mesure d'une étape en cours (gestionnaire de contexte)"""
+
+    __slots__ = ('owner', 'key', 'rows', 'start', 'memory_start', 'memory_peak', 'traced')
+
+    def __init__(self, owner: 'Instrumentation', key: tuple, rows: Optional[int]):
+        self.owner = owner
+        self.key = key
+        self.rows = rows
+        self.memory_start = 0
+        self.memory_peak = 0
+        self.traced = False
+
+    def set_rows(self, rows: int):
+        """Renseigne le nombre de lignes quand il n'est connu qu'en cours d'étape"""
+        self.rows = rows
+
+    def __enter__(self):
+        if self.owner.trace_memory:
+            self.owner._enter_memory(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        peak = self.owner._exit_memory(self) if self.traced else 0
+        self.owner._record(self.key, elapsed, self.rows, peak, failed=exc_type is not None)
+        return False
+
+class Instrumentation:
+    """
+    Registre de métriques par (composant, étape)
+
+    Désactivée, stage() renvoie un objet partagé sans effet : le coût se
+    limite à un appel de méthode. Activée, chaque étape mesure son temps
+    (perf_counter), ses lignes et, avec trace_memory, le pic de mémoire
+    allouée par Python pendant l'étape (tracemalloc, étapes imbriquées
+    comprises). tracemalloc ralentit les allocations : le suivi mémoire
+    est désactivé par défaut et réservé aux diagnostics.
+
+    Le compteur de pic de tracemalloc est global au processus : avec
+    trace_memory, les étapes de threads différents sont sérialisées (verrou
+    réentrant tenu par l'étape la plus externe de chaque thread) pour que
+    chacune mesure ses seules allocations.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False):
+        """
+        Initialise le registre
+
+        Args:
+            enabled: Active la collecte
+            trace_memory: Mesure le pic de mémoire allouée (tracemalloc)
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self._metrics: Dict[tuple, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._memory_lock = threading.RLock()
+        self._started_tracemalloc = False
+
+    def enable(self, trace_memory: Optional[bool] = None):
+        """Active la collecte"""
+        if trace_memory is not None:
+            self.trace_memory = trace_memory
+        self.enabled = True
+
+    def disable(self):
+        """Désactive la collecte (les métriques déjà collectées sont conservées)"""
+        self.enabled = False
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracemalloc = False
+
+    def reset(self):
+        """Efface les métriques collectées"""
+        with self._lock:
+            self._metrics.clear()
+
+    def stage(self, component: str, name: str, rows: Optional[int] = None):
+        """
+        Mesure une étape de pipeline
+
+            with instrumentation.stage('log_anomaly_detector', 'scoring', rows=len(X)):
+                ...
+
+        Args:
+            component: Outil instrumenté
+            name: Étape du pipeline
+            rows: Lignes traitées (ou set_rows() dans le bloc)
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, (component, name), rows)
+
+    def _enter_memory(self, stage: _Stage):
+        # Relâché par _exit_memory de la même étape
+        self._memory_lock.acquire()
+        stage.traced = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        current, peak = tracemalloc.get_traced_memory()
+        # Le pic depuis l'entrée de l'étape parente est reporté sur elle avant
+        # la remise à zéro du compteur de pic
+        stack = self._stack()
+        if stack:
+            stack[-1].memory_peak = max(stack[-1].memory_peak, peak - stack[-1].memory_start)
+        tracemalloc.reset_peak()
+        stage.memory_start = current
+        stack.append(stage)
+
+    def _exit_memory(self, stage: _Stage) -> int:
+        try:
+            stack = self._stack()
+            if not tracemalloc.is_tracing() or not stack or stack[-1] is not stage:
+                # Suivi interrompu (disable() pendant l'étape)
+                if stack and stack[-1] is stage:
+                    stack.pop()
+                return stage.memory_peak
+            _, peak = tracemalloc.get_traced_memory()
+            stage.memory_peak = max(stage.memory_peak, peak - stage.memory_start)
+            stack.pop()
+            if stack:
+                parent = stack[-1]
+                parent.memory_peak = max(parent.memory_peak, peak - parent.memory_start)
+            return stage.memory_peak
+        finally:
+            self._memory_lock.release()
+
+    def _stack(self) -> List[_Stage]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, key: tuple, elapsed: float, rows: Optional[int], peak: int, failed: bool):
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = {'calls': 0, 'errors': 0, 'seconds': 0.0,
+                                                'last_seconds': 0.0, 'max_seconds': 0.0,
+                                                'rows': 0, 'peak_memory_bytes': 0}
+            metrics['calls'] += 1
+            metrics['errors'] += int(failed)
+            metrics['seconds'] += elapsed
+            metrics['last_seconds'] = elapsed
+            metrics['max_seconds'] = max(metrics['max_seconds'], elapsed)
+            metrics['rows'] += int(rows or 0)
+            metrics['peak_memory_bytes'] = max(metrics['peak_memory_bytes'], int(peak))
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Métriques par composant puis par étape"""
+        with self._lock:
+            result: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (component, name), metrics in sorted(self._metrics.items()):
+                result.setdefault(component, {})[name] = dict(metrics)
+            return result
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """Métriques au format d'exposition texte Prometheus"""
+        families = [
+            ('calls_total', 'counter', 'calls', "Nombre d'exécutions de l'étape"),
+            ('errors_total', 'counter', 'errors', "Exécutions de l'étape terminées par une exception"),
+            ('seconds_total', 'counter', 'seconds', "Temps cumulé passé dans l'étape"),
+            ('last_seconds', 'gauge', 'last_seconds', "Durée de la dernière exécution"),
+            ('max_seconds', 'gauge', 'max_seconds', "Durée maximale d'une exécution"),
+            ('rows_total', 'counter', 'rows', "Lignes traitées par l'étape"),
+            ('peak_memory_bytes', 'gauge', 'peak_memory_bytes',
+             "Pic de mémoire allouée pendant une exécution (tracemalloc)"),
+        ]
+        with self._lock:
+            items = sorted(self._metrics.items())
+            lines = []
+            for suffix, kind, field, help_text in families:
+                name = f'{prefix}_{suffix}'
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for (component, stage), metrics in items:
+                    labels = f'component="{_escape(component)}",stage="{_escape(stage)}"'
+                    lines.append(f'{name}{{{labels}}} {_format_value(metrics[field])}')
+        return '\n'.join(lines) + '\n'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# Registre partagé par défaut par les outils du module
+default_instrumentation = Instrumentation(enabled=os.environ.get(ENV_VARIABLE, '') not in ('', '0'),
+                                          trace_memory=os.environ.get(ENV_VARIABLE, '') == 'memory')
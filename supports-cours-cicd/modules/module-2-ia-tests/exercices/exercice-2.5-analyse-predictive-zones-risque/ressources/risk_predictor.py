@@ -6,70 +6,385 @@ Utilise des algorithmes de machine learning pour prédire les zones de code à r
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
-from sklearn.feature_selection import SelectKBest, f_classif
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterable
 import logging
+import json
+import hashlib
+import time
 from datetime import datetime
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Instrumentation par étape (module instrumentation.py des ressources)
+from instrumentation import Instrumentation, default_instrumentation
+
+# scikit-learn, joblib, matplotlib et seaborn ne sont importés que sur les
+# chemins qui en ont besoin (entraînement, format joblib, graphiques)
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Format d'artefact compact (manifeste JSON + tableaux NumPy mappables en mémoire)
+ARTIFACT_FORMAT = 'risk-predictor'
+ARTIFACT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+def _apply_trees(X: np.ndarray, roots: np.ndarray, children_left: np.ndarray,
+                 children_right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray) -> np.ndarray:
+    """
+    Descend chaque ligne de X dans tous les arbres à la fois
+    
+    Les arbres sont concaténés : les indices d'enfants sont globaux et les
+    feuilles ont une feature négative. Retourne la matrice (lignes x arbres)
+    des indices de feuilles atteintes.
+    """
+    rows = np.arange(len(X))[:, np.newaxis]
+    nodes = np.broadcast_to(roots, (len(X), len(roots))).copy()
+    while True:
+        node_features = feature[nodes]
+        internal = node_features >= 0
+        if not internal.any():
+            return nodes
+        go_left = X[rows, np.where(internal, node_features, 0)] <= threshold[nodes]
+        nodes = np.where(internal,
+                         np.where(go_left, children_left[nodes], children_right[nodes]),
+                         nodes)
+
+def _flatten_trees(trees: List) -> Dict[str, np.ndarray]:
+    """Concatène la structure de plusieurs arbres scikit-learn (tree_) en tableaux plats"""
+    parts = {'children_left': [], 'children_right': [], 'feature': [], 'threshold': []}
+    roots = []
+    offset = 0
+    for tree in trees:
+        internal = tree.children_left >= 0
+        roots.append(offset)
+        parts['children_left'].append(np.where(internal, tree.children_left + offset, -1))
+        parts['children_right'].append(np.where(internal, tree.children_right + offset, -1))
+        parts['feature'].append(np.where(internal, tree.feature, -1))
+        parts['threshold'].append(tree.threshold)
+        offset += tree.node_count
+    
+    arrays = {name: np.concatenate(values) for name, values in parts.items()}
+    for name in ('children_left', 'children_right', 'feature'):
+        arrays[name] = arrays[name].astype(np.int64)
+    arrays['roots'] = np.array(roots, dtype=np.int64)
+    return arrays
+
+class CompactScaler:
+    """Normalisation en lecture seule à partir des paramètres d'un StandardScaler"""
+    
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, feature_names: Optional[List[str]] = None):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_names_in_ = feature_names
+    
+    def transform(self, X) -> np.ndarray:
+        """Applique (X - moyenne) / écart-type comme StandardScaler.transform"""
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            if list(X.columns) != list(self.feature_names_in_):
+                raise ValueError("Les colonnes ne correspondent pas à celles vues à l'entraînement")
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+class CompactSelector:
+    """Sélection de colonnes en lecture seule (équivalent de SelectKBest.transform)"""
+    
+    def __init__(self, support: np.ndarray, n_features_in: int):
+        self.support = support
+        self.n_features_in_ = n_features_in
+    
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X)[:, self.support]
+    
+    def get_support(self, indices: bool = False) -> np.ndarray:
+        """Indices des colonnes retenues, ou masque sur les n_features_in_ colonnes d'entrée"""
+        if indices:
+            return self.support
+        mask = np.zeros(self.n_features_in_, dtype=bool)
+        mask[self.support] = True
+        return mask
+
+class CompactLabelEncoder:
+    """Encodage de catégories en lecture seule (équivalent de LabelEncoder.transform)"""
+    
+    def __init__(self, classes: List[str]):
+        self.classes_ = np.array(classes, dtype=object)
+    
+    def transform(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=object)
+        codes = np.searchsorted(self.classes_, values)
+        known = (codes < len(self.classes_)) & (self.classes_[np.minimum(codes, len(self.classes_) - 1)] == values)
+        if not known.all():
+            raise ValueError(f"Catégories inconnues: {sorted(set(values[~known]))[:5]}")
+        return codes
+
+class CompactClassifier:
+    """
+    Classifieur binaire en lecture seule évalué directement sur des tableaux NumPy
+    
+    Reproduit predict_proba/predict des modèles scikit-learn supportés par
+    RiskPredictor (forêt aléatoire, gradient boosting binaire, régression
+    logistique) sans reconstruire les estimateurs ni importer scikit-learn.
+    """
+    
+    KINDS = ('random_forest', 'gradient_boosting', 'logistic')
+    
+    # Nombre de lignes évaluées à la fois (borne la matrice lignes x arbres)
+    CHUNK_SIZE = 10000
+    
+    def __init__(self, kind: str, arrays: Dict[str, np.ndarray], params: Dict):
+        self.kind = kind
+        self.arrays = arrays
+        self.params = params
+        self.classes_ = np.array(params['classes'])
+        if 'feature_importances' in arrays:
+            self.feature_importances_ = arrays['feature_importances']
+    
+    @staticmethod
+    def export(model) -> Optional[Tuple[str, Dict[str, np.ndarray], Dict]]:
+        """
+        Convertit un modèle entraîné en tableaux et paramètres
+        
+        Returns:
+            (type, tableaux, paramètres), ou None si le modèle n'est pas supporté
+        """
+        if not hasattr(model, 'classes_') or len(model.classes_) != 2:
+            return None
+        params = {'classes': model.classes_.tolist()}
+        name = type(model).__name__
+        
+        if name == 'RandomForestClassifier':
+            arrays = _flatten_trees([estimator.tree_ for estimator in model.estimators_])
+            values = np.concatenate([estimator.tree_.value[:, 0, :] for estimator in model.estimators_])
+            normalizer = values.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            arrays['value'] = values / normalizer
+            arrays['feature_importances'] = model.feature_importances_
+            return 'random_forest', arrays, params
+        
+        if name == 'GradientBoostingClassifier':
+            if type(getattr(model, '_loss', None)).__name__ != 'BinomialDeviance':
+                return None
+            trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+            arrays = _flatten_trees(trees)
+            arrays['value'] = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+            arrays['feature_importances'] = model.feature_importances_
+            params['learning_rate'] = model.learning_rate
+            params['init_raw_prediction'] = float(
+                model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0, 0]
+            )
+            return 'gradient_boosting', arrays, params
+        
+        if name == 'LogisticRegression':
+            arrays = {'coef': model.coef_, 'intercept': model.intercept_}
+            return 'logistic', arrays, params
+        
+        return None
+    
+    def decision_function(self, X) -> np.ndarray:
+        """Score brut de la classe positive"""
+        a = self.arrays
+        if self.kind == 'logistic':
+            X = np.asarray(X, dtype=np.float64)
+            return (X @ a['coef'].T + a['intercept']).ravel()
+        if self.kind == 'gradient_boosting':
+            X = np.asarray(X, dtype=np.float32)
+            raw = np.full(len(X), self.params['init_raw_prediction'], dtype=np.float64)
+            for start in range(0, len(X), self.CHUNK_SIZE):
+                leaves = self._leaves(X[start:start + self.CHUNK_SIZE])
+                chunk = raw[start:start + self.CHUNK_SIZE]
+                for tree_idx in range(leaves.shape[1]):
+                    chunk += self.params['learning_rate'] * a['value'][leaves[:, tree_idx]]
+            return raw
+        raise AttributeError(f"decision_function indisponible pour {self.kind}")
+    
+    def predict_proba(self, X) -> np.ndarray:
+        """Probabilités des deux classes, dans l'ordre de classes_"""
+        if self.kind == 'random_forest':
+            X = np.asarray(X, dtype=np.float32)
+            proba = np.zeros((len(X), self.arrays['value'].shape[1]), dtype=np.float64)
+            for start in range(0, len(X), self.CHUNK_SIZE):
+                leaves = self._leaves(X[start:start + self.CHUNK_SIZE])
+                chunk = proba[start:start + self.CHUNK_SIZE]
+                for tree_idx in range(leaves.shape[1]):
+                    chunk += self.arrays['value'][leaves[:, tree_idx]]
+            proba /= len(self.arrays['roots'])
+            return proba
+        
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        proba = np.ones((len(positive), 2), dtype=np.float64)
+        proba[:, 1] = positive
+        proba[:, 0] -= positive
+        return proba
+    
+    def predict(self, X) -> np.ndarray:
+        """Classe prédite pour chaque ligne"""
+        if self.kind == 'logistic':
+            return self.classes_[(self.decision_function(X) > 0).astype(int)]
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+    
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        return _apply_trees(X, a['roots'], a['children_left'], a['children_right'],
+                            a['feature'], a['threshold'])
+
+def _fit_and_score(model_type: str, params: Dict, X_train: np.ndarray,
+                   y_train: np.ndarray, X_val: np.ndarray, y_val: np.ndarray,
+                   resources: int) -> float:
+    """Tâche de RiskPredictor.tune : AUC de validation d'un candidat entraîné sur resources lignes"""
+    from sklearn.metrics import roc_auc_score
+    
+    model = RiskPredictor(model_type)._create_model(model_type, params)
+    model.fit(X_train[:resources], y_train[:resources])
+    return float(roc_auc_score(y_val, model.predict_proba(X_val)[:, 1]))
+
 class RiskPredictor:
     """
     Prédicteur de risques basé sur les métriques de code et l'historique Git
     """
     
-    def __init__(self, model_type: str = 'random_forest'):
+    MODEL_TYPES = ('random_forest', 'gradient_boosting', 'logistic', 'hist_gradient_boosting')
+    
+    # Modèles gérant nativement les valeurs manquantes et insensibles à l'échelle :
+    # ni remplacement des NaN par 0 ni normalisation
+    NATIVE_MISSING_MODELS = ('hist_gradient_boosting',)
+    
+    # Niveaux de risque et seuils de probabilité qui les séparent
+    RISK_LEVELS = ('FAIBLE', 'FAIBLE-MOYEN', 'MOYEN', 'MOYEN-ÉLEVÉ', 'ÉLEVÉ')
+    RISK_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+    _RISK_LEVEL_ARRAY = np.array(RISK_LEVELS, dtype=object)
+    
+    # Facteurs de risque : (métrique, seuil strict, libellé recevant la valeur)
+    RISK_FACTOR_RULES = (
+        ('cyclomatic_complexity', 10, "Complexité élevée ({})"),
+        ('lines_of_code', 300, "Fichier volumineux ({} lignes)"),
+        ('commit_count', 20, "Nombreuses modifications ({} commits)"),
+        ('author_count', 3, "Nombreux contributeurs ({} auteurs)"),
+        ('bug_count', 0, "Historique de bugs ({} bugs)"),
+    )
+    
+    # Recommandations : (métrique, seuil strict, recommandations) ; la métrique
+    # None désigne la probabilité de risque prédite
+    RECOMMENDATION_RULES = (
+        (None, 0.8, ("🔴 PRIORITÉ ÉLEVÉE: Refactoring immédiat recommandé",
+                     "📋 Code review obligatoire pour toute modification",
+                     "🧪 Augmenter la couverture de tests")),
+        ('cyclomatic_complexity', 15, ("🔧 Réduire la complexité cyclomatique",
+                                       "📦 Diviser en fonctions plus petites")),
+        ('lines_of_code', 500, ("✂️ Diviser le fichier en modules plus petits",)),
+        ('commit_count', 30, ("🔍 Analyser les raisons des modifications fréquentes",)),
+    )
+    DEFAULT_RECOMMENDATION = "✅ Fichier dans les normes, surveillance continue"
+    
+    # Taille des morceaux du mode flux d'analyze_repository
+    STREAM_CHUNK_SIZE = 100000
+    
+    # Espace de recherche par défaut de tune : paramètres essayés par type de modèle
+    SEARCH_SPACE = {
+        'random_forest': [
+            {'n_estimators': n_estimators, 'max_depth': max_depth, 'min_samples_leaf': min_samples_leaf}
+            for n_estimators in (100, 200) for max_depth in (6, 10, None) for min_samples_leaf in (1, 2, 5)
+        ],
+        'gradient_boosting': [
+            {'n_estimators': n_estimators, 'learning_rate': learning_rate, 'max_depth': max_depth}
+            for n_estimators in (100, 200) for learning_rate in (0.05, 0.1) for max_depth in (3, 6)
+        ],
+        'logistic': [{'C': C} for C in (0.1, 1.0, 10.0)],
+        'hist_gradient_boosting': [
+            {'learning_rate': learning_rate, 'max_leaf_nodes': max_leaf_nodes}
+            for learning_rate in (0.05, 0.1) for max_leaf_nodes in (15, 31, 63)
+        ],
+    }
+    
+    # Nom du composant dans les métriques d'instrumentation
+    COMPONENT = 'risk_predictor'
+    
+    def __init__(self, model_type: str = 'random_forest',
+                 instrumentation: Optional[Instrumentation] = None,
+                 model_params: Optional[Dict] = None):
         """
         Initialise le prédicteur de risques
         
         Args:
-            model_type: Type de modèle ('random_forest', 'gradient_boosting', 'logistic')
+            model_type: Type de modèle ('random_forest', 'gradient_boosting', 'logistic',
+                        'hist_gradient_boosting')
+            instrumentation: Registre des métriques par étape (default_instrumentation par défaut)
+            model_params: Hyperparamètres remplaçant ceux par défaut du modèle (voir tune)
         """
+        if model_type not in self.MODEL_TYPES:
+            raise ValueError(f"Type de modèle non supporté: {model_type}")
+        
         self.model_type = model_type
-        self.model = self._create_model(model_type)
-        self.scaler = StandardScaler()
-        self.feature_selector = SelectKBest(f_classif, k=15)
+        self.model_params = dict(model_params or {})
+        self.instrumentation = instrumentation or default_instrumentation
+        # Créés à l'entraînement ou au chargement
+        self.model = None
+        self.scaler = None
+        self.feature_selector = None
         self.label_encoders = {}
         self.feature_names = []
+        # Colonnes de features vues à l'entraînement, avant sélection
+        self.input_columns = []
+        # Importances par permutation des modèles sans feature_importances_
+        self.permutation_importances = None
+        # Référentiel du dépôt figé à l'entraînement (voir fit_baseline)
+        self.feature_baseline = {}
         self.is_trained = False
         
-    def _create_model(self, model_type: str):
-        """Crée le modèle selon le type spécifié"""
+    def _create_model(self, model_type: str, params: Optional[Dict] = None):
+        """Crée le modèle selon le type spécifié (params remplace les valeurs par défaut)"""
+        params = params or {}
         if model_type == 'random_forest':
-            return RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                random_state=42
-            )
+            from sklearn.ensemble import RandomForestClassifier
+            return RandomForestClassifier(**{
+                'n_estimators': 100,
+                'max_depth': 10,
+                'min_samples_split': 5,
+                'min_samples_leaf': 2,
+                'random_state': 42,
+                **params
+            })
         elif model_type == 'gradient_boosting':
-            return GradientBoostingClassifier(
-                n_estimators=100,
-                learning_rate=0.1,
-                max_depth=6,
-                random_state=42
-            )
+            from sklearn.ensemble import GradientBoostingClassifier
+            return GradientBoostingClassifier(**{
+                'n_estimators': 100,
+                'learning_rate': 0.1,
+                'max_depth': 6,
+                'random_state': 42,
+                **params
+            })
         elif model_type == 'logistic':
-            return LogisticRegression(
-                random_state=42,
-                max_iter=1000
-            )
+            from sklearn.linear_model import LogisticRegression
+            return LogisticRegression(**{
+                'random_state': 42,
+                'max_iter': 1000,
+                **params
+            })
+        elif model_type == 'hist_gradient_boosting':
+            from sklearn.ensemble import HistGradientBoostingClassifier
+            return HistGradientBoostingClassifier(**{
+                'max_iter': 200,
+                'learning_rate': 0.1,
+                'max_leaf_nodes': 31,
+                'random_state': 42,
+                **params
+            })
         else:
             raise ValueError(f"Type de modèle non supporté: {model_type}")
     
+    def _native_missing(self) -> bool:
+        """Le modèle courant reçoit les NaN tels quels, sans normalisation"""
+        return self.model_type in self.NATIVE_MISSING_MODELS
+    
+    def _stage(self, name: str, rows: Optional[int] = None):
+        """Mesure d'une étape du pipeline (sans effet si l'instrumentation est désactivée)"""
+        return self.instrumentation.stage(self.COMPONENT, name, rows)
+    
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prépare les features pour l'entraînement ou la prédiction
@@ -80,67 +395,129 @@ class RiskPredictor:
         Returns:
             DataFrame avec les features préparées
         """
-        features = data.copy()
+        with self._stage('prepare_features', rows=len(data)):
+            return self._prepare_features(data, fill_missing=not self._native_missing())
+    
+    def _prepare_features(self, data: pd.DataFrame,
+                          churn_quantiles: Optional[Tuple[float, float]] = None,
+                          fill_missing: bool = True) -> pd.DataFrame:
+        """
+        Construction des features (voir prepare_features)
+        
+        Les colonnes sont assemblées dans un dictionnaire puis le DataFrame
+        est construit une seule fois : pas de copie préalable de l'entrée,
+        pas d'insertions successives, valeurs manquantes remplacées colonne
+        par colonne. Colonnes et ordre sont ceux de la construction
+        historique (colonnes d'origine puis features dérivées).
+        
+        churn_quantiles fixe les quantiles 80 % et 95 % de commit_count
+        (calculés sur data sinon) : un dépôt traité par morceaux garde
+        ainsi les seuils de l'ensemble. Sans fill_missing, les NaN des
+        colonnes numériques et des ratios sont conservés (modèles de
+        NATIVE_MISSING_MODELS).
+        """
+        present = set(data.columns)
+        
+        def column(name: str) -> np.ndarray:
+            return data[name].to_numpy()
+        
+        derived = {}
         
         # Features de complexité de code
-        if 'cyclomatic_complexity' in features.columns:
-            features['complexity_high'] = (features['cyclomatic_complexity'] > 10).astype(int)
-            features['complexity_very_high'] = (features['cyclomatic_complexity'] > 20).astype(int)
+        if 'cyclomatic_complexity' in present:
+            complexity = column('cyclomatic_complexity')
+            derived['complexity_high'] = (complexity > 10).astype(int)
+            derived['complexity_very_high'] = (complexity > 20).astype(int)
         
         # Features de taille
-        if 'lines_of_code' in features.columns:
-            features['loc_large'] = (features['lines_of_code'] > 200).astype(int)
-            features['loc_very_large'] = (features['lines_of_code'] > 500).astype(int)
+        if 'lines_of_code' in present:
+            lines_of_code = column('lines_of_code')
+            derived['loc_large'] = (lines_of_code > 200).astype(int)
+            derived['loc_very_large'] = (lines_of_code > 500).astype(int)
         
-        # Features de changements Git
-        if 'commit_count' in features.columns:
-            features['high_churn'] = (features['commit_count'] > features['commit_count'].quantile(0.8)).astype(int)
-            features['very_high_churn'] = (features['commit_count'] > features['commit_count'].quantile(0.95)).astype(int)
+        # Features de changements Git (les deux quantiles en un seul calcul)
+        if 'commit_count' in present:
+            if churn_quantiles is None:
+                churn_quantiles = data['commit_count'].quantile([0.8, 0.95]).to_numpy()
+            churn_80, churn_95 = churn_quantiles
+            commit_count = column('commit_count')
+            derived['high_churn'] = (commit_count > churn_80).astype(int)
+            derived['very_high_churn'] = (commit_count > churn_95).astype(int)
         
         # Features temporelles
-        if 'file_age_days' in features.columns:
-            features['file_new'] = (features['file_age_days'] < 30).astype(int)
-            features['file_old'] = (features['file_age_days'] > 365).astype(int)
+        if 'file_age_days' in present:
+            file_age = column('file_age_days')
+            derived['file_new'] = (file_age < 30).astype(int)
+            derived['file_old'] = (file_age > 365).astype(int)
         
         # Features d'équipe
-        if 'author_count' in features.columns:
-            features['multiple_authors'] = (features['author_count'] > 1).astype(int)
-            features['many_authors'] = (features['author_count'] > 3).astype(int)
+        if 'author_count' in present:
+            author_count = column('author_count')
+            derived['multiple_authors'] = (author_count > 1).astype(int)
+            derived['many_authors'] = (author_count > 3).astype(int)
         
         # Ratios et interactions
-        if 'lines_added' in features.columns and 'lines_deleted' in features.columns:
-            features['churn_ratio'] = features['lines_added'] / (features['lines_deleted'] + 1)
-            features['total_churn'] = features['lines_added'] + features['lines_deleted']
+        if 'lines_added' in present and 'lines_deleted' in present:
+            lines_added = column('lines_added')
+            lines_deleted = column('lines_deleted')
+            derived['churn_ratio'] = lines_added / (lines_deleted + 1)
+            derived['total_churn'] = lines_added + lines_deleted
         
-        if 'bug_count' in features.columns and 'commit_count' in features.columns:
-            features['bug_density'] = features['bug_count'] / (features['commit_count'] + 1)
+        if 'bug_count' in present and 'commit_count' in present:
+            derived['bug_density'] = column('bug_count') / (column('commit_count') + 1)
         
         # Features de qualité de code
-        if 'code_smells' in features.columns:
-            features['has_code_smells'] = (features['code_smells'] > 0).astype(int)
-            features['many_code_smells'] = (features['code_smells'] > 5).astype(int)
-        
-        # Encodage des variables catégorielles
-        categorical_columns = features.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            if col not in self.label_encoders:
-                self.label_encoders[col] = LabelEncoder()
-                features[col] = self.label_encoders[col].fit_transform(features[col].astype(str))
+        if 'code_smells' in present:
+            code_smells = column('code_smells')
+            derived['has_code_smells'] = (code_smells > 0).astype(int)
+            derived['many_code_smells'] = (code_smells > 5).astype(int)
+        
+        columns = {}
+        for col in data.columns:
+            values = data[col]
+            if values.dtype == object:
+                # Encodage des variables catégorielles
+                columns[col] = self._encode_categorical(col, values)
+            elif fill_missing and values.hasnans:
+                # Gestion des valeurs manquantes
+                columns[col] = values.fillna(0)
             else:
-                # Pour les nouvelles données, utiliser l'encodeur existant
-                try:
-                    features[col] = self.label_encoders[col].transform(features[col].astype(str))
-                except ValueError:
-                    # Gérer les nouvelles catégories non vues pendant l'entraînement
-                    features[col] = 0
+                columns[col] = values
+        for col, values in derived.items():
+            if fill_missing and values.dtype.kind == 'f' and np.isnan(values).any():
+                values = np.where(np.isnan(values), 0, values)
+            columns[col] = values
+        
+        return pd.DataFrame(columns, index=data.index, copy=False)
+    
+    def _encode_categorical(self, col: str, values: pd.Series) -> np.ndarray:
+        """
+        Encode une colonne catégorielle (encodeur créé à la première rencontre)
         
-        # Gestion des valeurs manquantes
-        features = features.fillna(0)
+        Seules les valeurs distinctes passent par l'encodeur ; les codes sont
+        ensuite redistribués sur les lignes.
+        """
+        codes, uniques = pd.factorize(values)
+        if (codes < 0).any():
+            # Valeurs manquantes : None et NaN donnent des chaînes différentes
+            codes, uniques = pd.factorize(values.astype(str))
+        else:
+            uniques = uniques.astype(str)
+        uniques = np.asarray(uniques, dtype=object)
         
-        return features
+        if col not in self.label_encoders:
+            from sklearn.preprocessing import LabelEncoder
+            self.label_encoders[col] = LabelEncoder().fit(uniques)
+        # Pour les nouvelles données, utiliser l'encodeur existant
+        try:
+            encoded = self.label_encoders[col].transform(uniques)
+        except ValueError:
+            # Gérer les nouvelles catégories non vues pendant l'entraînement
+            return np.zeros(len(values), dtype=np.int64)
+        return encoded[codes]
     
     def train(self, data: pd.DataFrame, target_column: str = 'is_buggy', 
-              validation_split: float = 0.2) -> Dict:
+              validation_split: float = 0.2, n_jobs: Optional[int] = None) -> Dict:
         """
         Entraîne le modèle de prédiction de risques
         
@@ -148,15 +525,31 @@ class RiskPredictor:
             data: Données d'entraînement
             target_column: Nom de la colonne cible
             validation_split: Proportion des données pour la validation
+            n_jobs: Processus de la validation croisée (-1 = tous les CPU, en série par défaut)
             
         Returns:
             Métriques d'entraînement
         """
         logger.info(f"Entraînement du modèle {self.model_type} sur {len(data)} échantillons")
         
+        from sklearn.feature_selection import SelectKBest, f_classif
+        from sklearn.metrics import roc_auc_score
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.preprocessing import StandardScaler
+        
+        # Estimateurs neufs (un artefact compact chargé est en lecture seule)
+        if any(isinstance(encoder, CompactLabelEncoder) for encoder in self.label_encoders.values()):
+            self.label_encoders = {}
+        self.model = self._create_model(self.model_type, self.model_params)
+        native_missing = self._native_missing()
+        self.scaler = None if native_missing else StandardScaler()
+        self.feature_selector = SelectKBest(f_classif, k=15)
+        self.permutation_importances = None
+        
         # Préparation des features
         features = self.prepare_features(data.drop(columns=[target_column]))
         target = data[target_column]
+        self.fit_baseline(data)
         
         # Division train/validation
         X_train, X_val, y_train, y_val = train_test_split(
@@ -164,27 +557,40 @@ class RiskPredictor:
             random_state=42, stratify=target
         )
         
-        # Normalisation
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_val_scaled = self.scaler.transform(X_val)
-        
-        # Sélection des features
-        X_train_selected = self.feature_selector.fit_transform(X_train_scaled, y_train)
-        X_val_selected = self.feature_selector.transform(X_val_scaled)
+        # Normalisation et sélection des features
+        with self._stage('scaling', rows=len(features)):
+            if native_missing:
+                # Pas de normalisation ; f_classif ne tolère pas les NaN : scores
+                # calculés sur une copie complétée par 0, NaN conservés pour le modèle
+                X_train_scaled = X_train.to_numpy(dtype=np.float64)
+                X_val_scaled = X_val.to_numpy(dtype=np.float64)
+                self.feature_selector.fit(np.nan_to_num(X_train_scaled, nan=0.0), y_train)
+                support = self.feature_selector.get_support(indices=True)
+                X_train_selected = X_train_scaled[:, support]
+                X_val_selected = X_val_scaled[:, support]
+            else:
+                X_train_scaled = self.scaler.fit_transform(X_train)
+                X_val_scaled = self.scaler.transform(X_val)
+                
+                X_train_selected = self.feature_selector.fit_transform(X_train_scaled, y_train)
+                X_val_selected = self.feature_selector.transform(X_val_scaled)
         
         # Sauvegarde des noms de features sélectionnées
         selected_indices = self.feature_selector.get_support(indices=True)
         self.feature_names = [features.columns[i] for i in selected_indices]
+        self.input_columns = list(features.columns)
         
         # Entraînement
-        self.model.fit(X_train_selected, y_train)
+        with self._stage('fit', rows=len(X_train_selected)):
+            self.model.fit(X_train_selected, y_train)
         self.is_trained = True
         
         # Prédictions
-        y_train_pred = self.model.predict(X_train_selected)
-        y_val_pred = self.model.predict(X_val_selected)
-        y_train_proba = self.model.predict_proba(X_train_selected)[:, 1]
-        y_val_proba = self.model.predict_proba(X_val_selected)[:, 1]
+        with self._stage('scoring', rows=len(features)):
+            y_train_pred = self.model.predict(X_train_selected)
+            y_val_pred = self.model.predict(X_val_selected)
+            y_train_proba = self.model.predict_proba(X_train_selected)[:, 1]
+            y_val_proba = self.model.predict_proba(X_val_selected)[:, 1]
         
         # Calcul des métriques
         metrics = {
@@ -198,13 +604,24 @@ class RiskPredictor:
         }
         
         # Cross-validation
-        cv_scores = cross_val_score(self.model, X_train_selected, y_train, cv=5, scoring='roc_auc')
+        with self._stage('cross_validation', rows=len(X_train_selected)):
+            cv_scores = cross_val_score(self.model, X_train_selected, y_train, cv=5, scoring='roc_auc',
+                                        n_jobs=n_jobs)
         metrics['cv_auc_mean'] = cv_scores.mean()
         metrics['cv_auc_std'] = cv_scores.std()
         
-        # Feature importance
-        if hasattr(self.model, 'feature_importances_'):
-            feature_importance = dict(zip(self.feature_names, self.model.feature_importances_))
+        # Feature importance (par permutation sur la validation pour le
+        # gradient boosting par histogrammes, qui n'en expose pas)
+        if self.model_type == 'hist_gradient_boosting':
+            from sklearn.inspection import permutation_importance
+            
+            with self._stage('feature_importance', rows=len(X_val_selected)):
+                result = permutation_importance(self.model, X_val_selected, y_val, scoring='roc_auc',
+                                                n_repeats=5, random_state=42, n_jobs=n_jobs)
+            self.permutation_importances = result.importances_mean.tolist()
+        importances = self._feature_importances()
+        if importances is not None:
+            feature_importance = dict(zip(self.feature_names, importances))
             metrics['feature_importance'] = sorted(feature_importance.items(), 
                                                  key=lambda x: x[1], reverse=True)
         
@@ -212,6 +629,232 @@ class RiskPredictor:
         
         return metrics
     
+    def tune(self, data: pd.DataFrame, target_column: str = 'is_buggy',
+             search_space: Optional[Dict[str, List[Dict]]] = None, cv: int = 5,
+             factor: int = 3, min_resources: int = 500, n_jobs: int = -1,
+             cache_path: Optional[str] = None, refit: bool = True) -> Dict:
+        """
+        Recherche d'hyperparamètres par réductions successives (successive halving)
+        
+        Tous les candidats (types de modèle x paramètres) sont évalués en
+        validation croisée sur un sous-échantillon des lignes ; le meilleur
+        tiers (1/factor) passe au tour suivant avec factor fois plus de
+        lignes, jusqu'au jeu complet. Features, normalisation et sélection
+        sont calculées une fois par pli (et par prétraitement : valeurs
+        manquantes conservées sans normalisation pour NATIVE_MISSING_MODELS,
+        comme dans train) puis partagées par tous les candidats et tous les
+        tours ; les entraînements (candidat, pli)
+        d'un tour s'exécutent en parallèle. Les scores sont mis en cache par
+        (données, pli, taille, candidat) : une nouvelle recherche ne refait
+        que les évaluations manquantes.
+        
+        Args:
+            data: Données d'entraînement
+            target_column: Nom de la colonne cible
+            search_space: {type de modèle: [paramètres, ...]} (SEARCH_SPACE par défaut)
+            cv: Nombre de plis
+            factor: Facteur de réduction des candidats et de croissance des lignes
+            min_resources: Lignes d'entraînement par pli au premier tour
+            n_jobs: Processus parallèles (-1 = tous les CPU)
+            cache_path: Fichier JSON du cache des scores (aucun cache si None)
+            refit: Entraîne ensuite le prédicteur avec le meilleur candidat
+            
+        Returns:
+            Meilleur candidat, scores de chaque tour, nombre d'entraînements,
+            d'évaluations servies par le cache et durée ; métriques de
+            l'entraînement final si refit
+        """
+        from joblib import Parallel, delayed
+        
+        start = time.perf_counter()
+        search_space = search_space or self.SEARCH_SPACE
+        unknown = set(search_space) - set(self.MODEL_TYPES)
+        if unknown:
+            raise ValueError(f"Types de modèle non supportés: {sorted(unknown)}")
+        candidates = [(model_type, dict(params))
+                      for model_type, grid in search_space.items() for params in grid]
+        if not candidates:
+            raise ValueError("Espace de recherche vide")
+        
+        native_missing = {model_type in self.NATIVE_MISSING_MODELS for model_type, _ in candidates}
+        with self._stage('prepare_features', rows=len(data)):
+            folds, fingerprint = self._tuning_folds(data, target_column, cv, native_missing)
+        
+        def fold_data(model_type: str, fold: int) -> Tuple:
+            return folds[model_type in self.NATIVE_MISSING_MODELS][fold]
+        
+        # Mêmes plis pour chaque prétraitement
+        max_resources = min(len(fold[1]) for fold in next(iter(folds.values())))
+        # Autant de tours que nécessaire pour départager les candidats, sans
+        # descendre sous min_resources lignes au premier tour
+        needed = int(np.ceil(np.log(len(candidates)) / np.log(factor) - 1e-9))
+        possible = int(np.floor(np.log(max(max_resources / min_resources, 1)) / np.log(factor) + 1e-9))
+        n_rounds = 1 + min(needed, possible)
+        
+        cache = self._load_tuning_cache(cache_path)
+        report = {'rounds': [], 'fits': 0, 'cache_hits': 0}
+        
+        for round_index in range(n_rounds):
+            # Le dernier tour utilise toutes les lignes d'entraînement des plis
+            resources = (max_resources if round_index == n_rounds - 1
+                         else min(min_resources * factor ** round_index, max_resources))
+            keys = [self._tuning_key(fingerprint, cv, fold, resources, model_type, params)
+                    for model_type, params in candidates for fold in range(cv)]
+            missing = [i for i, key in enumerate(keys) if key not in cache]
+            report['cache_hits'] += len(keys) - len(missing)
+            report['fits'] += len(missing)
+            
+            with self._stage('cross_validation', rows=resources * len(missing)):
+                scores = Parallel(n_jobs=n_jobs)(
+                    delayed(_fit_and_score)(*candidates[i // cv], *fold_data(candidates[i // cv][0], i % cv),
+                                            resources)
+                    for i in missing
+                )
+            if missing:
+                cache.update({keys[i]: score for i, score in zip(missing, scores)})
+                # Sauvegarde à chaque tour : une recherche interrompue reprend où elle s'est arrêtée
+                self._save_tuning_cache(cache_path, cache)
+            
+            fold_scores = np.array([cache[key] for key in keys]).reshape(len(candidates), cv)
+            means = fold_scores.mean(axis=1)
+            ranking = np.argsort(-means, kind='stable')
+            report['rounds'].append({
+                'resources': int(resources),
+                'candidates': len(candidates),
+                'results': [{'model_type': candidates[i][0], 'params': candidates[i][1],
+                             'cv_auc_mean': float(means[i]), 'cv_auc_std': float(fold_scores[i].std())}
+                            for i in ranking]
+            })
+            if round_index < n_rounds - 1:
+                keep = max(1, int(np.ceil(len(candidates) / factor)))
+                candidates = [candidates[i] for i in ranking[:keep]]
+        
+        best = report['rounds'][-1]['results'][0]
+        report.update({'best_model_type': best['model_type'], 'best_params': best['params'],
+                       'best_cv_auc': best['cv_auc_mean'], 'seconds': time.perf_counter() - start})
+        logger.info(f"Recherche terminée en {report['seconds']:.1f}s ({report['fits']} entraînements, "
+                    f"{report['cache_hits']} en cache) : {best['model_type']} {best['params']} "
+                    f"AUC {best['cv_auc_mean']:.3f}")
+        
+        if refit:
+            self.model_type = best['model_type']
+            self.model_params = dict(best['params'])
+            report['train_metrics'] = self.train(data, target_column, n_jobs=n_jobs)
+        return report
+    
+    def _tuning_folds(self, data: pd.DataFrame, target_column: str, cv: int,
+                      native_missing: Iterable[bool] = (False,)):
+        """
+        Plis de la recherche : {native_missing: [(X_train, y_train, X_val, y_val), ...]}
+        
+        Prétraitement de train ajusté sur la partie entraînement de chaque
+        pli : valeurs manquantes remplacées par 0, normalisation puis
+        sélection ; ou, pour native_missing=True, NaN conservés, sans
+        normalisation, sélection ajustée sur une copie complétée par 0. Les
+        lignes d'entraînement sont ordonnées de façon à ce que tout préfixe
+        garde la proportion de chaque classe : les sous-échantillons des
+        premiers tours sont de simples tranches.
+        """
+        from sklearn.feature_selection import SelectKBest, f_classif
+        from sklearn.model_selection import StratifiedKFold
+        from sklearn.preprocessing import StandardScaler
+        
+        native_missing = sorted(set(native_missing))
+        features = self._prepare_features(data.drop(columns=[target_column]), fill_missing=False)
+        target = data[target_column].to_numpy()
+        matrix = features.to_numpy(dtype=np.float64)
+        # Complétion de _prepare_features (NaN -> 0) pour les autres modèles
+        filled = np.where(np.isnan(matrix), 0.0, matrix)
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(matrix).tobytes())
+        digest.update(np.asarray(target, dtype=np.float64).tobytes())
+        digest.update(json.dumps(list(features.columns)).encode())
+        
+        rng = np.random.default_rng(42)
+        folds = {native: [] for native in native_missing}
+        splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+        for train_index, val_index in splitter.split(matrix, target):
+            # Rang dans la classe / effectif de la classe : classes entrelacées
+            y_train = target[train_index]
+            position = np.empty(len(train_index))
+            for label in np.unique(y_train):
+                members = np.flatnonzero(y_train == label)
+                position[rng.permutation(members)] = (np.arange(len(members)) + rng.random()) / len(members)
+            train_index = train_index[np.argsort(position, kind='stable')]
+            
+            selector = SelectKBest(f_classif, k=min(15, matrix.shape[1]))
+            for native in native_missing:
+                if native:
+                    selector.fit(filled[train_index], target[train_index])
+                    support = selector.get_support(indices=True)
+                    X_train = matrix[np.ix_(train_index, support)]
+                    X_val = matrix[np.ix_(val_index, support)]
+                else:
+                    scaler = StandardScaler().fit(filled[train_index])
+                    X_train = selector.fit_transform(scaler.transform(filled[train_index]), target[train_index])
+                    X_val = selector.transform(scaler.transform(filled[val_index]))
+                folds[native].append((np.ascontiguousarray(X_train), target[train_index],
+                                      np.ascontiguousarray(X_val), target[val_index]))
+        return folds, digest.hexdigest()
+    
+    @staticmethod
+    def _tuning_key(fingerprint: str, cv: int, fold: int, resources: int,
+                    model_type: str, params: Dict) -> str:
+        return json.dumps([fingerprint, cv, fold, resources, model_type, params], sort_keys=True)
+    
+    @staticmethod
+    def _load_tuning_cache(cache_path: Optional[str]) -> Dict[str, float]:
+        if cache_path is None or not Path(cache_path).exists():
+            return {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de recherche {cache_path} illisible, ignoré: {e}")
+            return {}
+    
+    @staticmethod
+    def _save_tuning_cache(cache_path: Optional[str], cache: Dict[str, float]):
+        if cache_path is None:
+            return
+        temporary = Path(f'{cache_path}.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        temporary.replace(cache_path)
+    
+    def fit_baseline(self, metrics_table: pd.DataFrame) -> Dict:
+        """
+        Fige le référentiel du dépôt utilisé pour évaluer des sous-ensembles
+        
+        Les seuils de high_churn et very_high_churn sont des quantiles de
+        commit_count : calculés sur un petit lot (les fichiers d'une PR),
+        ils n'ont plus de sens. Le référentiel garde ceux du dépôt entier
+        (table d'entraînement par défaut, appel explicite pour le recalculer
+        sur les métriques courantes sans réentraîner) ; il est sauvegardé
+        avec le modèle, comme les encodeurs des colonnes catégorielles.
+        
+        Args:
+            metrics_table: Métriques de tous les fichiers du dépôt
+            
+        Returns:
+            Référentiel (quantiles 80 % et 95 % de commit_count, nombre de fichiers)
+        """
+        baseline = {'files': int(len(metrics_table))}
+        if 'commit_count' in metrics_table.columns:
+            quantiles = metrics_table['commit_count'].quantile([0.8, 0.95]).to_numpy()
+            baseline['churn_quantiles'] = [float(value) for value in quantiles]
+        self.feature_baseline = baseline
+        return baseline
+    
+    def _baseline_churn_quantiles(self) -> Optional[Tuple[float, float]]:
+        """Quantiles de commit_count du référentiel figé"""
+        if not self.feature_baseline:
+            raise ValueError("Aucun référentiel de features : entraîner le modèle "
+                             "ou appeler fit_baseline sur les métriques du dépôt")
+        quantiles = self.feature_baseline.get('churn_quantiles')
+        return None if quantiles is None else tuple(quantiles)
+    
     def predict_risk(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prédit les risques pour de nouvelles données
@@ -225,50 +868,67 @@ class RiskPredictor:
         if not self.is_trained:
             raise ValueError("Le modèle doit être entraîné avant la prédiction")
         
+        features_selected = self._selected_features(data)
+        
+        # Prédictions
+        with self._stage('scoring', rows=len(features_selected)):
+            risk_probabilities = self.model.predict_proba(features_selected)[:, 1]
+            risk_predictions = self.model.predict(features_selected)
+        
+        # Création du DataFrame de résultats
+        with self._stage('results', rows=len(data)):
+            results = data.copy()
+            results['risk_probability'] = risk_probabilities
+            results['risk_prediction'] = risk_predictions
+            results['risk_level'] = self._categorize_risk(risk_probabilities)
+        
+        return results
+    
+    def _selected_features(self, data: pd.DataFrame,
+                           churn_quantiles: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """Features préparées, normalisées et sélectionnées, prêtes pour le modèle"""
+        native_missing = self.scaler is None
+        
         # Préparation des features
-        features = self.prepare_features(data)
+        with self._stage('prepare_features', rows=len(data)):
+            features = self._prepare_features(data, churn_quantiles, fill_missing=not native_missing)
         
         # S'assurer que toutes les features sont présentes
         for feature in self.feature_names:
             if feature not in features.columns:
-                features[feature] = 0
-        
-        # Normalisation et sélection
-        features_scaled = self.scaler.transform(features)
-        features_selected = self.feature_selector.transform(features_scaled)
-        
-        # Prédictions
-        risk_probabilities = self.model.predict_proba(features_selected)[:, 1]
-        risk_predictions = self.model.predict(features_selected)
+                features[feature] = np.nan if native_missing else 0
         
-        # Création du DataFrame de résultats
-        results = data.copy()
-        results['risk_probability'] = risk_probabilities
-        results['risk_prediction'] = risk_predictions
-        results['risk_level'] = self._categorize_risk(risk_probabilities)
+        # Colonnes vues à l'entraînement, dans leur ordre (métriques absentes
+        # du lot à 0, ou manquantes pour un modèle qui gère les NaN)
+        columns_in = self.input_columns or getattr(self.scaler, 'feature_names_in_', None)
+        if columns_in is not None and list(features.columns) != list(columns_in):
+            features = features.reindex(columns=list(columns_in),
+                                        fill_value=np.nan if native_missing else 0)
         
-        return results
+        # Normalisation et sélection
+        with self._stage('scaling', rows=len(features)):
+            if native_missing:
+                support = self.feature_selector.get_support(indices=True)
+                return features.to_numpy(dtype=np.float64)[:, support]
+            features_scaled = self.scaler.transform(features)
+            return self.feature_selector.transform(features_scaled)
     
     def _categorize_risk(self, probabilities: np.ndarray) -> List[str]:
         """Catégorise les probabilités de risque en niveaux"""
-        categories = []
-        for prob in probabilities:
-            if prob >= 0.8:
-                categories.append('ÉLEVÉ')
-            elif prob >= 0.6:
-                categories.append('MOYEN-ÉLEVÉ')
-            elif prob >= 0.4:
-                categories.append('MOYEN')
-            elif prob >= 0.2:
-                categories.append('FAIBLE-MOYEN')
-            else:
-                categories.append('FAIBLE')
-        return categories
+        probabilities = np.asarray(probabilities, dtype=float)
+        # Intervalle [seuil, seuil suivant) de chaque probabilité ; NaN -> FAIBLE
+        levels = np.digitize(probabilities, self.RISK_THRESHOLDS)
+        levels[np.isnan(probabilities)] = 0
+        return self._RISK_LEVEL_ARRAY[levels].tolist()
     
     def analyze_file_risk(self, file_path: str, metrics: Dict) -> Dict:
         """
         Analyse le risque d'un fichier spécifique
         
+        Chemin d'analyze_repository pour une seule ligne : les seuils de
+        churn sont ceux du référentiel figé (fit_baseline) s'il existe, les
+        quantiles d'un fichier isolé n'ayant pas de sens.
+        
         Args:
             file_path: Chemin du fichier
             metrics: Métriques du fichier
@@ -276,86 +936,249 @@ class RiskPredictor:
         Returns:
             Analyse détaillée du risque
         """
-        # Créer un DataFrame avec les métriques du fichier
-        file_data = pd.DataFrame([metrics])
-        
-        # Prédire le risque
-        risk_result = self.predict_risk(file_data)
+        file_data = pd.DataFrame([{**metrics, 'file_path': file_path}])
+        result = self.analyze_repository(file_data, baseline=bool(self.feature_baseline)).iloc[0]
         
-        analysis = {
+        return {
             'file_path': file_path,
-            'risk_probability': float(risk_result['risk_probability'].iloc[0]),
-            'risk_level': risk_result['risk_level'].iloc[0],
-            'risk_factors': self._identify_risk_factors(metrics),
-            'recommendations': self._generate_recommendations(metrics, risk_result['risk_probability'].iloc[0])
+            'risk_probability': float(result['risk_probability']),
+            'risk_level': result['risk_level'],
+            'risk_factors': result['risk_factors'],
+            'recommendations': result['recommendations']
         }
-        
-        return analysis
     
-    def _identify_risk_factors(self, metrics: Dict) -> List[str]:
-        """Identifie les facteurs de risque principaux"""
-        factors = []
+    def analyze_repository(self, metrics_table, path_column: str = 'file_path',
+                           top_n: Optional[int] = None,
+                           chunk_size: Optional[int] = None,
+                           baseline: bool = False) -> pd.DataFrame:
+        """
+        Analyse le risque de tous les fichiers d'un dépôt
+        
+        Un seul appel au modèle pour l'ensemble des fichiers ; facteurs de
+        risque et recommandations (mêmes règles qu'analyze_file_risk) sont
+        obtenus par masques sur les colonnes de métriques, une métrique
+        absente comptant pour 0.
         
-        if metrics.get('cyclomatic_complexity', 0) > 10:
-            factors.append(f"Complexité élevée ({metrics['cyclomatic_complexity']})")
+        Mode flux (chunk_size, fichier CSV ou itérable de DataFrames) : les
+        fichiers sont évalués par morceaux et seuls les chemins, probabilités
+        et métriques des règles sont conservés (les top_n plus risqués si
+        top_n est donné). Les quantiles de commit_count sont ceux du dépôt
+        entier pour un DataFrame ou un CSV (lecture préalable de la seule
+        colonne), ceux du premier morceau pour un itérable.
         
-        if metrics.get('lines_of_code', 0) > 300:
-            factors.append(f"Fichier volumineux ({metrics['lines_of_code']} lignes)")
+        Avec baseline, les quantiles sont ceux du référentiel figé
+        (fit_baseline) : c'est le mode à utiliser pour un sous-ensemble du
+        dépôt, comme les fichiers modifiés par une PR.
         
-        if metrics.get('commit_count', 0) > 20:
-            factors.append(f"Nombreuses modifications ({metrics['commit_count']} commits)")
+        Args:
+            metrics_table: DataFrame de métriques (un fichier par ligne), chemin
+                d'un CSV ou itérable de DataFrames
+            path_column: Colonne des chemins de fichiers (index du DataFrame si absente)
+            top_n: Ne garder que les top_n fichiers les plus risqués
+            chunk_size: Taille des morceaux en mode flux (STREAM_CHUNK_SIZE pour
+                un CSV ou un itérable)
+            baseline: Évalue avec le référentiel figé plutôt qu'avec les
+                quantiles de la table
+            
+        Returns:
+            DataFrame trié par risque décroissant : path_column, risk_probability,
+            risk_level, risk_factors et recommendations (listes)
+        """
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné avant la prédiction")
+        if top_n is not None and top_n < 0:
+            raise ValueError("top_n doit être positif")
         
-        if metrics.get('author_count', 0) > 3:
-            factors.append(f"Nombreux contributeurs ({metrics['author_count']} auteurs)")
+        frozen = self._baseline_churn_quantiles() if baseline else None
         
-        if metrics.get('bug_count', 0) > 0:
-            factors.append(f"Historique de bugs ({metrics['bug_count']} bugs)")
+        if isinstance(metrics_table, pd.DataFrame) and chunk_size is None:
+            scored = self._score_repository_chunk(metrics_table, path_column, frozen)
+        else:
+            scored = None
+            for chunk, churn_quantiles in self._repository_chunks(metrics_table, chunk_size,
+                                                                  compute_quantiles=not baseline):
+                chunk_scores = self._score_repository_chunk(chunk, path_column,
+                                                            frozen if baseline else churn_quantiles)
+                # Les candidats déjà retenus précèdent le morceau : ordre d'origine
+                # conservé pour départager les égalités
+                scored = chunk_scores if scored is None else pd.concat(
+                    [scored, chunk_scores], ignore_index=True, copy=False)
+                if top_n is not None:
+                    scored = scored.nlargest(top_n, 'risk_probability').sort_index(kind='stable')
+                    scored.reset_index(drop=True, inplace=True)
+            if scored is None:
+                scored = pd.DataFrame({path_column: [], 'risk_probability': np.array([], dtype=float)})
         
-        return factors
+        with self._stage('results', rows=len(scored)):
+            order = np.argsort(-scored['risk_probability'].to_numpy(), kind='stable')
+            if top_n is not None:
+                order = order[:top_n]
+            scored = scored.iloc[order].reset_index(drop=True)
+            probabilities = scored['risk_probability'].to_numpy()
+            
+            return pd.DataFrame({
+                path_column: scored[path_column].to_numpy(),
+                'risk_probability': probabilities,
+                'risk_level': self._categorize_risk(probabilities),
+                'risk_factors': self._risk_factor_columns(scored),
+                'recommendations': self._recommendation_columns(scored, probabilities),
+            })
     
-    def _generate_recommendations(self, metrics: Dict, risk_prob: float) -> List[str]:
-        """Génère des recommandations basées sur l'analyse"""
-        recommendations = []
+    def _repository_chunks(self, source, chunk_size: Optional[int], compute_quantiles: bool = True):
+        """Morceaux (DataFrame, quantiles de commit_count) du mode flux d'analyze_repository"""
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        if chunk_size <= 0:
+            raise ValueError("chunk_size doit être strictement positif")
         
-        if risk_prob > 0.8:
-            recommendations.append("🔴 PRIORITÉ ÉLEVÉE: Refactoring immédiat recommandé")
-            recommendations.append("📋 Code review obligatoire pour toute modification")
-            recommendations.append("🧪 Augmenter la couverture de tests")
+        def quantiles(values: pd.Series) -> Tuple[float, float]:
+            return tuple(values.quantile([0.8, 0.95]).to_numpy())
         
-        if metrics.get('cyclomatic_complexity', 0) > 15:
-            recommendations.append("🔧 Réduire la complexité cyclomatique")
-            recommendations.append("📦 Diviser en fonctions plus petites")
+        if isinstance(source, pd.DataFrame):
+            churn = (quantiles(source['commit_count'])
+                     if compute_quantiles and 'commit_count' in source.columns else None)
+            for start in range(0, len(source), chunk_size):
+                yield source.iloc[start:start + chunk_size], churn
+        elif isinstance(source, (str, Path)):
+            header = pd.read_csv(source, nrows=0).columns
+            churn = (quantiles(pd.read_csv(source, usecols=['commit_count'])['commit_count'])
+                     if compute_quantiles and 'commit_count' in header else None)
+            with pd.read_csv(source, chunksize=chunk_size) as reader:
+                for chunk in reader:
+                    yield chunk, churn
+        else:
+            churn = None
+            for chunk in source:
+                if compute_quantiles and churn is None and 'commit_count' in chunk.columns:
+                    churn = quantiles(chunk['commit_count'])
+                yield chunk, churn
+    
+    def _score_repository_chunk(self, chunk: pd.DataFrame, path_column: str,
+                                churn_quantiles: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+        """Chemins, probabilités de risque et métriques des règles d'un morceau de dépôt"""
+        if path_column in chunk.columns:
+            paths = chunk[path_column].to_numpy()
+            metrics = chunk.drop(columns=[path_column])
+        else:
+            paths = chunk.index.to_numpy()
+            metrics = chunk
         
-        if metrics.get('lines_of_code', 0) > 500:
-            recommendations.append("✂️ Diviser le fichier en modules plus petits")
+        if len(chunk):
+            features_selected = self._selected_features(metrics, churn_quantiles)
+            with self._stage('scoring', rows=len(features_selected)):
+                probabilities = self.model.predict_proba(features_selected)[:, 1]
+        else:
+            probabilities = np.array([], dtype=float)
         
-        if metrics.get('commit_count', 0) > 30:
-            recommendations.append("🔍 Analyser les raisons des modifications fréquentes")
+        scored = {path_column: paths, 'risk_probability': probabilities}
+        for metric in self._rule_metrics():
+            if metric in metrics.columns:
+                scored[metric] = metrics[metric].to_numpy()
+        return pd.DataFrame(scored, copy=False)
+    
+    def _rule_metrics(self) -> List[str]:
+        """Métriques utilisées par les règles de facteurs et de recommandations"""
+        metrics = [metric for metric, _, _ in self.RISK_FACTOR_RULES]
+        metrics += [metric for metric, _, _ in self.RECOMMENDATION_RULES
+                    if metric is not None and metric not in metrics]
+        return metrics
+    
+    def _risk_factor_columns(self, table: pd.DataFrame) -> List[List[str]]:
+        """Facteurs de risque de chaque ligne, une règle (un masque) à la fois"""
+        labels = []
+        for metric, threshold, template in self.RISK_FACTOR_RULES:
+            if metric not in table.columns:
+                continue
+            values = table[metric].to_numpy()
+            mask = values > threshold
+            if not mask.any():
+                continue
+            column = np.full(len(table), None, dtype=object)
+            column[mask] = [template.format(value) for value in values[mask].tolist()]
+            labels.append(column)
         
-        if not recommendations:
-            recommendations.append("✅ Fichier dans les normes, surveillance continue")
+        if not labels:
+            return [[] for _ in range(len(table))]
+        return [[label for label in row if label is not None] for row in zip(*labels)]
+    
+    def _recommendation_columns(self, table: pd.DataFrame,
+                                probabilities: np.ndarray) -> List[List[str]]:
+        """
+        Recommandations de chaque ligne
         
-        return recommendations
+        Chaque règle déclenchée allume un bit ; les recommandations ne
+        dépendent que de cette combinaison, construite une fois par
+        combinaison présente.
+        """
+        codes = np.zeros(len(table), dtype=np.int64)
+        for bit, (metric, threshold, _) in enumerate(self.RECOMMENDATION_RULES):
+            if metric is None:
+                values = probabilities
+            elif metric in table.columns:
+                values = table[metric].to_numpy()
+            else:
+                continue
+            codes |= (values > threshold).astype(np.int64) << bit
+        
+        combinations = {}
+        for code in np.unique(codes).tolist():
+            recommendations = [recommendation
+                               for bit, (_, _, rule) in enumerate(self.RECOMMENDATION_RULES)
+                               if code >> bit & 1 for recommendation in rule]
+            combinations[code] = recommendations or [self.DEFAULT_RECOMMENDATION]
+        return [list(combinations[code]) for code in codes.tolist()]
     
-    def save_model(self, filepath: str):
-        """Sauvegarde le modèle entraîné"""
+    def save_model(self, filepath: str, compact: bool = False):
+        """
+        Sauvegarde le modèle entraîné
+        
+        Args:
+            filepath: Fichier joblib, ou répertoire de l'artefact compact
+            compact: Écrit un manifeste JSON et des tableaux NumPy (.npy)
+                     mappables en mémoire au lieu d'un pickle joblib
+        """
         if not self.is_trained:
             raise ValueError("Aucun modèle entraîné à sauvegarder")
         
+        if compact:
+            self._save_compact(Path(filepath))
+            logger.info(f"Modèle compact sauvegardé dans {filepath}")
+            return
+        if isinstance(self.model, CompactClassifier):
+            raise ValueError("Un modèle compact ne peut être sauvegardé qu'au format compact")
+        
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_selector': self.feature_selector,
             'label_encoders': self.label_encoders,
             'feature_names': self.feature_names,
+            'input_columns': self.input_columns,
+            'permutation_importances': self.permutation_importances,
+            'feature_baseline': self.feature_baseline,
             'model_type': self.model_type
         }
         
+        import joblib
+        
         joblib.dump(model_data, filepath)
         logger.info(f"Modèle sauvegardé dans {filepath}")
     
-    def load_model(self, filepath: str):
-        """Charge un modèle pré-entraîné"""
+    def load_model(self, filepath: str, mmap: bool = True):
+        """
+        Charge un modèle pré-entraîné
+        
+        Args:
+            filepath: Fichier joblib ou répertoire d'un artefact compact
+            mmap: Mappe en mémoire les tableaux d'un artefact compact
+                  (lecture seule, pages partagées entre processus)
+        """
+        if Path(filepath).is_dir():
+            self._load_compact(Path(filepath), mmap=mmap)
+            logger.info(f"Modèle compact chargé depuis {filepath}")
+            return
+        
+        import joblib
+        
         model_data = joblib.load(filepath)
         
         self.model = model_data['model']
@@ -363,20 +1186,122 @@ class RiskPredictor:
         self.feature_selector = model_data['feature_selector']
         self.label_encoders = model_data['label_encoders']
         self.feature_names = model_data['feature_names']
+        self.input_columns = model_data.get('input_columns', [])
+        self.permutation_importances = model_data.get('permutation_importances')
+        self.feature_baseline = model_data.get('feature_baseline', {})
         self.model_type = model_data['model_type']
         self.is_trained = True
         
         logger.info(f"Modèle chargé depuis {filepath}")
     
+    def _save_compact(self, directory: Path):
+        """Écrit l'artefact compact : manifest.json + un fichier .npy par tableau"""
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        if isinstance(self.model, CompactClassifier):
+            exported = (self.model.kind, self.model.arrays, self.model.params)
+        else:
+            exported = CompactClassifier.export(self.model)
+        
+        arrays = {'selector_support': self.feature_selector.get_support(indices=True)}
+        if self.scaler is not None:
+            arrays.update({'scaler_mean': self.scaler.mean_, 'scaler_scale': self.scaler.scale_})
+        if exported is None:
+            # Modèle non supporté par le format compact : pickle joblib dans l'artefact
+            import joblib
+            
+            model_entry = {'kind': 'joblib', 'file': 'model.joblib'}
+            joblib.dump(self.model, directory / 'model.joblib')
+        else:
+            kind, model_arrays, params = exported
+            model_entry = {'kind': kind, 'params': params}
+            arrays.update({f'model_{name}': values for name, values in model_arrays.items()})
+        
+        for name, values in arrays.items():
+            np.save(directory / f'{name}.npy', np.ascontiguousarray(values))
+        
+        scaler_names = getattr(self.scaler, 'feature_names_in_', None)
+        manifest = {
+            'format': ARTIFACT_FORMAT,
+            'version': ARTIFACT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'model_type': self.model_type,
+            'feature_names': self.feature_names,
+            'scaler_feature_names': None if scaler_names is None else list(scaler_names),
+            'input_columns': self.input_columns,
+            'selector_input_features': int(self.feature_selector.n_features_in_),
+            'permutation_importances': self.permutation_importances,
+            'label_encoders': {col: [str(c) for c in encoder.classes_]
+                               for col, encoder in self.label_encoders.items()},
+            'feature_baseline': self.feature_baseline,
+            'model': model_entry,
+            'arrays': {name: f'{name}.npy' for name in arrays}
+        }
+        with open(directory / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+    
+    def _load_compact(self, directory: Path, mmap: bool = True):
+        """Charge un artefact compact (modèle en lecture seule)"""
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(f"Artefact inattendu dans {directory}: {manifest.get('format')}")
+        if manifest.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Version d'artefact non supportée: {manifest.get('version')} "
+                             f"(attendue: {ARTIFACT_VERSION})")
+        
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(directory / filename, mmap_mode=mmap_mode)
+                  for name, filename in manifest['arrays'].items()}
+        
+        model_entry = manifest['model']
+        if model_entry['kind'] == 'joblib':
+            import joblib
+            
+            self.model = joblib.load(directory / model_entry['file'])
+        else:
+            model_arrays = {name[len('model_'):]: values for name, values in arrays.items()
+                            if name.startswith('model_')}
+            self.model = CompactClassifier(model_entry['kind'], model_arrays, model_entry['params'])
+        
+        # Pas de normalisation pour les modèles de NATIVE_MISSING_MODELS
+        self.scaler = (CompactScaler(arrays['scaler_mean'], arrays['scaler_scale'],
+                                     manifest['scaler_feature_names'])
+                       if 'scaler_mean' in arrays else None)
+        # Artefacts antérieurs : une colonne d'entrée du sélecteur par colonne de features
+        self.feature_selector = CompactSelector(np.array(arrays['selector_support']),
+                                                manifest.get('selector_input_features',
+                                                             len(manifest.get('input_columns') or [])))
+        self.label_encoders = {col: CompactLabelEncoder(classes)
+                               for col, classes in manifest['label_encoders'].items()}
+        self.feature_names = manifest['feature_names']
+        self.input_columns = manifest.get('input_columns', [])
+        self.permutation_importances = manifest.get('permutation_importances')
+        self.feature_baseline = manifest.get('feature_baseline', {})
+        self.model_type = manifest['model_type']
+        self.is_trained = True
+    
+    def _feature_importances(self) -> Optional[np.ndarray]:
+        """Importance des features sélectionnées (du modèle, ou par permutation)"""
+        if hasattr(self.model, 'feature_importances_'):
+            return np.asarray(self.model.feature_importances_)
+        if self.permutation_importances is not None:
+            return np.asarray(self.permutation_importances)
+        return None
+    
     def plot_feature_importance(self, top_n: int = 15):
         """Affiche l'importance des features"""
-        if not hasattr(self.model, 'feature_importances_'):
+        importances = self._feature_importances()
+        if importances is None:
             logger.warning("Le modèle ne supporte pas l'importance des features")
             return
         
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         importance_df = pd.DataFrame({
             'feature': self.feature_names,
-            'importance': self.model.feature_importances_
+            'importance': importances
         }).sort_values('importance', ascending=False).head(top_n)
         
         plt.figure(figsize=(10, 8))
@@ -426,6 +1351,13 @@ def main():
     print(f"  Niveau de risque: {analysis['risk_level']}")
     print(f"  Facteurs de risque: {analysis['risk_factors']}")
     print(f"  Recommandations: {analysis['recommendations']}")
+    
+    # Analyse d'un dépôt entier, fichiers triés par risque décroissant
+    repository = sample_data.drop(columns=['is_buggy'])
+    repository.insert(0, 'file_path', [f'src/module_{i}.py' for i in range(len(repository))])
+    print("\nFichiers les plus risqués du dépôt:")
+    for row in predictor.analyze_repository(repository, top_n=3).itertuples():
+        print(f"  {row.file_path}: {row.risk_probability:.2%} ({row.risk_level})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Configuration pytest des tests de l'exercice
+
+Lancement :
+    pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
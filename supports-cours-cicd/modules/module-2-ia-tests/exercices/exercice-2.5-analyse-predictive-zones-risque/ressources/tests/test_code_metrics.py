@@ -0,0 +1,74 @@
+"""Tests de l'extraction des métriques de code (imbrication, fichiers illisibles)"""
+
+import os
+
+import pytest
+
+from extract_code_metrics import CodeMetricsExtractor, compute_metrics
+
+ELIF_CHAIN = """
+def route(code):
+    if code == 1:
+        return 'a'
+    elif code == 2:
+        return 'b'
+    elif code == 3:
+        return 'c'
+    elif code == 4:
+        return 'd'
+    elif code == 5:
+        return 'e'
+    elif code == 6:
+        return 'f'
+    else:
+        return 'g'
+"""
+
+DEEP_NESTING = """
+def walk(rows):
+    for row in rows:
+        if row:
+            for cell in row:
+                while cell:
+                    if cell > 1:
+                        cell -= 1
+"""
+
+
+def test_elif_chain_does_not_deepen_nesting():
+    metrics = compute_metrics(ELIF_CHAIN)
+    assert metrics['cyclomatic_complexity'] == 7
+    assert metrics['code_smells'] == 0
+
+
+def test_deep_nesting_is_still_a_smell():
+    assert compute_metrics(DEEP_NESTING)['code_smells'] == 1
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason="liens symboliques indisponibles")
+@pytest.mark.parametrize('cache', [False, True])
+def test_broken_symlink_is_skipped(tmp_path, cache):
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'ok.py').write_text('x = 1\n')
+    (project / 'broken.py').symlink_to(project / 'missing.py')
+
+    extractor = CodeMetricsExtractor(cache_path=tmp_path / 'cache.json' if cache else None, max_workers=1)
+    table = extractor.extract(project)
+    assert table['file_path'].tolist() == ['ok.py']
+    assert extractor.stats['files'] == 1
+
+
+def test_file_unreadable_at_analysis_is_skipped(tmp_path, monkeypatch):
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'a.py').write_text('x = 1\n')
+    (project / 'b.py').write_text('y = 2\n')
+
+    extractor = CodeMetricsExtractor(max_workers=1)
+    # b.py disparaît entre le calcul de l'empreinte et l'analyse
+    run = extractor._run
+    monkeypatch.setattr(extractor, '_run', lambda paths: (os.remove(project / 'b.py'), run(paths))[1])
+    table = extractor.extract(project)
+    assert table['file_path'].tolist() == ['a.py']
+    assert (extractor.stats['files'], extractor.stats['analyzed'], extractor.stats['cached']) == (1, 1, 0)
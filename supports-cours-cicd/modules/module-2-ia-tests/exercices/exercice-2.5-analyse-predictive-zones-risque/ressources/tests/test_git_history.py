@@ -0,0 +1,63 @@
+"""Tests de GitHistoryAnalyzer (renommages, lecture restreinte à une sélection)"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from analyze_git_history import GitHistoryAnalyzer
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git indisponible")
+
+REFERENCE_TIME = 1700000000
+
+
+def commit(repo, subject, author, timestamp):
+    env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f'{author}@example.com',
+               GIT_COMMITTER_NAME='ci', GIT_COMMITTER_EMAIL='ci@example.com',
+               GIT_AUTHOR_DATE=f'{timestamp} +0000', GIT_COMMITTER_DATE=f'{timestamp} +0000')
+    subprocess.run(['git', '-C', str(repo), 'add', '-A'], check=True)
+    subprocess.run(['git', '-C', str(repo), 'commit', '-q', '-m', subject], check=True, env=env)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """f1.py modifié par deux auteurs (dont un correctif) puis renommé en g1.py"""
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    (tmp_path / 'f1.py').write_text('value = 1\n' * 20)
+    (tmp_path / 'other.py').write_text('x = 1\n')
+    commit(tmp_path, 'Add modules', 'alice', REFERENCE_TIME - 10 * 86400)
+    with open(tmp_path / 'f1.py', 'a') as f:
+        f.write('value = 2\n')
+    commit(tmp_path, 'Fix crash on start', 'bob', REFERENCE_TIME - 5 * 86400)
+    subprocess.run(['git', '-C', str(tmp_path), 'mv', 'f1.py', 'g1.py'], check=True)
+    commit(tmp_path, 'Move module', 'alice', REFERENCE_TIME - 86400)
+    return tmp_path
+
+
+def metrics(table, path):
+    return table.set_index('file_path').loc[path].to_dict()
+
+
+def test_full_history_follows_rename(repo):
+    table = GitHistoryAnalyzer(repo).analyze(reference_time=REFERENCE_TIME)
+    assert table['file_path'].tolist() == ['g1.py', 'other.py']
+    renamed = metrics(table, 'g1.py')
+    assert (renamed['commit_count'], renamed['author_count'], renamed['bug_count']) == (3, 2, 1)
+    assert renamed['file_age_days'] == 10
+
+
+def test_analyze_files_matches_full_history_for_renamed_file(repo):
+    full = GitHistoryAnalyzer(repo).analyze(reference_time=REFERENCE_TIME)
+    limited = GitHistoryAnalyzer(repo).analyze_files(['g1.py'], reference_time=REFERENCE_TIME)
+    assert limited['file_path'].tolist() == ['g1.py']
+    assert metrics(limited, 'g1.py') == metrics(full, 'g1.py')
+
+
+def test_analyze_files_with_cache(repo, tmp_path_factory):
+    cache = tmp_path_factory.mktemp('cache') / 'history.npz'
+    full = GitHistoryAnalyzer(repo).analyze(reference_time=REFERENCE_TIME)
+    limited = GitHistoryAnalyzer(repo, cache_path=cache).analyze_files(['g1.py', 'other.py'],
+                                                                       reference_time=REFERENCE_TIME)
+    assert limited.to_dict('records') == full.to_dict('records')